@@ -0,0 +1,57 @@
+"""add date and foreign key indexes
+
+Revision ID: 5c2e8d1f9a3b
+Revises: 86b7c9141a09
+Create Date: 2026-10-16 09:12:44.318207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c2e8d1f9a3b'
+down_revision = '86b7c9141a09'
+branch_labels = None
+depends_on = None
+
+
+DETAINER_WARRANTS_ONLY = sa.text("type = 'detainer_warrant'")
+
+# hearings.court_date is already the leading column of the
+# (court_date, docket_id) unique constraint, so it needs no index of its own.
+INDEXES = [
+    ('ix_cases_detainer_warrant_file_date', 'cases', ['file_date'], DETAINER_WARRANTS_ONLY),
+    ('ix_cases_detainer_warrant_plaintiff_id_file_date', 'cases', ['plaintiff_id', 'file_date'], DETAINER_WARRANTS_ONLY),
+    ('ix_hearings_docket_id', 'hearings', ['docket_id'], None),
+    ('ix_judgments_file_date', 'judgments', ['file_date'], None),
+    ('ix_judgments_hearing_id', 'judgments', ['hearing_id'], None),
+    ('ix_judgments_detainer_warrant_id', 'judgments', ['detainer_warrant_id'], None),
+    ('ix_pleading_documents_docket_id', 'pleading_documents', ['docket_id'], None),
+    ('ix_detainer_warrant_defendants_defendant_id', 'detainer_warrant_defendants', ['defendant_id'], None),
+]
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_where=where,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
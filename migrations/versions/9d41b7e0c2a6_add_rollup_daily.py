@@ -0,0 +1,71 @@
+"""add rollup_daily
+
+Revision ID: 9d41b7e0c2a6
+Revises: 5c2e8d1f9a3b
+Create Date: 2026-10-16 11:03:27.540118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d41b7e0c2a6'
+down_revision = '5c2e8d1f9a3b'
+branch_labels = None
+depends_on = None
+
+
+COUNTS = [
+    'warrants_filed',
+    'amount_claimed_high',
+    'amount_claimed_medium_high',
+    'amount_claimed_medium',
+    'amount_claimed_medium_low',
+    'amount_claimed_low',
+    'judgments',
+    'possession_judgments',
+    'default_judgments',
+]
+
+
+def upgrade():
+    op.create_table('rollup_daily',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('plaintiff_id', sa.Integer(), nullable=True),
+    sa.Column('plaintiff_attorney_id', sa.Integer(), nullable=True),
+    sa.Column('judge_id', sa.Integer(), nullable=True),
+    sa.Column('courtroom_id', sa.Integer(), nullable=True),
+    *[sa.Column(name, sa.Integer(), server_default='0', nullable=False) for name in COUNTS],
+    sa.Column('awards_fees', sa.Numeric(scale=2), server_default='0', nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('rollup_daily', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_rollup_daily_day'), ['day'], unique=False)
+
+    # cases is large; the incremental refresh scans it by updated_at
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_cases_updated_at',
+            'cases',
+            ['updated_at'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_cases_updated_at',
+            table_name='cases',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+    with op.batch_alter_table('rollup_daily', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_rollup_daily_day'))
+
+    op.drop_table('rollup_daily')
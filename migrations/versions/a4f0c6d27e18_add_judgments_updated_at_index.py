@@ -0,0 +1,38 @@
+"""add judgments updated_at index
+
+Revision ID: a4f0c6d27e18
+Revises: e5c81f2a7b93
+Create Date: 2026-10-16 23:02:17.518904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4f0c6d27e18'
+down_revision = 'e5c81f2a7b93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # built concurrently so imports carry on meanwhile
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_judgments_updated_at',
+            'judgments',
+            ['updated_at'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_judgments_updated_at',
+            table_name='judgments',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,83 @@
+"""add trigram name indexes
+
+Revision ID: b37e5a90d4c1
+Revises: 9d41b7e0c2a6
+Create Date: 2026-10-16 21:14:52.306417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b37e5a90d4c1'
+down_revision = '9d41b7e0c2a6'
+branch_labels = None
+depends_on = None
+
+
+TRIGRAM_INDEXES = [
+    ('ix_defendants_full_name_trgm', 'defendants', 'full_name'),
+    ('ix_plaintiffs_name_trgm', 'plaintiffs', 'name'),
+    ('ix_attorneys_name_trgm', 'attorneys', 'name'),
+]
+
+
+def upgrade():
+    op.execute('create extension if not exists pg_trgm')
+
+    with op.batch_alter_table('defendants', schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                'full_name',
+                sa.Text(),
+                sa.Computed(
+                    "coalesce(first_name || ' ', '')"
+                    " || coalesce(middle_name || ' ', '')"
+                    " || coalesce(last_name || ' ', '')"
+                    " || coalesce(suffix, '')",
+                    persisted=True,
+                ),
+            )
+        )
+
+    # built concurrently so searches and imports carry on meanwhile
+    with op.get_context().autocommit_block():
+        for name, table, column in TRIGRAM_INDEXES:
+            op.create_index(
+                name,
+                table,
+                [column],
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        op.create_index(
+            'ix_cases_detainer_warrant_plaintiff_attorney_id',
+            'cases',
+            ['plaintiff_attorney_id'],
+            postgresql_where=sa.text("type = 'detainer_warrant'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_cases_detainer_warrant_plaintiff_attorney_id',
+            table_name='cases',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        for name, table, _ in TRIGRAM_INDEXES:
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+
+    with op.batch_alter_table('defendants', schema=None) as batch_op:
+        batch_op.drop_column('full_name')
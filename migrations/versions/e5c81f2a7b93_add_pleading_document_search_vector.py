@@ -0,0 +1,54 @@
+"""add pleading document search vector
+
+Revision ID: e5c81f2a7b93
+Revises: b37e5a90d4c1
+Create Date: 2026-10-16 21:42:08.917254
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5c81f2a7b93'
+down_revision = 'b37e5a90d4c1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # rewrites pleading_documents once, computing a vector for every document
+    with op.batch_alter_table('pleading_documents', schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                'search_vector',
+                postgresql.TSVECTOR(),
+                sa.Computed(
+                    "to_tsvector('english', coalesce(text, ''))", persisted=True
+                ),
+            )
+        )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_pleading_documents_search_vector',
+            'pleading_documents',
+            ['search_vector'],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_pleading_documents_search_vector',
+            table_name='pleading_documents',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+    with op.batch_alter_table('pleading_documents', schema=None) as batch_op:
+        batch_op.drop_column('search_vector')
@@ -25,6 +25,12 @@
 
       from rdc_website import jobs
 
+  def post_worker_init(worker):
+      from rdc_website.rollups import cache, columns
+
+      columns.warm_in_background(worker.wsgi)
+      cache.warm_in_background(worker.wsgi)
+
   def when_ready(server):
     GunicornPrometheusMetrics.start_http_server_when_ready(int(os.getenv('METRICS_PORT')))
 
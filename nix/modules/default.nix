@@ -24,6 +24,13 @@ with builtins; let
     inherit (config.nixpkgs.localSystem) system;
   };
 
+  # nginx serves the rollup snapshots the app writes under DATA_DIR
+  serveStatic = pkgs.callPackage ../serve_static.nix {
+    staticFiles = cfg.staticFiles;
+    rollupSnapshots = "${cfg.dataDir}/rollups";
+    listen = "${cfg.address}:${toString cfg.staticPort}";
+  };
+
   rdcWebsiteConfig = pkgs.writeScriptBin "rdc-website-config" ''
     systemctl cat rdc-website.service | grep X-ConfigFile | cut -d"=" -f2
   '';
@@ -95,6 +102,18 @@ in {
       description = "Override the default environment variables";
     };
 
+    staticPort = mkOption {
+      type = types.int;
+      default = 8081;
+      description = "Port for nginx serving static files and rollup snapshots";
+    };
+
+    dataDir = mkOption {
+      type = types.str;
+      default = "/var/lib/rdc-website/data";
+      description = "Where the app writes exports, its rollup cache and rollup snapshots";
+    };
+
     metricsPort = mkOption {
       type = types.int;
       default = 9200;
@@ -138,6 +157,12 @@ in {
       default = null;
     };
 
+    staticServer = mkOption {
+      internal = true;
+      type = with types; nullOr path;
+      default = null;
+    };
+
     secretFiles = mkOption {
       type = types.attrs;
       default = {};
@@ -155,7 +180,7 @@ in {
       internal = true;
       type = types.attrs;
       default = {
-        DATA_DIR = "./data";
+        DATA_DIR = cfg.dataDir;
         DEBUG = cfg.debug;
         ENV = "production";
         FLASK_APP = "rdc_website.app";
@@ -201,6 +226,7 @@ in {
     services.red-door-collective.rdc-website.configFile = configInput;
     services.red-door-collective.rdc-website.app = serveApp;
     services.red-door-collective.rdc-website.staticFiles = pkgs.rdc-website-static;
+    services.red-door-collective.rdc-website.staticServer = serveStatic;
 
     environment.systemPackages = [
       rdcWebsiteConfig
@@ -304,5 +330,25 @@ in {
         ];
       };
     };
+
+    systemd.services.rdc-website-static = {
+      description = "Static files and rollup snapshots for the Red Door Collective website";
+      after = ["network.target" "rdc-website.service"];
+      wantedBy = ["multi-user.target"];
+
+      serviceConfig = {
+        # the same user as the app, which writes the snapshots
+        User = cfg.user;
+        Group = cfg.group;
+        ExecStart = "${serveStatic}/bin/run";
+        RestartSec = "5s";
+        Restart = "always";
+        ProtectSystem = "strict";
+        ProtectHome = true;
+        PrivateTmp = true;
+        NoNewPrivileges = true;
+        SyslogIdentifier = "rdc-website-static";
+      };
+    };
   };
 }
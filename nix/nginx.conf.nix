@@ -1,4 +1,4 @@
-{ staticFiles, listen, serverName, mimeTypeFile }:
+{ staticFiles, listen, serverName, mimeTypeFile, rollupSnapshots ? null }:
 ''
   daemon off;
 
@@ -24,6 +24,30 @@
               add_header Cache-Control public;
               alias ${staticFiles};
           }
+          ${if rollupSnapshots == null then "" else ''
+
+          # written by `flask export-rollups`; versioned directories never
+          # change, while current/ and the manifest move with each export
+          location /rollups/ {
+              add_header Access-Control-Allow-Origin *;
+              add_header Cache-Control "public, max-age=31536000, immutable";
+              alias ${rollupSnapshots}/;
+              gzip_static on;
+          }
+
+          location /rollups/current/ {
+              add_header Access-Control-Allow-Origin *;
+              add_header Cache-Control no-cache;
+              alias ${rollupSnapshots}/current/;
+              gzip_static on;
+          }
+
+          location = /rollups/manifest.json {
+              add_header Access-Control-Allow-Origin *;
+              add_header Cache-Control no-cache;
+              alias ${rollupSnapshots}/manifest.json;
+          }
+          ''}
       }
   }
 ''
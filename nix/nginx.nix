@@ -12,6 +12,7 @@ nginxMainline.overrideAttrs (oldAttrs: rec {
     "--http-client-body-temp-path=${tmp}"
     "--http-log-path=/dev/stdout"
     "--pid-path=${tmp}/nginx.pid"
+    "--with-http_gzip_static_module"
     "--without-http_access_module"
     "--without-http_auth_basic_module"
     "--without-http_autoindex_module"
@@ -2,6 +2,7 @@
 { pkgs
 , lib
 , staticFiles
+, rollupSnapshots ? null
 , listen ? "127.0.0.1:8081"
 , serverName ? "localhost"
 }:
@@ -11,7 +12,7 @@ let
   nginxConf = pkgs.writeText
     "nginx.conf"
     (import ./nginx.conf.nix {
-      inherit staticFiles listen serverName mimeTypeFile;
+      inherit staticFiles listen serverName mimeTypeFile rollupSnapshots;
     });
 
   runNginx = pkgs.writeShellScriptBin "run" ''
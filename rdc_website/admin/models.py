@@ -1,4 +1,4 @@
-from rdc_website.database import db, Column, Model, relationship
+from rdc_website.database import db, Codes, Column, Model, relationship
 from datetime import datetime
 from sqlalchemy import func
 from flask_security import Security, SQLAlchemyUserDatastore, UserMixin, RoleMixin
@@ -25,12 +25,14 @@ class Role(db.Model, RoleMixin):
 class User(db.Model, UserMixin):
     __tablename__ = "user"
 
-    navigation_options = {
-        "REMAIN": 0,
-        "NEW_WARRANT": 1,
-        "PREVIOUS_WARRANT": 2,
-        "NEXT_WARRANT": 3,
-    }
+    navigation_options = Codes(
+        {
+            "REMAIN": 0,
+            "NEW_WARRANT": 1,
+            "PREVIOUS_WARRANT": 2,
+            "NEXT_WARRANT": 3,
+        }
+    )
 
     id = Column(db.Integer, primary_key=True)
     email = Column(db.String(255), unique=True)
@@ -57,18 +59,7 @@ class User(db.Model, UserMixin):
     def name(self):
         return self.first_name + " " + self.last_name
 
-    @property
-    def preferred_navigation(self):
-        navigation_by_id = {v: k for k, v in User.navigation_options.items()}
-        return (
-            navigation_by_id[self.preferred_navigation_id]
-            if self.preferred_navigation_id is not None
-            else None
-        )
-
-    @preferred_navigation.setter
-    def preferred_navigation(self, option="REMAIN"):
-        self.preferred_navigation_id = User.navigation_options[option]
+    preferred_navigation = navigation_options.hybrid("preferred_navigation_id")
 
     def can_access_defendant_data(self):
         return (
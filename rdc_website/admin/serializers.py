@@ -1,5 +1,8 @@
 from marshmallow import Schema, fields
 
+from rdc_website.database import eager_loads
+from .models import User
+
 
 class RoleSchema(Schema):
     class Meta:
@@ -12,6 +15,7 @@ roles_schemas = RoleSchema(many=True)
 
 class UserSchema(Schema):
     roles = fields.Nested(RoleSchema, many=True)
+    preferred_navigation = User.navigation_options.field()
 
     class Meta:
         fields = (
@@ -25,6 +29,11 @@ class UserSchema(Schema):
             "preferred_navigation",
         )
 
+    def get_query_options(self, load):
+        return eager_loads(
+            self, load, roles=(load.selectinload(User.roles), role_schema)
+        )
+
 
 user_schema = UserSchema()
 user_schemas = UserSchema(many=True)
@@ -25,12 +25,13 @@ from rdc_website.permissions.api import (
     HeaderUserAuthentication,
     Protected,
     CursorPagination,
+    FetchByIds,
 )
 from .models import User, Role
 from .serializers import *
 
 
-class UserResourceBase(GenericModelView):
+class UserResourceBase(FetchByIds, GenericModelView):
     model = User
     schema = user_schema
 
@@ -54,7 +55,7 @@ class UserResource(UserResourceBase):
         return self.update(int(id), partial=True)
 
 
-class RoleResourceBase(GenericModelView):
+class RoleResourceBase(FetchByIds, GenericModelView):
     model = Role
     schema = role_schema
 
@@ -1,9 +1,10 @@
 import flask
-from flask import g, jsonify, Flask, request, current_app, Response
+from flask import jsonify, Flask, request, current_app, Response
 from flask_security import hash_password, auth_token_required, send_mail
 from flask_security.confirmable import generate_confirmation_link
 from flask_security.utils import config_value
 from flask_wtf import CSRFProtect
+from flask_resty import ApiError
 from rdc_website.extensions import (
     cors,
     db,
@@ -19,20 +20,21 @@ import rdc_website.routes as routes
 from rdc_website.admin.models import User, user_datastore
 import re
 import os
-import time
-import calendar
 from threading import Thread
 
-from sqlalchemy import and_, func, desc
-from sqlalchemy.sql import text
-from rdc_website import commands, detainer_warrants, admin
+from rdc_website import (
+    commands,
+    conditional,
+    detainer_warrants,
+    admin,
+    instrumentation,
+    rollups,
+)
 import json
 from datetime import datetime, date, timedelta, timezone
-from dateutil.rrule import rrule, MONTHLY
 from dateutil.relativedelta import relativedelta
 from flask_security import current_user
 import rdc_website.tasks as tasks
-from .time_util import millis, millis_timestamp
 from .util import request_id
 
 from loguru import logger
@@ -47,6 +49,10 @@ CONSTANTS.titles.remove("marquise", "marquis", "prince", "princess", "sultan", "
 
 flask.cli.show_server_banner = lambda *args: None
 
+MAX_TOP_PLAINTIFFS = 50
+MAX_ROLLUP_MONTHS = 60
+MAX_TIMESERIES_BUCKETS = 400
+
 Attorney = detainer_warrants.models.Attorney
 DetainerWarrant = detainer_warrants.models.DetainerWarrant
 Defendant = detainer_warrants.models.Defendant
@@ -89,218 +95,59 @@ def create_app(testing=False):
     return app
 
 
-def between_dates(start, end, query):
-    return query.filter(
-        and_(
-            func.date(DetainerWarrant.file_date) >= start,
-            func.date(DetainerWarrant.file_date) <= end,
-        )
-    )
-
-
 def from_millis(posix):
     return datetime.fromtimestamp(posix / 1000, tz=timezone.utc).date()
 
 
-def months_since(start):
-    end = date.today()
-    dates = [(dt, next_month(dt)) for dt in rrule(MONTHLY, dtstart=start, until=end)]
-    return dates, end
-
-
-def count_between_dates(start, end):
-    return between_dates(start, end, db.session.query(DetainerWarrant)).count()
-
-
-def next_month(dt):
-    return datetime(
-        dt.year + (1 if dt.month == 12 else 0), max(1, (dt.month + 1) % 13), 1
-    )
-
-
-def top_evictions_between_dates(start, end):
-    return (
-        between_dates(
-            start,
-            end,
-            db.session.query(
-                Plaintiff.id, Plaintiff.name, func.count(DetainerWarrant.plaintiff_id)
-            ),
-        )
-        .join(Plaintiff)
-        .group_by(DetainerWarrant.plaintiff_id, Plaintiff.id)
-        .order_by(desc(func.count("*")))
-        .limit(10)
-        .all()
-    )
-
-
-def top_evictions_between_dates(start, end):
-    return (
-        between_dates(
-            start,
-            end,
-            db.session.query(Plaintiff, func.count(DetainerWarrant.plaintiff_id)),
-        )
-        .join(Plaintiff)
-        .group_by(DetainerWarrant.plaintiff_id, Plaintiff.id)
-        .order_by(desc(func.count("*")))
-        .limit(10)
-        .all()
-    )
+def date_arg(name):
+    """The date in a millisecond request arg, or None when it is not given."""
+    value = request.args.get(name)
+    if not value:
+        return None
 
+    try:
+        return from_millis(int(value))
+    except (ValueError, OverflowError, OSError):
+        raise ApiError(400, {"code": "invalid_range", "source": {"parameter": name}})
 
-def evictions_by_month(plaintiff_id, months):
-    return db.session.execute(
-        text(
-            """
-    select
-        count(cases.docket_id) filter (where date(cases.file_date)  >= :d_1_start AND date(cases.file_date) <= :d_1_end) as ":1",
-        count(cases.docket_id) filter (where date(cases.file_date)  >= :d_2_start AND date(cases.file_date) <= :d_2_end) as ":2",
-        count(cases.docket_id) filter (where date(cases.file_date)  >= :d_3_start AND date(cases.file_date) <= :d_3_end) as ":3",
-        count(cases.docket_id) filter (where date(cases.file_date)  >= :d_4_start AND date(cases.file_date) <= :d_4_end) as ":4",
-        count(cases.docket_id) filter (where date(cases.file_date)  >= :d_5_start AND date(cases.file_date) <= :d_5_end) as ":5",
-        count(cases.docket_id) filter (where date(cases.file_date)  >= :d_6_start AND date(cases.file_date) <= :d_6_end) as ":6",
-        count(cases.docket_id) filter (where date(cases.file_date)  >= :d_7_start AND date(cases.file_date) <= :d_7_end) as ":7",
-        count(cases.docket_id) filter (where date(cases.file_date)  >= :d_8_start AND date(cases.file_date) <= :d_8_end) as ":8",
-        count(cases.docket_id) filter (where date(cases.file_date)  >= :d_9_start AND date(cases.file_date) <= :d_9_end) as ":9",
-        count(cases.docket_id) filter (where date(cases.file_date)  >= :d_10_start AND date(cases.file_date) <= :d_10_end) as ":10",
-        count(cases.docket_id) filter (where date(cases.file_date)  >= :d_11_start AND date(cases.file_date) <= :d_11_end) as ":11",
-        count(cases.docket_id) filter (where date(cases.file_date)  >= :d_12_start AND date(cases.file_date) <= :d_12_end) as ":12"
-    FROM plaintiffs p JOIN cases ON p.id = cases.plaintiff_id AND cases.type = 'detainer_warrant'
-    WHERE cases.plaintiff_id = :plaintiff_id
-    """
-        ),
-        {"plaintiff_id": plaintiff_id, **months},
-    )
 
+def id_arg(name):
+    """The integer id in a request arg, or None when it is not given."""
+    value = request.args.get(name)
+    if not value:
+        return None
 
-def top_plaintiff_attorneys_bet(start, end):
-    # TODO: perhaps figure this out in python
-    return db.session.execute(
-        """
-    with top as
-        (select a.name, count(dw.docket_id) as warrantCount
-    from attorneys a
-    inner join cases dw on dw.plaintiff_attorney_id = a.id
-    where a.id <> -1 and dw.type = 'detainer_warrant'
-    group by a.id, a.name
-    order by count(dw.docket_id) desc)
-    select *
-    from top
-    union
-    (select 'ALL OTHER' as name,
-        sum(top.warrantCount) as warrantCount
-    from top
-    where top.name not in
-        (select top.name
-        from top
-        limit 5))
-    order by warrantCount desc
-    limit 6;
-    """
-    )
-
+    try:
+        return int(value)
+    except ValueError:
+        raise ApiError(400, {"code": "invalid_id", "source": {"parameter": name}})
 
-def top_judges_bet(start, end):
-    # TODO: perhaps figure this out in python
-    return db.session.execute(
-        """
-    with top as
-        (select j.name, count(jm.detainer_warrant_id) as warrantCount
-    from judges j
-    inner join judgments jm on jm.judge_id = j.id
-    group by j.id, j.name
-    order by count(jm.detainer_warrant_id) desc)
-    select *
-    from top
-    union
-    (select 'ALL OTHER' as name,
-        sum(top.warrantCount) as warrantCount
-    from top
-    where top.name not in
-        (select top.name
-        from top
-        limit 5))
-    order by warrantCount desc
-    limit 6;
-    """
-    )
 
+def date_window(default_start):
+    """Read an inclusive start and end from millisecond request args.
 
-def top_plaintiff_ranges_bet(start, end):
-    # TODO: perhaps figure this out in python
-    return db.session.execute(
-        """
-    with top as
-        (select p.name,
-         count(dw.docket_id) as warrant_count,
-         sum(CASE WHEN dw.amount_claimed > 2000 THEN 1 ELSE 0 END) as high,
-         sum(case when dw.amount_claimed > 1500 and dw.amount_claimed <= 2000 then 1 else 0 end) as medium_high,
-         sum(case when dw.amount_claimed > 1000 and dw.amount_claimed <= 1500 then 1 else 0 end) as medium,
-         sum(case when dw.amount_claimed > 500 and dw.amount_claimed <= 1000 then 1 else 0 end) as medium_low,
-         sum(CASE WHEN dw.amount_claimed < 500 THEN 1 ELSE 0 END) as low
-    from plaintiffs p
-    inner join cases dw on dw.plaintiff_id = p.id
-    where dw.type = 'detainer_warrant'
-    group by p.id, p.name
-    order by warrant_count desc)
-    select *
-    from top
-    union
-    (select 'ALL OTHER' as name,
-        sum(top.warrant_count) as warrant_count,
-        sum(top.high),
-        sum(top.medium_high),
-        sum(top.medium),
-        sum(top.medium_low),
-        sum(top.low)
-    from top
-    where top.name not in
-        (select top.name
-        from top
-        limit 5))
-    order by warrant_count desc
-    limit 6;
+    The window is returned half-open, ending the day after `end`. A requested
+    start more than MAX_ROLLUP_MONTHS before the end is refused, though the
+    default start may be further back.
     """
-    )
-
+    start = date_arg("start")
+    end = date_arg("end") or date.today()
+    if start is None:
+        start = default_start
+    elif start < end - relativedelta(months=MAX_ROLLUP_MONTHS):
+        raise ApiError(400, {"code": "invalid_range"})
+    if start > end:
+        raise ApiError(400, {"code": "invalid_range"})
 
-def pending_scheduled_case_count(start, end):
-    return (
-        db.session.query(DetainerWarrant)
-        .join(Hearing)
-        .filter(
-            and_(
-                func.date(Hearing.court_date) >= start,
-                func.date(Hearing.court_date) < end,
-                DetainerWarrant.status_id == DetainerWarrant.statuses["PENDING"],
-            )
-        )
-        .count()
-    )
+    return start, end + timedelta(days=1)
 
 
-def amount_awarded_between(start, end):
-    amount = (
-        db.session.query(func.sum(Judgment.awards_fees))
-        .join(Hearing)
-        .filter(
-            and_(
-                func.date(Hearing.court_date) >= start,
-                func.date(Hearing.court_date) < end,
-            )
-        )
-        .scalar()
-    )
-    if amount is None:
-        return 0
-    else:
-        return amount
+def rollup_source():
+    return rollups.columns if rollups.columns.enabled() else rollups.queries
 
 
-def round_dec(dec):
-    return int(round(dec))
+def clamp(value, lowest, highest):
+    return max(lowest, min(value, highest))
 
 
 def security_response_with_profile(payload, code, headers, user):
@@ -324,241 +171,152 @@ def register_extensions(app):
     cors.init_app(app)
     csrf.init_app(app)
     mail.init_app(app)
+    rollups.cache.response_cache.init_app(app)
 
-    @app.before_request
-    def log_request_info():
-        g.start = time.time()
-
-    @app.after_request
-    def log_response_info(response):
-        now = time.time()
-        duration = round(now - g.start, 6)
-        dt = datetime.fromtimestamp(now)
-        timestamp = dt.isoformat()
-
-        args = dict(request.args)
-        log_params = dict(
-            method=request.method,
-            status=response.status_code,
-            duration=duration,
-            time=timestamp,
-            params=args,
-        )
-
-        if "login" not in request.path:
-            log_params["request_headers"] = {k: v for k, v in request.headers.items()}
-            log_params["response_headers"] = {k: v for k, v in response.headers.items()}
-
-        # logger.info(request.path, extra=log_params)
-
-        return response
+    # first, so that requests answered early, like a 304, are still timed
+    instrumentation.init_app(app)
+    conditional.init_app(app)
+    rollups.bundle.init_app(app)
 
     @app.route("/api/v1/rollup/detainer-warrants")
+    @rollups.cache.cached(depends_on=rollups.columns.cache_version)
     def detainer_warrant_rollup_by_month():
         start_dt = (date.today() - relativedelta(years=1)).replace(day=1)
-        end_dt = date.today()
-        dates = [
-            (dt, next_month(dt))
-            for dt in rrule(MONTHLY, dtstart=start_dt, until=end_dt)
-        ]
-        counts = [
-            {
-                "time": millis_timestamp(start),
-                "total_warrants": count_between_dates(start, end),
-            }
-            for start, end in dates
-        ]
-
-        return jsonify(counts)
+        end_dt = date.today() + timedelta(days=1)
+
+        return jsonify(rollup_source().warrants_by_month(start_dt, end_dt))
 
     @app.route("/api/v1/rollup/plaintiffs")
+    @rollups.cache.cached(depends_on=rollups.columns.cache_version)
     def plaintiff_rollup_by_month():
-        start_dt = (date.today() - timedelta(days=365)).replace(day=1)
-        end_dt = date.today()
-        dates = [
-            (dt, next_month(dt))
-            for dt in rrule(MONTHLY, dtstart=start_dt, until=end_dt)
-        ]
-        months = {}
-        for i, d_range in enumerate(dates):
-            start, end = d_range
-            months[str(i)] = str(i)
-            months[f"d_{i}_start"] = start.strftime("%Y-%m-%d")
-            months[f"d_{i}_end"] = end.strftime("%Y-%m-%d")
-
-        top_ten = top_evictions_between_dates(start_dt, end_dt)
-
-        plaintiffs = {}
-        top_evictors = []
-        for plaintiff, plaintiff_total_evictions in top_ten:
-            counts = evictions_by_month(plaintiff.id, months).fetchone()
-            history = []
-            for i in range(12):
-                history.append(
-                    {"date": millis_timestamp(dates[i][0]), "eviction_count": counts[i]}
-                )
-            top_evictors.append({"name": plaintiff.name, "history": history})
+        limit = clamp(request.args.get("limit", 10, type=int), 1, MAX_TOP_PLAINTIFFS)
+        months = clamp(request.args.get("months", 12, type=int), 1, MAX_ROLLUP_MONTHS)
+        start_dt = date.today().replace(day=1) - relativedelta(months=months - 1)
+        end_dt = date.today() + timedelta(days=1)
 
-        return jsonify(top_evictors)
+        return jsonify(
+            rollup_source().top_plaintiffs_by_month(start_dt, end_dt, limit=limit)
+        )
 
     @app.route("/api/v1/rollup/plaintiffs/amount_claimed_bands")
+    @rollups.cache.cached(depends_on=rollups.columns.cache_version)
     def plaintiffs_by_amount_claimed():
-        start_dt = (date.today() - relativedelta(years=1)).replace(day=1)
-        dates, end_dt = months_since(start_dt)
-
-        top_six = top_plaintiff_ranges_bet(start_dt, end_dt)
-
-        top_plaintiffs = [
-            {
-                "plaintiff_name": result[0],
-                "warrant_count": round_dec(result[1]),
-                "greater_than_2k": round_dec(result[2]),
-                "between_1.5k_and_2k": round_dec(result[3]),
-                "between_1k_and_1.5k": round_dec(result[4]),
-                "between_500_and_1k": round_dec(result[5]),
-                "less_than_500": round_dec(result[6]),
-                "start_date": millis(start_dt),
-                "end_date": millis(end_dt),
-            }
-            for result in top_six
-        ]
-
-        return jsonify(top_plaintiffs)
+        start_dt, end_dt = date_window(
+            (date.today() - relativedelta(years=1)).replace(day=1)
+        )
+
+        return jsonify(rollup_source().plaintiffs_by_amount_claimed(start_dt, end_dt))
 
     @app.route("/api/v1/rollup/plaintiff-attorney")
+    @rollups.cache.cached
     def plaintiff_attorney_warrant_share():
-        start_dt = date(2020, 1, 1)
-        dates, end_dt = months_since(start_dt)
-
-        top_six = top_plaintiff_attorneys_bet(start_dt, end_dt)
-
-        top_plaintiffs = [
-            {
-                "warrant_count": int(round(warrant_count)),
-                "plaintiff_attorney_name": attorney_name,
-                "start_date": millis(start_dt),
-                "end_date": millis(end_dt),
-            }
-            for attorney_name, warrant_count in top_six
-        ]
-
-        prs = {
-            "warrant_count": between_dates(
-                start_dt, end_dt, Attorney.query.filter_by(id=-1).join(DetainerWarrant)
-            ).count(),
-            "plaintiff_attorney_name": Attorney.query.get(-1).name,
-            "start_date": millis(start_dt),
-            "end_date": millis(end_dt),
-        }
+        start_dt, end_dt = date_window(date(2020, 1, 1))
 
-        return jsonify(top_plaintiffs + [prs])
+        return jsonify(
+            rollups.queries.plaintiff_attorney_warrant_share(start_dt, end_dt)
+        )
 
     @app.route("/api/v1/rollup/judges")
+    @rollups.cache.cached
     def judge_warrant_share():
-        start_dt = date(2020, 1, 1)
-        dates, end_dt = months_since(start_dt)
-
-        top_six = top_judges_bet(start_dt, end_dt)
+        start_dt, end_dt = date_window(date(2020, 1, 1))
 
-        top_judges = [
-            {
-                "warrant_count": int(round(warrant_count)),
-                "presiding_judge_name": judge_name,
-                "start_date": millis(start_dt),
-                "end_date": millis(end_dt),
-            }
-            for judge_name, warrant_count in top_six
-        ]
-
-        return jsonify(top_judges)
+        return jsonify(rollups.queries.judge_warrant_share(start_dt, end_dt))
 
     @app.route("/api/v1/rollup/detainer-warrants/pending")
+    @rollups.cache.cached(depends_on="data")
     def pending_detainer_warrants():
         start_of_month = date.today().replace(day=1)
-        end_of_month = (date.today().replace(day=1) + timedelta(days=32)).replace(day=1)
+        end_of_month = start_of_month + relativedelta(months=1)
 
         return jsonify(
-            {
-                "pending_scheduled_case_count": pending_scheduled_case_count(
-                    start_of_month, end_of_month
-                )
-            }
+            rollups.queries.pending_scheduled_case_count(start_of_month, end_of_month)
         )
 
     @app.route("/api/v1/rollup/amount-awarded")
+    @rollups.cache.cached
     def amount_awarded():
         start_of_month = date.today().replace(day=1)
-        end_of_month = (date.today().replace(day=1) + timedelta(days=32)).replace(day=1)
-        return jsonify(
-            {"data": round_dec(amount_awarded_between(start_of_month, end_of_month))}
-        )
+        end_of_month = start_of_month + relativedelta(months=1)
+
+        return jsonify(rollups.queries.amount_awarded(start_of_month, end_of_month))
 
     @app.route("/api/v1/rollup/amount-awarded/history")
+    @rollups.cache.cached
     def amount_awarded_history():
         start_dt = date(2021, 3, 1)
-        end_dt = date.today()
-        dates = [
-            (dt, next_month(dt))
-            for dt in rrule(MONTHLY, dtstart=start_dt, until=end_dt)
-        ]
-        awards = [
-            {
-                "time": millis_timestamp(start),
-                "total_amount": round_dec(amount_awarded_between(start, end)),
-            }
-            for start, end in dates
-        ]
-        return jsonify({"data": awards})
-
-    @app.route("/api/v1/rollup/meta")
-    def data_meta():
-        last_warrant = (
-            db.session.query(DetainerWarrant)
-            .order_by(desc(DetainerWarrant.updated_at))
-            .first()
+        end_dt = date.today().replace(day=1) + relativedelta(months=1)
+
+        return jsonify(rollups.queries.amount_awarded_history(start_dt, end_dt))
+
+    @app.route("/api/v1/rollup/timeseries")
+    @rollups.cache.cached
+    def rollup_timeseries():
+        metric = request.args.get("metric", "filings")
+        granularity = request.args.get("granularity", "month")
+        if metric not in rollups.queries.TIMESERIES_METRICS:
+            raise ApiError(400, {"code": "invalid_metric"})
+        if granularity not in rollups.queries.GRANULARITIES:
+            raise ApiError(400, {"code": "invalid_granularity"})
+
+        start_dt, end_dt = date_window(
+            (date.today() - relativedelta(years=1)).replace(day=1)
+        )
+        last_bucket = rollups.queries.bucket_start(
+            end_dt - timedelta(days=1), granularity
         )
+        start_dt = max(
+            start_dt,
+            last_bucket
+            - relativedelta(**{f"{granularity}s": MAX_TIMESERIES_BUCKETS - 1}),
+        )
+
         return jsonify(
-            {
-                "last_detainer_warrant_update": (
-                    last_warrant.updated_at if last_warrant else None
-                )
-            }
+            rollups.queries.timeseries(
+                metric,
+                granularity,
+                start_dt,
+                end_dt,
+                plaintiff_id=id_arg("plaintiff_id"),
+            )
         )
 
+    @app.route("/api/v1/rollup/meta")
+    @rollups.cache.cached(depends_on="data")
+    def data_meta():
+        return jsonify(rollups.queries.data_meta())
+
+    @app.route(rollups.bundle.PATH)
+    @rollups.cache.cached(depends_on="data")
+    def rollup_bundle():
+        return rollups.bundle.response()
+
     @app.route("/api/v1/rollup/year/<int:year_number>/month/<int:month_number>")
+    @rollups.cache.cached
     def monthly_rollup(year_number, month_number):
-        start_date, end_date = calendar.monthrange(year_number, month_number)
-        start_of_month = date(year_number, month_number, start_date + 1)
-        end_of_month = date(year_number, month_number, end_date)
-        awards = (
-            db.session.query(func.sum(Judgment.awards_fees))
-            .filter(
-                Judgment._file_date >= start_of_month,
-                Judgment._file_date <= end_of_month,
-                Judgment.awards_fees != None,
-            )
-            .scalar()
+        start_of_month = date(year_number, month_number, 1)
+        end_of_month = start_of_month + relativedelta(months=1)
+
+        return jsonify(rollups.queries.monthly_rollup(start_of_month, end_of_month))
+
+    @app.route("/api/v1/rollup/months")
+    @rollups.cache.cached
+    def monthly_rollups():
+        end_month = (date_arg("end") or date.today()).replace(day=1)
+        start_month = (
+            date_arg("start") or end_month - relativedelta(months=11)
+        ).replace(day=1)
+        if start_month > end_month:
+            raise ApiError(400, {"code": "invalid_range"})
+
+        start_month = max(
+            start_month, end_month - relativedelta(months=MAX_ROLLUP_MONTHS - 1)
         )
-        eviction_judgments = Judgment.query.filter(
-            Judgment._file_date >= start_of_month,
-            Judgment._file_date <= end_of_month,
-            Judgment.awards_possession == True,
-        ).count()
-        default_evictions = Judgment.query.filter(
-            Judgment._file_date >= start_of_month,
-            Judgment._file_date <= end_of_month,
-            Judgment.entered_by_id == 0,
-        ).count()
 
         return jsonify(
-            {
-                "detainer_warrants_filed": between_dates(
-                    start_of_month, end_of_month, DetainerWarrant.query
-                ).count(),
-                "eviction_judgments": eviction_judgments,
-                "plaintiff_awards": float(awards) if awards else 0.0,
-                "evictions_entered_by_default": float(default_evictions),
-            }
+            rollups.queries.monthly_rollups(
+                start_month, end_month + relativedelta(months=1)
+            )
         )
 
     @app.route("/api/v1/export")
@@ -674,6 +432,8 @@ def register_commands(app):
     app.cli.add_command(commands.scrape_docket)
     app.cli.add_command(commands.scrape_dockets)
     app.cli.add_command(commands.export)
+    app.cli.add_command(commands.export_rollups)
+    app.cli.add_command(commands.benchmark_lists)
     app.cli.add_command(commands.export_courtroom_dockets)
     app.cli.add_command(commands.verify_phone)
     app.cli.add_command(commands.verify_phones)
@@ -687,6 +447,7 @@ def register_commands(app):
     app.cli.add_command(commands.extract_pleading_document_text)
     app.cli.add_command(commands.update_judgment_from_document)
     app.cli.add_command(commands.update_judgments_from_documents)
+    app.cli.add_command(commands.refresh_rollups)
     app.cli.add_command(commands.update_warrants_from_documents)
     app.cli.add_command(commands.gather_documents_for_missing_addresses)
     app.cli.add_command(commands.gather_pleading_documents)
@@ -11,6 +11,8 @@ from flask_security import hash_password
 from werkzeug.exceptions import MethodNotAllowed, NotFound
 import gspread
 import rdc_website.detainer_warrants as detainer_warrants
+import rdc_website.rollups as rollups
+import rdc_website.fast_lists as fast_lists
 from rdc_website.admin.models import User, user_datastore
 from rdc_website.database import db
 from rdc_website.detainer_warrants.models import (
@@ -52,6 +54,7 @@ def sync(workbook_name, limit, service_account_key):
     detainer_warrants.imports.from_workbook(
         workbook_name, limit=limit, service_account_key=service_account_key
     )
+    rollups.refresh.refresh_daily()
 
 
 @click.command()
@@ -70,6 +73,7 @@ def sync_judgments(workbook_name, limit, service_account_key):
     detainer_warrants.judgment_imports.from_workbook(
         workbook_name, limit=limit, service_account_key=service_account_key
     )
+    rollups.refresh.refresh_daily()
 
 
 @click.command()
@@ -104,6 +108,7 @@ def import_historical_warrants(workbook_name, service_account_key):
     detainer_warrants.imports.from_historical_records(
         workbook_name, service_account_key=service_account_key
     )
+    rollups.refresh.refresh_daily()
 
 
 @click.command()
@@ -167,6 +172,55 @@ def export(workbook_name, omit_defendant_info, service_account_key, only):
             )
 
 
+@click.command()
+@with_appcontext
+def export_rollups():
+    """Write the dashboard rollups to DATA_DIR for nginx to serve"""
+    rollups.snapshots.write(current_app)
+
+
+LIST_BENCHMARKS = {
+    "detainer-warrants": "DetainerWarrantListResource",
+    "pleading-documents": "PleadingDocumentListResource",
+    "plaintiffs": "PlaintiffListResource",
+    "attorneys": "AttorneyListResource",
+    "judges": "JudgeListResource",
+}
+
+
+@click.command()
+@click.option(
+    "-r",
+    "--resource",
+    type=click.Choice(sorted(LIST_BENCHMARKS)),
+    default="detainer-warrants",
+    help="List endpoint to benchmark",
+)
+@click.option(
+    "-f",
+    "--fields",
+    default=None,
+    help="Comma separated fields to dump, as with ?fields=",
+)
+@click.option("-l", "--limit", default=1000, help="Rows per page")
+@click.option("-n", "--repeat", default=5, help="Runs of each path to take the best of")
+@with_appcontext
+def benchmark_lists(resource, fields, limit, repeat):
+    """Compare list serialization through the schema and the fast path"""
+    view_class = getattr(detainer_warrants.views, LIST_BENCHMARKS[resource])
+    query_string = {"fields": fields} if fields else {}
+    try:
+        rows, schema_time, fast_time = fast_lists.benchmark(
+            view_class, query_string, limit, repeat
+        )
+    except ValueError as e:
+        raise click.UsageError(str(e))
+
+    click.echo(f"{rows} rows")
+    click.echo(f"schema: {schema_time:.4f}s, {rows / schema_time:,.0f} rows/sec")
+    click.echo(f"fast:   {fast_time:.4f}s, {rows / fast_time:,.0f} rows/sec")
+
+
 @click.command()
 @click.option(
     "-d", "--on-date", default=None, help="Date for court watch. Defaults to today."
@@ -295,6 +349,7 @@ def import_from_caselink(start_date, end_date, record, detailed, pleadings):
         with_case_details=with_case_details,
         with_pleading_documents=pleadings,
     )
+    rollups.refresh.refresh_daily()
 
 
 @click.command()
@@ -380,6 +435,8 @@ def bulk_scrape_caselink_by_week(
                 with_pleading_documents=pleadings,
             )
 
+    rollups.refresh.refresh_daily()
+
 
 @click.command()
 @click.argument("image_path")
@@ -477,6 +534,20 @@ def update_judgment_from_document(url):
 @with_appcontext
 def update_judgments_from_documents():
     detainer_warrants.caselink.pleadings.update_judgments_from_documents()
+    rollups.refresh.refresh_daily()
+
+
+@click.command()
+@click.option(
+    "--full",
+    is_flag=True,
+    default=False,
+    help="Rebuild every day rather than only days with changed records",
+)
+@with_appcontext
+def refresh_rollups(full):
+    """Bring the dashboard rollup table up to date"""
+    rollups.refresh.refresh_daily(full=full)
 
 
 @click.command()
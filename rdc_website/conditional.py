@@ -0,0 +1,123 @@
+"""Conditional GET support for the rollup routes and the flask_resty views.
+
+Responses are validated against the shared data version kept next to the
+rollup cache, so a request carrying a matching If-None-Match or a recent
+enough If-Modified-Since gets a 304 before any query runs. Resource requests
+are first authenticated and authorized as their view would, so one the view
+would refuse gets the view's 401 or 403 instead.
+"""
+
+import hashlib
+from datetime import date, datetime, timezone
+
+from flask import current_app, g, request
+from flask_resty import ApiError, GenericModelView
+from flask_security import current_user
+from werkzeug.http import is_resource_modified
+
+from rdc_website.rollups.cache import ROLLUP_PREFIX, is_versioned, response_cache
+
+
+def view_kind():
+    if request.method != "GET" or request.endpoint is None:
+        return None
+
+    if request.path.startswith(ROLLUP_PREFIX):
+        return "rollup"
+
+    view_class = resource_view_class()
+    if view_class is not None and is_versioned(view_class.model):
+        return "resource"
+
+    return None
+
+
+def resource_view_class():
+    view = current_app.view_functions.get(request.endpoint)
+    view_class = getattr(view, "view_class", None)
+    if view_class is not None and issubclass(view_class, GenericModelView):
+        return view_class
+    return None
+
+
+def resource_scope():
+    """Whom a resource response is for, or None when the view would refuse it.
+
+    The request is authenticated and authorized by the view's own components,
+    and its query scoped, which is where views refuse users without the roles
+    they need. Nothing is queried.
+    """
+    view = resource_view_class()()
+    try:
+        view.authentication.authenticate_request()
+        view.authorization.authorize_request()
+        view.authorization.filter_query(view.query_raw, view)
+    except ApiError:
+        return None
+
+    # views scope by the Bearer credentials and by the signed in user's roles
+    user = current_user.id if current_user.is_authenticated else "anonymous"
+    return f"{view.authorization.get_request_credentials()}|{user}"
+
+
+def validators(kind, version, scope=""):
+    changed_at = datetime.fromtimestamp(version, tz=timezone.utc)
+    if kind == "rollup":
+        # rollup windows end today, so a new day is a new answer
+        midnight = datetime.combine(date.today(), datetime.min.time()).astimezone(
+            timezone.utc
+        )
+        last_modified = max(changed_at, midnight)
+    else:
+        last_modified = changed_at
+
+    tag = hashlib.sha1(
+        f"{request.full_path}|{last_modified.timestamp()}|{scope}".encode()
+    ).hexdigest()
+    return tag, last_modified.replace(microsecond=0)
+
+
+def check_conditional_request():
+    kind = view_kind()
+    if kind is None:
+        return None
+
+    version = response_cache.data_version()
+    if version is None:
+        return None
+
+    scope = ""
+    if kind == "resource":
+        scope = resource_scope()
+        if scope is None:
+            return None
+
+    g.conditional = (kind, *validators(kind, version, scope))
+    _, etag, last_modified = g.conditional
+    if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        return None
+
+    return current_app.response_class(status=304)
+
+
+def add_validators(response):
+    conditional = g.pop("conditional", None)
+    if conditional is None or response.status_code not in (200, 304):
+        return response
+
+    kind, etag, last_modified = conditional
+    # weak, since the same data may be sent compressed or not
+    response.set_etag(etag, weak=True)
+    response.last_modified = last_modified
+    if kind == "rollup":
+        response.cache_control.no_cache = True
+    else:
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        response.vary.update(("Cookie", "Authorization"))
+    return response
+
+
+def init_app(app):
+    app.before_request(check_conditional_request)
+    app.after_request(add_validators)
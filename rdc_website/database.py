@@ -1,6 +1,9 @@
 """Database module, including the SQLAlchemy database object and DB-related utilities."""
 
-from sqlalchemy import text, func
+from collections.abc import Mapping
+from flask import current_app
+from marshmallow import ValidationError, fields
+from sqlalchemy import case, text, func
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.hybrid import Comparator, hybrid_property
 from .extensions import db
@@ -25,6 +28,116 @@ def reference_col(tablename, nullable=False, pk_name="id", **kwargs):
     )
 
 
+def raise_on_lazy_load(load):
+    """Loader options making any other lazy load under `load` raise.
+
+    Only applied under test, or when RAISELOAD is set, so that a nested
+    serializer field without a matching eager load fails the suite rather
+    than quietly issuing a query per row.
+    """
+    if current_app.config.get("RAISELOAD", current_app.testing):
+        return (load.raiseload("*", sql_only=True),)
+    return ()
+
+
+def eager_loads(schema, load, **plan):
+    """Query options for the nested fields `schema` will dump.
+
+    `plan` maps each nested field to its eager load and nested schema. Fields
+    left out of the dump, by `only=` or `exclude=`, are not loaded.
+    """
+    options = list(raise_on_lazy_load(load))
+    for name, (loader, nested) in plan.items():
+        if name in schema.fields:
+            options.extend(load_nested(loader, nested))
+    return tuple(options)
+
+
+def load_nested(load, schema):
+    """The eager load `load`, plus the options the nested schema needs below it.
+
+    Schemas without nested fields of their own need not define any.
+    """
+    options = getattr(schema, "get_query_options", raise_on_lazy_load)
+    return (load, *options(load))
+
+
+class named_hybrid(hybrid_property):
+    """A hybrid property that learns its name from the class it is set on,
+    rather than from its getter."""
+
+    def __set_name__(self, owner, name):
+        self.__name__ = name
+
+
+class Codes(Mapping):
+    """Names for the small integer codes a column stores, looked up either way.
+
+    Reads like the `{name: code}` dict it is declared with, and keeps the
+    reverse `{code: name}` dict built once. `hybrid` makes the named
+    attribute for a model, with the matching SQL `case()` as its expression,
+    and `field` the marshmallow field that accepts only known names.
+
+    Unknown codes and names raise KeyError, unless `strict` is False, when
+    they are read as None.
+    """
+
+    def __init__(self, codes, strict=True):
+        self.codes = dict(codes)
+        self.names = {code: name for name, code in self.codes.items()}
+        self.strict = strict
+
+    def __getitem__(self, name):
+        return self.codes[name]
+
+    def __iter__(self):
+        return iter(self.codes)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __repr__(self):
+        return f"Codes({self.codes!r})"
+
+    def name(self, code, default=None):
+        if code is None:
+            return default
+        return self.names[code] if self.strict else self.names.get(code)
+
+    def code(self, name):
+        if not name:
+            return None
+        return self.codes[name] if self.strict else self.codes.get(name)
+
+    def case(self, column, default=None):
+        return case(self.names, value=column, else_=default)
+
+    def hybrid(self, code_attribute, default=None):
+        """A hybrid attribute reading and writing the code column by name.
+
+        `default` is the name given when the code is null.
+        """
+        codes = self
+
+        def fget(instance):
+            return codes.name(getattr(instance, code_attribute), default)
+
+        def fset(instance, name):
+            setattr(instance, code_attribute, codes.code(name))
+
+        def expr(cls):
+            return codes.case(getattr(cls, code_attribute), default)
+
+        return named_hybrid(fget, fset, expr=expr)
+
+    def validate(self, name):
+        if name and name not in self.codes and self.strict:
+            raise ValidationError(f"Must be one of: {', '.join(self.codes)}.")
+
+    def field(self, **kwargs):
+        return fields.String(allow_none=True, validate=self.validate, **kwargs)
+
+
 def in_millis(timestamp):
     return int(timestamp) * 1000
 
@@ -7,7 +7,7 @@ from ..models import db, DetainerWarrant, Defendant
 from .utils import save_all_responses, log_response
 from ..util import get_or_create
 from sqlalchemy.orm.exc import MultipleResultsFound
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_
 from . import pleadings
 from .exceptions import BulkScrapeException
 from loguru import logger
@@ -422,8 +422,8 @@ def docket_ids_between_dates(start_date, end_date, pending_only=False):
     current_time = datetime.now(UTC)
     two_days_ago = current_time - timedelta(days=2)
     window = [
-        func.date(DetainerWarrant.file_date) <= end_date,
-        func.date(DetainerWarrant.file_date) >= start_date,
+        DetainerWarrant._file_date >= start_date,
+        DetainerWarrant._file_date < end_date + timedelta(days=1),
     ]
     last_run = [
         DetainerWarrant._last_pleading_documents_check == None,
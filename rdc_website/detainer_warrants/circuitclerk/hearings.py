@@ -20,6 +20,7 @@ from ..models import (
     hearing_defendants,
 )
 from ..util import get_or_create, normalize
+from rdc_website.rollups.cache import mark_data_changed
 
 CASELINK_URL = "https://caselink.nashville.gov"
 URL = f"{CASELINK_URL}/cgi-bin/webshell.asp"
@@ -126,6 +127,7 @@ def link_defendant(hearing_id, defendant):
             hearing_id=hearing_id, defendant_id=defendant.id
         )
     )
+    mark_data_changed(db.session)
 
 
 def parse_court_date(tr):
@@ -9,6 +9,7 @@ from .models import (
     detainer_warrant_defendants,
 )
 from .util import get_or_create, normalize, open_workbook, dw_rows
+from rdc_website.rollups.cache import mark_data_changed
 from sqlalchemy.exc import IntegrityError, InternalError
 from sqlalchemy.orm.exc import MultipleResultsFound
 from sqlalchemy.dialects.postgresql import insert
@@ -84,6 +85,7 @@ def link_defendant(docket_id, defendant):
             detainer_warrant_docket_id=docket_id, defendant_id=defendant.id
         )
     )
+    mark_data_changed(db.session)
 
 
 def money_to_dec(amt):
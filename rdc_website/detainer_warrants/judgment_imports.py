@@ -11,6 +11,7 @@ from .models import (
     detainer_warrant_defendants,
 )
 from .util import get_or_create, normalize, open_workbook, dw_rows
+from rdc_website.rollups.cache import mark_data_changed
 from sqlalchemy.exc import IntegrityError, InternalError
 from sqlalchemy.dialects.postgresql import insert
 from decimal import Decimal
@@ -171,6 +172,7 @@ def _from_workbook(month, court_date, raw_judgment):
         )
 
         db.session.execute(do_update_stmt)
+        mark_data_changed(db.session)
         db.session.commit()
         judgment = Judgment.query.filter(
             Judgment._file_date == court_date, Judgment.detainer_warrant_id == docket_id
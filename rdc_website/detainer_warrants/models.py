@@ -1,5 +1,6 @@
 from rdc_website.database import (
     db,
+    Codes,
     PosixComparator,
     in_millis,
     from_millis,
@@ -8,16 +9,34 @@ from rdc_website.database import (
     Model,
     relationship,
 )
-from datetime import datetime, date, timezone
-from sqlalchemy import func, text, case, and_
+from datetime import datetime, date, timedelta, timezone
+from sqlalchemy import DDL, event, text, and_
 from flask_security import UserMixin, RoleMixin
 from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 from nameparser import HumanName
 from ..util import get_or_create, file_date_guess
 import re
 from .judgments import regexes
 
 
+def trigram_index(name, column):
+    """A GIN index that serves ilike '%...%' searches on column."""
+    return db.Index(
+        name,
+        column,
+        postgresql_using="gin",
+        postgresql_ops={column: "gin_trgm_ops"},
+    )
+
+
+# the trigram indexes need pg_trgm, including in databases built by create_all
+event.listen(
+    db.metadata, "before_create", DDL("create extension if not exists pg_trgm")
+)
+
+
 detainer_warrant_defendants = db.Table(
     "detainer_warrant_defendants",
     db.metadata,
@@ -30,6 +49,7 @@ detainer_warrant_defendants = db.Table(
         "defendant_id",
         db.ForeignKey("defendants.id", ondelete="CASCADE"),
         primary_key=True,
+        index=True,
     ),
 )
 
@@ -53,6 +73,7 @@ class Defendant(db.Model, Timestamped):
         db.UniqueConstraint(
             "first_name", "middle_name", "last_name", "suffix", "potential_phones"
         ),
+        trigram_index("ix_defendants_full_name_trgm", "full_name"),
     )
 
     id = Column(db.Integer, primary_key=True)
@@ -62,6 +83,17 @@ class Defendant(db.Model, Timestamped):
     suffix = Column(db.String(255))
     aliases = Column(db.ARRAY(db.String(255)), nullable=False, server_default="{}")
     potential_phones = Column(db.String(255))
+    # concat() is not immutable, so the name is joined with || instead
+    full_name = Column(
+        db.Text,
+        db.Computed(
+            "coalesce(first_name || ' ', '')"
+            " || coalesce(middle_name || ' ', '')"
+            " || coalesce(last_name || ' ', '')"
+            " || coalesce(suffix, '')",
+            persisted=True,
+        ),
+    )
 
     verified_phone_id = Column(
         db.Integer, db.ForeignKey("phone_number_verifications.id")
@@ -100,12 +132,7 @@ class Defendant(db.Model, Timestamped):
 
     @name.expression
     def name(cls):
-        return func.concat(
-            func.coalesce(cls.first_name + " ", ""),
-            func.coalesce(cls.middle_name + " ", ""),
-            func.coalesce(cls.last_name + " ", ""),
-            func.coalesce(cls.suffix, ""),
-        )
+        return cls.full_name
 
     @name.setter
     def name(self, full_name):
@@ -125,6 +152,8 @@ class Defendant(db.Model, Timestamped):
 
 class Attorney(db.Model, Timestamped):
     __tablename__ = "attorneys"
+    __table_args__ = (trigram_index("ix_attorneys_name_trgm", "name"),)
+
     id = Column(db.Integer, primary_key=True)
     name = Column(db.String(255), nullable=False)
     aliases = Column(db.ARRAY(db.String(255)), nullable=False, server_default="{}")
@@ -149,6 +178,8 @@ class Courtroom(db.Model, Timestamped):
 
 class Plaintiff(db.Model, Timestamped):
     __tablename__ = "plaintiffs"
+    __table_args__ = (trigram_index("ix_plaintiffs_name_trgm", "name"),)
+
     id = Column(db.Integer, primary_key=True)
     name = Column(db.String(255), nullable=False)
     aliases = Column(db.ARRAY(db.String(255)), nullable=False, server_default="{}")
@@ -184,7 +215,9 @@ class Hearing(db.Model, Timestamped):
 
     _continuance_on = Column(db.Date, name="continuance_on")
 
-    docket_id = Column(db.String(255), db.ForeignKey("cases.docket_id"), nullable=False)
+    docket_id = Column(
+        db.String(255), db.ForeignKey("cases.docket_id"), nullable=False, index=True
+    )
     courtroom_id = Column(db.Integer, db.ForeignKey("courtrooms.id"))
     plaintiff_id = Column(
         db.Integer, db.ForeignKey("plaintiffs.id", ondelete="CASCADE")
@@ -274,17 +307,20 @@ unchecked = ""  # \uf06f
 
 
 class Judgment(db.Model, Timestamped):
-    parties = {"PLAINTIFF": 0, "DEFENDANT": 1}
+    parties = Codes({"PLAINTIFF": 0, "DEFENDANT": 1})
 
-    entrances = {"DEFAULT": 0, "AGREEMENT_OF_PARTIES": 1, "TRIAL_IN_COURT": 2}
+    entrances = Codes({"DEFAULT": 0, "AGREEMENT_OF_PARTIES": 1, "TRIAL_IN_COURT": 2})
 
-    dismissal_bases = {
-        "FAILURE_TO_PROSECUTE": 0,
-        "FINDING_IN_FAVOR_OF_DEFENDANT": 1,
-        "NON_SUIT_BY_PLAINTIFF": 2,
-    }
+    dismissal_bases = Codes(
+        {
+            "FAILURE_TO_PROSECUTE": 0,
+            "FINDING_IN_FAVOR_OF_DEFENDANT": 1,
+            "NON_SUIT_BY_PLAINTIFF": 2,
+        }
+    )
 
     __tablename__ = "judgments"
+    __table_args__ = (db.Index("ix_judgments_updated_at", "updated_at"),)
     id = Column(db.Integer, primary_key=True)
     in_favor_of_id = Column(db.Integer)
     awards_possession = Column(db.Boolean)
@@ -295,15 +331,15 @@ class Judgment(db.Model, Timestamped):
     interest_follows_site = Column(db.Boolean)
     dismissal_basis_id = Column(db.Integer)
     with_prejudice = Column(db.Boolean)
-    _file_date = Column(db.Date, name="file_date")
+    _file_date = Column(db.Date, name="file_date", index=True)
     mediation_letter = Column(db.Boolean)
     notes = Column(db.Text)
 
     hearing_id = Column(
-        db.Integer, db.ForeignKey("hearings.id", ondelete="CASCADE")
+        db.Integer, db.ForeignKey("hearings.id", ondelete="CASCADE"), index=True
     )  # TODO: make non-nullable after data cleanup
     detainer_warrant_id = Column(
-        db.String(255), db.ForeignKey("cases.docket_id"), nullable=False
+        db.String(255), db.ForeignKey("cases.docket_id"), nullable=False, index=True
     )
     judge_id = Column(db.Integer, db.ForeignKey("judges.id"))
     plaintiff_id = Column(
@@ -345,46 +381,9 @@ class Judgment(db.Model, Timestamped):
     def file_date(self, posix):
         self._file_date = from_millis(posix)
 
-    @property
-    def in_favor_of(self):
-        parties_by_id = {v: k for k, v in Judgment.parties.items()}
-        return (
-            parties_by_id[self.in_favor_of_id]
-            if self.in_favor_of_id is not None
-            else None
-        )
-
-    @in_favor_of.setter
-    def in_favor_of(self, in_favor_of):
-        self.in_favor_of_id = in_favor_of and Judgment.parties[in_favor_of]
-
-    @property
-    def entered_by(self):
-        entrances_by_id = {v: k for k, v in Judgment.entrances.items()}
-        return (
-            entrances_by_id[self.entered_by_id]
-            if self.entered_by_id is not None
-            else "DEFAULT"
-        )
-
-    @entered_by.setter
-    def entered_by(self, entered_by):
-        self.entered_by_id = entered_by and Judgment.entrances[entered_by]
-
-    @property
-    def dismissal_basis(self):
-        dismissal_bases_by_id = {v: k for k, v in Judgment.dismissal_bases.items()}
-        return (
-            dismissal_bases_by_id[self.dismissal_basis_id]
-            if self.dismissal_basis_id is not None
-            else None
-        )
-
-    @dismissal_basis.setter
-    def dismissal_basis(self, dismissal_basis):
-        self.dismissal_basis_id = (
-            dismissal_basis and Judgment.dismissal_bases[dismissal_basis]
-        )
+    in_favor_of = parties.hybrid("in_favor_of_id")
+    entered_by = entrances.hybrid("entered_by_id", default="DEFAULT")
+    dismissal_basis = dismissal_bases.hybrid("dismissal_basis_id")
 
     @property
     def judge(self):
@@ -574,20 +573,43 @@ class Judgment(db.Model, Timestamped):
 
 
 class PleadingDocument(db.Model, Timestamped):
-    kinds = {"JUDGMENT": 0, "DETAINER_WARRANT": 1}
-
-    statuses = {
-        "FAILED_TO_EXTRACT_TEXT": 0,
-        "FAILED_TO_UPDATE_DETAINER_WARRANT": 1,
-        "FAILED_TO_UPDATE_JUDGMENT": 2,
-        "FAILED_TO_EXTRACT_TEXT_OCR": 3,
-    }
+    kinds = Codes({"JUDGMENT": 0, "DETAINER_WARRANT": 1})
+
+    statuses = Codes(
+        {
+            "FAILED_TO_EXTRACT_TEXT": 0,
+            "FAILED_TO_UPDATE_DETAINER_WARRANT": 1,
+            "FAILED_TO_UPDATE_JUDGMENT": 2,
+            "FAILED_TO_EXTRACT_TEXT_OCR": 3,
+        }
+    )
 
     __tablename__ = "pleading_documents"
+    __table_args__ = (
+        db.Index(
+            "ix_pleading_documents_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+    )
+
+    search_config = "english"
+
     image_path = Column(db.String(255), primary_key=True)
     text = Column(db.Text)
+    # kept up to date by Postgres on every write, and only loaded on request
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            db.Computed(
+                f"to_tsvector('{search_config}', coalesce(text, ''))", persisted=True
+            ),
+        )
+    )
     kind_id = Column(db.Integer)
-    docket_id = Column(db.String(255), db.ForeignKey("cases.docket_id"), nullable=False)
+    docket_id = Column(
+        db.String(255), db.ForeignKey("cases.docket_id"), nullable=False, index=True
+    )
     status_id = Column(db.Integer)
 
     judgments = relationship("Judgment", back_populates="document")
@@ -595,42 +617,8 @@ class PleadingDocument(db.Model, Timestamped):
         "DetainerWarrant", foreign_keys=docket_id, back_populates="pleadings"
     )
 
-    @hybrid_property
-    def kind(self):
-        kind_by_id = {v: k for k, v in PleadingDocument.kinds.items()}
-        return kind_by_id[self.kind_id] if self.kind_id is not None else None
-
-    @kind.setter
-    def kind(self, kind_name):
-        self.kind_id = PleadingDocument.kinds[kind_name] if kind_name else None
-
-    @kind.expression
-    def kind(cls):
-        return case(
-            [(cls.kind_id == 0, "JUDGMENT"), (cls.kind_id == 1, "DETAINER_WARRANT")],
-            else_=None,
-        ).label("kind")
-
-    @hybrid_property
-    def status(self):
-        status_by_id = {v: k for k, v in PleadingDocument.statuses.items()}
-        return status_by_id[self.status_id] if self.status_id is not None else None
-
-    @status.setter
-    def status(self, status_name):
-        self.status_id = PleadingDocument.statuses[status_name] if status_name else None
-
-    @status.expression
-    def status(cls):
-        return case(
-            [
-                (cls.status_id == 0, "FAILED_TO_EXTRACT_TEXT"),
-                (cls.status_id == 1, "FAILED_TO_UPDATE_DETAINER_WARRANT"),
-                (cls.status_id == 2, "FAILED_TO_UPDATE_JUDGMENT"),
-                (cls.status_id == 3, "FAILED_TO_EXTRACT_TEXT_OCR"),
-            ],
-            else_=None,
-        ).label("status")
+    kind = kinds.hybrid("kind_id")
+    status = statuses.hybrid("status_id")
 
     def __repr__(self):
         return f"<PleadingDocument(docket_id='{self.docket_id}', kind='{self.kind}', image_path='{self.image_path}')>"
@@ -669,7 +657,7 @@ MAX_CASES_PER_YEAR = 10_000_000
 
 
 class Case(db.Model, Timestamped):
-    statuses = {"CLOSED": 0, "PENDING": 1}
+    statuses = Codes({"CLOSED": 0, "PENDING": 1})
 
     def calc_order_number(docket_id):
         num = docket_id.replace("GT", "").replace("GC", "")
@@ -683,6 +671,26 @@ class Case(db.Model, Timestamped):
             return 0
 
     __tablename__ = "cases"
+    __table_args__ = (
+        db.Index(
+            "ix_cases_detainer_warrant_file_date",
+            "file_date",
+            postgresql_where=text("type = 'detainer_warrant'"),
+        ),
+        db.Index(
+            "ix_cases_detainer_warrant_plaintiff_id_file_date",
+            "plaintiff_id",
+            "file_date",
+            postgresql_where=text("type = 'detainer_warrant'"),
+        ),
+        db.Index(
+            "ix_cases_detainer_warrant_plaintiff_attorney_id",
+            "plaintiff_attorney_id",
+            postgresql_where=text("type = 'detainer_warrant'"),
+        ),
+        db.Index("ix_cases_updated_at", "updated_at"),
+    )
+
     _docket_id = Column(db.String(255), primary_key=True, name="docket_id")
     order_number = Column(db.BigInteger, nullable=False)
     _file_date = Column(db.Date, name="file_date")
@@ -740,21 +748,7 @@ class Case(db.Model, Timestamped):
     def file_date(self, posix):
         self._file_date = from_millis(posix) if posix else None
 
-    @hybrid_property
-    def status(self):
-        status_by_id = {v: k for k, v in DetainerWarrant.statuses.items()}
-        return status_by_id[self.status_id] if self.status_id is not None else None
-
-    @status.expression
-    def status(cls):
-        return case(
-            [(cls.status_id == 0, "CLOSED"), (cls.status_id == 1, "PENDING")],
-            else_=None,
-        ).label("status")
-
-    @status.setter
-    def status(self, status_name):
-        self.status_id = DetainerWarrant.statuses[status_name] if status_name else None
+    status = statuses.hybrid("status_id")
 
     @property
     def plaintiff(self):
@@ -795,10 +789,11 @@ class Case(db.Model, Timestamped):
 
     @classmethod
     def between_dates(cls, start, end, query):
+        """Filter to cases filed from start through end, inclusive."""
         return query.filter(
             and_(
-                func.date(cls.file_date) >= start,
-                func.date(cls.file_date) <= end,
+                cls._file_date >= start,
+                cls._file_date < end + timedelta(days=1),
             )
         )
 
@@ -814,21 +809,25 @@ class CivilWarrant(Case):
 class DetainerWarrant(Case):
     __mapper_args__ = {"polymorphic_identity": "detainer_warrant"}
 
-    recurring_court_dates = {
-        "SUNDAY": 0,
-        "MONDAY": 1,
-        "TUESDAY": 2,
-        "WEDNESDAY": 3,
-        "THURSDAY": 4,
-        "FRIDAY": 5,
-        "SATURDAY": 6,
-    }
-
-    audit_statuses = {
-        "CONFIRMED": 0,
-        "ADDRESS_CONFIRMED": 1,
-        "JUDGMENT_CONFIRMED": 2,
-    }
+    recurring_court_dates = Codes(
+        {
+            "SUNDAY": 0,
+            "MONDAY": 1,
+            "TUESDAY": 2,
+            "WEDNESDAY": 3,
+            "THURSDAY": 4,
+            "FRIDAY": 5,
+            "SATURDAY": 6,
+        }
+    )
+
+    audit_statuses = Codes(
+        {
+            "CONFIRMED": 0,
+            "ADDRESS_CONFIRMED": 1,
+            "JUDGMENT_CONFIRMED": 2,
+        }
+    )
 
     address = Column(db.String(255))
     address_certainty = Column(db.Float)
@@ -871,29 +870,8 @@ class DetainerWarrant(Case):
         cascade="all, delete",
     )
 
-    @hybrid_property
-    def audit_status(self):
-        status_by_id = {v: k for k, v in DetainerWarrant.audit_statuses.items()}
-        return (
-            status_by_id[self.audit_status_id]
-            if self.audit_status_id is not None
-            else None
-        )
-
-    @audit_status.setter
-    def audit_status(self, name):
-        self.audit_status_id = DetainerWarrant.audit_statuses[name] if name else None
-
-    @audit_status.expression
-    def audit_status(cls):
-        return case(
-            [
-                (cls.audit_status_id == 0, "CONFIRMED"),
-                (cls.audit_status_id == 1, "ADDRESS_CONFIRMED"),
-                (cls.audit_status_id == 2, "JUDGMENT_CONFIRMED"),
-            ],
-            else_=None,
-        ).label("audit_status")
+    audit_status = audit_statuses.hybrid("audit_status_id")
+    recurring_court_date = recurring_court_dates.hybrid("court_date_recurring_id")
 
     def __repr__(self):
         return f"<DetainerWarrant(docket_id='{self.docket_id}', file_date='{self._file_date}')>"
@@ -915,21 +893,6 @@ class DetainerWarrant(Case):
     def court_date(self, posix):
         self._court_date = from_millis(posix) if posix else None
 
-    @property
-    def recurring_court_date(self):
-        date_by_id = {v: k for k, v in DetainerWarrant.recurring_court_dates.items()}
-        return (
-            date_by_id[self.court_date_recurring_id]
-            if self.court_date_recurring_id
-            else None
-        )
-
-    @recurring_court_date.setter
-    def recurring_court_date(self, day_of_week):
-        self.court_date_recurring_id = (
-            DetainerWarrant.recurring_court_dates[day_of_week] if day_of_week else None
-        )
-
     @hybrid_property
     def last_pleading_documents_check(self):
         if self._last_pleading_documents_check:
@@ -962,10 +925,14 @@ class DetainerWarrant(Case):
 
 
 class PhoneNumberVerification(db.Model, Timestamped):
-    caller_types = {
-        "CONSUMER": 1,
-        "BUSINESS": 2,
-    }
+    # Twilio may report caller types we do not know, which are kept as null
+    caller_types = Codes(
+        {
+            "CONSUMER": 1,
+            "BUSINESS": 2,
+        },
+        strict=False,
+    )
 
     __tablename__ = "phone_number_verifications"
     id = Column(db.Integer, primary_key=True)
@@ -1010,16 +977,7 @@ class PhoneNumberVerification(db.Model, Timestamped):
             phone_number=lookup.phone_number,
         )
 
-    @property
-    def caller_type(self):
-        caller_type_by_id = {
-            v: k for k, v in PhoneNumberVerification.caller_types.items()
-        }
-        return caller_type_by_id.get(self.caller_type_id)
-
-    @caller_type.setter
-    def caller_type(self, caller_type):
-        self.caller_type_id = PhoneNumberVerification.caller_types.get(caller_type)
+    caller_type = caller_types.hybrid("caller_type_id")
 
     def __repr__(self):
         return f"<PhoneNumberVerification(caller_name='{self.caller_name}', phone_type='{self.phone_type}', phone_number='{self.phone_number}')>"
@@ -1,5 +1,15 @@
 from marshmallow import Schema, fields
+
+from rdc_website.database import eager_loads
 from ..admin import serializers
+from .models import (
+    Defendant,
+    DetainerWarrant,
+    Hearing,
+    Judgment,
+    PhoneNumberVerification,
+    PleadingDocument,
+)
 
 
 class AttorneySchema(Schema):
@@ -12,6 +22,8 @@ attorneys_schema = AttorneySchema(many=True)
 
 
 class PhoneNumberVerificationSchema(Schema):
+    caller_type = PhoneNumberVerification.caller_types.field()
+
     class Meta:
         fields = (
             "caller_name",
@@ -45,6 +57,16 @@ class DefendantSchema(Schema):
             "potential_phones",
         )
 
+    def get_query_options(self, load):
+        return eager_loads(
+            self,
+            load,
+            verified_phone=(
+                load.joinedload(Defendant.verified_phone),
+                phone_number_verification_schema,
+            ),
+        )
+
 
 defendant_schema = DefendantSchema()
 defendants_schema = DefendantSchema(many=True)
@@ -82,11 +104,12 @@ class JudgmentSchema(Schema):
     file_date = fields.Int(allow_none=True)
     awards_possession = fields.Bool(allow_none=True)
     awards_fees = fields.Float(allow_none=True)
-    entered_by = fields.String(allow_none=True)
+    in_favor_of = Judgment.parties.field()
+    entered_by = Judgment.entrances.field()
     interest = fields.Bool(allow_none=True)
     interest_rate = fields.Float(allow_none=True)
     interest_follows_site = fields.Bool(allow_none=True)
-    dismissal_basis = fields.String(allow_none=True)
+    dismissal_basis = Judgment.dismissal_bases.field()
     with_prejudice = fields.Bool(allow_none=True)
     notes = fields.String(allow_none=True)
 
@@ -120,6 +143,24 @@ class JudgmentSchema(Schema):
             "document",
         )
 
+    def get_query_options(self, load):
+        return eager_loads(
+            self,
+            load,
+            hearing=(load.joinedload(Judgment.hearing), hearing_schema),
+            judge=(load.joinedload(Judgment._judge), judge_schema),
+            plaintiff=(load.joinedload(Judgment._plaintiff), plaintiff_schema),
+            plaintiff_attorney=(
+                load.joinedload(Judgment._plaintiff_attorney),
+                attorney_schema,
+            ),
+            defendant_attorney=(
+                load.joinedload(Judgment._defendant_attorney),
+                attorney_schema,
+            ),
+            document=(load.joinedload(Judgment.document), pleading_document_schema),
+        )
+
 
 judgment_schema = JudgmentSchema()
 judgments_schema = JudgmentSchema(many=True)
@@ -152,12 +193,32 @@ class HearingSchema(Schema):
             "defendant_attorney",
         )
 
+    def get_query_options(self, load):
+        return eager_loads(
+            self,
+            load,
+            courtroom=(load.joinedload(Hearing.courtroom), courtroom_schema),
+            # only the judgment's id is shown, so nothing below it is needed
+            judgment=(load.joinedload(Hearing.judgment), None),
+            plaintiff=(load.joinedload(Hearing.plaintiff), plaintiff_schema),
+            plaintiff_attorney=(
+                load.joinedload(Hearing.plaintiff_attorney),
+                attorney_schema,
+            ),
+            defendant_attorney=(
+                load.joinedload(Hearing.defendant_attorney),
+                attorney_schema,
+            ),
+        )
+
 
 hearing_schema = HearingSchema()
 hearings_schema = HearingSchema(many=True)
 
 
 class PleadingDocumentSchema(Schema):
+    kind = PleadingDocument.kinds.field()
+
     class Meta:
         fields = ("image_path", "text", "kind", "docket_id", "created_at", "updated_at")
 
@@ -176,7 +237,7 @@ class DetainerWarrantSchema(Schema):
     docket_id = fields.String()
     address = fields.String(allow_none=True)
     file_date = fields.Int(allow_none=True)
-    status = fields.String(allow_none=True)
+    status = DetainerWarrant.statuses.field()
     amount_claimed = fields.Float(allow_none=True)
     claims_possession = fields.Bool(allow_none=True)
     court_date = fields.Int(allow_none=True)
@@ -184,7 +245,7 @@ class DetainerWarrantSchema(Schema):
     is_legacy = fields.Bool(allow_none=True)
     nonpayment = fields.Bool(allow_none=True)
     notes = fields.String(allow_none=True)
-    audit_status = fields.String(allow_none=True)
+    audit_status = DetainerWarrant.audit_statuses.field()
     created_at = fields.Int()
     updated_at = fields.Int()
 
@@ -212,6 +273,26 @@ class DetainerWarrantSchema(Schema):
             "document",
         )
 
+    def get_query_options(self, load):
+        return eager_loads(
+            self,
+            load,
+            plaintiff=(load.joinedload(DetainerWarrant._plaintiff), plaintiff_schema),
+            plaintiff_attorney=(
+                load.joinedload(DetainerWarrant._plaintiff_attorney),
+                attorney_schema,
+            ),
+            hearings=(load.selectinload(DetainerWarrant.hearings), hearing_schema),
+            last_edited_by=(
+                load.joinedload(DetainerWarrant.last_edited_by),
+                serializers.user_schema,
+            ),
+            document=(
+                load.joinedload(DetainerWarrant.document),
+                pleading_document_schema,
+            ),
+        )
+
 
 detainer_warrant_schema = DetainerWarrantSchema()
 detainer_warrants_schema = DetainerWarrantSchema(many=True)
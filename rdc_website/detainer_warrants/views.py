@@ -1,5 +1,5 @@
 import operator
-from flask import Blueprint
+from flask import Blueprint, request
 from flask_security import current_user 
 from flask_resty import (
     ApiError,
@@ -10,6 +10,7 @@ from flask_resty import (
     ColumnFilter,
     GenericModelView,
     CursorPaginationBase,
+    LimitOffsetPagination,
     RelayCursorPagination,
     Filtering,
     Sorting,
@@ -17,7 +18,19 @@ from flask_resty import (
     model_filter,
 )
 
-from sqlalchemy import and_, or_, func
+from marshmallow import ValidationError
+from sqlalchemy import (
+    and_,
+    any_,
+    cast,
+    column,
+    func,
+    inspect,
+    or_,
+    select,
+    update,
+    values,
+)
 from sqlalchemy.orm import raiseload
 from sqlalchemy.exc import IntegrityError
 
@@ -33,6 +46,7 @@ from .models import (
     Judge,
     Judgment,
     PhoneNumberVerification,
+    detainer_warrant_defendants,
 )
 from .serializers import *
 from rdc_website.permissions.api import (
@@ -43,7 +57,11 @@ from rdc_website.permissions.api import (
     OnlyOrganizers,
     CursorPagination,
     AllowDefendant,
+    FetchByIds,
+    SparseFieldsets,
 )
+from rdc_website.fast_lists import FastLists, as_float, millis
+from rdc_website.rollups.cache import mark_data_changed
 from psycopg2 import errors
 
 UniqueViolation = errors.lookup("23505")
@@ -64,12 +82,27 @@ def filter_last_name(model, name):
     return model.last_name.ilike(f"%{name}%")
 
 
+def any_of(ids):
+    # an array subquery runs once, with the trigram index, and leaves the
+    # planner free to OR together index scans on the outer table, where a
+    # correlated subquery would be run for every row
+    return any_(func.array(ids.scalar_subquery()))
+
+
 @model_filter(fields.String())
 def filter_any_field(model, value):
+    pattern = f"%{value}%"
     return or_(
-        model._plaintiff.has(Plaintiff.name.ilike(f"%{value}%")),
-        model._plaintiff_attorney.has(Attorney.name.ilike(f"%{value}%")),
-        model._defendants.any(Defendant.name.ilike(f"%{value}%")),
+        model.plaintiff_id
+        == any_of(select(Plaintiff.id).where(Plaintiff.name.ilike(pattern))),
+        model.plaintiff_attorney_id
+        == any_of(select(Attorney.id).where(Attorney.name.ilike(pattern))),
+        model._docket_id
+        == any_of(
+            select(detainer_warrant_defendants.c.detainer_warrant_docket_id)
+            .join(Defendant)
+            .where(Defendant.full_name.ilike(pattern))
+        ),
     )
 
 
@@ -81,9 +114,14 @@ def filter_across_name_alias(model, value):
     )
 
 
-class AttorneyResourceBase(GenericModelView):
+class AttorneyResourceBase(FastLists, FetchByIds, SparseFieldsets, GenericModelView):
     model = Attorney
     schema = attorney_schema
+    fast_columns = {
+        "id": Attorney.id,
+        "name": Attorney.name,
+        "aliases": Attorney.aliases,
+    }
 
     authentication = HeaderUserAuthentication()
     authorization = Protected()
@@ -109,7 +147,7 @@ class AttorneyResource(AttorneyResourceBase):
         return self.update(int(id), partial=True)
 
 
-class DefendantResourceBase(GenericModelView):
+class DefendantResourceBase(FetchByIds, SparseFieldsets, GenericModelView):
     model = Defendant
     schema = defendant_schema
 
@@ -139,7 +177,7 @@ class DefendantResource(DefendantResourceBase):
         return self.update(int(id), partial=True)
 
 
-class CourtroomResourceBase(GenericModelView):
+class CourtroomResourceBase(FetchByIds, SparseFieldsets, GenericModelView):
     model = Courtroom
     schema = courtroom_schema
 
@@ -169,9 +207,14 @@ class CourtroomResource(CourtroomResourceBase):
         return self.update(int(id), partial=True)
 
 
-class PlaintiffResourceBase(GenericModelView):
+class PlaintiffResourceBase(FastLists, FetchByIds, SparseFieldsets, GenericModelView):
     model = Plaintiff
     schema = plaintiff_schema
+    fast_columns = {
+        "id": Plaintiff.id,
+        "name": Plaintiff.name,
+        "aliases": Plaintiff.aliases,
+    }
 
     authentication = HeaderUserAuthentication()
     authorization = Protected()
@@ -197,9 +240,14 @@ class PlaintiffResource(PlaintiffResourceBase):
         return self.update(int(id), partial=True)
 
 
-class JudgeResourceBase(GenericModelView):
+class JudgeResourceBase(FastLists, FetchByIds, SparseFieldsets, GenericModelView):
     model = Judge
     schema = judge_schema
+    fast_columns = {
+        "id": Judge.id,
+        "name": Judge.name,
+        "aliases": Judge.aliases,
+    }
 
     authentication = HeaderUserAuthentication()
     authorization = Protected()
@@ -225,9 +273,10 @@ class JudgeResource(JudgeResourceBase):
         return self.update(int(id), partial=True)
 
 
-class JudgmentResourceBase(GenericModelView):
+class JudgmentResourceBase(FetchByIds, SparseFieldsets, GenericModelView):
     model = Judgment
     schema = judgment_schema
+    large_columns = ("notes",)
 
     authentication = HeaderUserAuthentication()
     authorization = PartnerProtected()
@@ -259,7 +308,7 @@ class JudgmentResource(JudgmentResourceBase):
         return self.destroy(int(id))
 
 
-class HearingResourceBase(GenericModelView):
+class HearingResourceBase(FetchByIds, SparseFieldsets, GenericModelView):
     model = Hearing
     schema = hearing_schema
 
@@ -337,10 +386,21 @@ def filter_address(model, address):
         return model.address.ilike(f"%{address}%")
 
 
-class PleadingDocumentResourceBase(GenericModelView):
+class PleadingDocumentResourceBase(
+    FastLists, FetchByIds, SparseFieldsets, GenericModelView
+):
     model = PleadingDocument
     schema = pleading_document_schema
     id_fields = ("image_path",)
+    large_columns = ("text",)
+    fast_columns = {
+        "image_path": PleadingDocument.image_path,
+        "text": PleadingDocument.text,
+        "kind": PleadingDocument.kind,
+        "docket_id": PleadingDocument.docket_id,
+        "created_at": millis(PleadingDocument._created_at),
+        "updated_at": millis(PleadingDocument._updated_at),
+    }
 
     authentication = HeaderUserAuthentication()
     authorization = OnlyOrganizers()
@@ -351,9 +411,46 @@ class PleadingDocumentResourceBase(GenericModelView):
 
 
 class PleadingDocumentListResource(PleadingDocumentResourceBase):
+    search_pagination = LimitOffsetPagination(default_limit=50, max_limit=100)
+    headline_options = "MaxFragments=3, MinWords=10, MaxWords=30"
+
     def get(self):
+        if request.args.get("q"):
+            return self.search(request.args["q"])
+
         return self.list()
 
+    def search(self, q):
+        """List documents matching q, best first, each with a highlighted snippet."""
+        config = PleadingDocument.search_config
+        tsquery = func.websearch_to_tsquery(config, q)
+        rank = func.ts_rank_cd(PleadingDocument.search_vector, tsquery)
+        query = (
+            self.filter_list_query(self.query)
+            .filter(PleadingDocument.search_vector.op("@@")(tsquery))
+            .add_columns(rank)
+            .order_by(rank.desc(), PleadingDocument.image_path)
+        )
+        hits = self.search_pagination.get_page(query, self)
+
+        # headlines are costly, so only build them for the page returned
+        image_paths = [document.image_path for document, _ in hits]
+        headlines = dict(
+            db.session.query(
+                PleadingDocument.image_path,
+                func.ts_headline(
+                    config, PleadingDocument.text, tsquery, self.headline_options
+                ),
+            ).filter(PleadingDocument.image_path.in_(image_paths))
+        )
+
+        data = self.serialize([document for document, _ in hits], many=True)
+        for item, (document, score) in zip(data, hits):
+            item["rank"] = score
+            item["headline"] = headlines[document.image_path]
+
+        return self.make_response(data)
+
     def post(self):
         return self.create()
 
@@ -366,10 +463,33 @@ class PleadingDocumentResource(PleadingDocumentResourceBase):
         return self.update(int(id), partial=True)
 
 
-class DetainerWarrantResourceBase(GenericModelView):
+class DetainerWarrantResourceBase(
+    FastLists, FetchByIds, SparseFieldsets, GenericModelView
+):
     model = DetainerWarrant
     schema = detainer_warrant_schema
     id_fields = ("docket_id",)
+    large_columns = ("notes", "pleading_document_check_mismatched_html")
+    # the nested relations are left to the schema, so lists only take the
+    # fast path when `?fields` leaves them out
+    fast_columns = {
+        "docket_id": DetainerWarrant._docket_id,
+        "address": DetainerWarrant.address,
+        "order_number": DetainerWarrant.order_number,
+        "file_date": millis(DetainerWarrant._file_date),
+        "status": DetainerWarrant.status,
+        # warrants have no court date column of their own
+        "court_date": None,
+        "amount_claimed": as_float(DetainerWarrant.amount_claimed),
+        "claims_possession": DetainerWarrant.claims_possession,
+        "is_legacy": DetainerWarrant.is_legacy,
+        "is_cares": DetainerWarrant.is_cares,
+        "nonpayment": DetainerWarrant.nonpayment,
+        "notes": DetainerWarrant.notes,
+        "audit_status": DetainerWarrant.audit_status,
+        "created_at": millis(DetainerWarrant._created_at),
+        "updated_at": millis(DetainerWarrant._updated_at),
+    }
 
     authentication = HeaderUserAuthentication()
     authorization = PartnerProtected()
@@ -391,9 +511,133 @@ class DetainerWarrantResourceBase(GenericModelView):
 
 
 class DetainerWarrantListResource(DetainerWarrantResourceBase):
+    max_bulk_updates = 500
+    # the flat fields an audit edits, which map straight onto columns
+    bulk_fields = (
+        "address",
+        "file_date",
+        "status",
+        "amount_claimed",
+        "claims_possession",
+        "is_cares",
+        "is_legacy",
+        "nonpayment",
+        "notes",
+        "audit_status",
+    )
+
     def get(self):
         return self.list()
 
+    def patch(self):
+        """Apply many partial updates at once, reporting on each.
+
+        Takes a list of updates, each with a `docket_id` and any of the
+        `bulk_fields`. Valid updates are written in one transaction, with
+        one UPDATE for each set of fields edited together. Each item gets
+        back its status: updated, not_found or invalid.
+        """
+        items = self.parse_request_data()
+        if not isinstance(items, list):
+            raise ApiError(400, {"code": "invalid_data.not_list"})
+        if len(items) > self.max_bulk_updates:
+            raise ApiError(
+                400, {"code": "too_many_items", "detail": str(self.max_bulk_updates)}
+            )
+
+        # there is no one item to check, only that the request has a user
+        self.authorization.authorize_modify_item(None, "update")
+        schema = type(self.schema)(only=("docket_id", *self.bulk_fields))
+
+        results, updates = [], {}
+        for item in items:
+            docket_id = item.get("docket_id") if isinstance(item, dict) else None
+            result = {"docket_id": docket_id}
+            results.append(result)
+            try:
+                data = schema.load(item, partial=True)
+            except ValidationError as e:
+                result.update(status="invalid", errors=e.messages)
+                continue
+
+            if not docket_id:
+                result.update(status="invalid", errors={"docket_id": ["Missing data."]})
+            elif docket_id in updates:
+                result.update(status="invalid", errors={"docket_id": ["Duplicate."]})
+            else:
+                del data["docket_id"]
+                updates[docket_id] = (result, self.column_values(data))
+
+        updated = set()
+        for group in self.group_by_columns(updates).values():
+            updated.update(self.bulk_update(group))
+        self.commit()
+
+        for docket_id, (result, _) in updates.items():
+            result["status"] = "updated" if docket_id in updated else "not_found"
+        return self.make_response(results)
+
+    def column_values(self, data):
+        """The column values the model's setters make of deserialized data."""
+        stub = DetainerWarrant(**data)
+        mapper = inspect(DetainerWarrant)
+        columns = {
+            mapper.column_attrs[attr.key].columns[0]: attr.value
+            for attr in inspect(stub).attrs
+            if attr.key in mapper.column_attrs and attr.history.has_changes()
+        }
+        # set on every new instance, and already right on every warrant
+        columns.pop(mapper.polymorphic_on, None)
+        return columns
+
+    def group_by_columns(self, updates):
+        groups = {}
+        for docket_id, (_, changes) in updates.items():
+            key = tuple(sorted(column.name for column in changes))
+            groups.setdefault(key, []).append((docket_id, changes))
+        return groups
+
+    def bulk_update(self, group):
+        """Update every warrant in group, which all set the same columns.
+
+        Returns the docket ids of the warrants that were found and updated.
+        """
+        table = DetainerWarrant.__table__
+        columns = list(group[0][1])
+        rows = values(
+            column("docket_id", table.c.docket_id.type),
+            *(column(c.name, c.type) for c in columns),
+            name="updates",
+        ).data(
+            [
+                (docket_id, *(changes[c] for c in columns))
+                for docket_id, changes in group
+            ]
+        )
+        # the allowed rows, which is also where warrants are told from other cases
+        allowed = self.authorization.filter_query(self.query_raw, self).with_entities(
+            DetainerWarrant._docket_id
+        )
+        statement = (
+            update(table)
+            .where(table.c.docket_id == rows.c.docket_id)
+            .where(table.c.docket_id.in_(allowed.scalar_subquery()))
+            .values(
+                {
+                    # a column that is null in every row of VALUES has no
+                    # type of its own
+                    **{c: cast(rows.c[c.name], c.type) for c in columns},
+                    table.c.last_edited_by_id: current_user.id,
+                }
+            )
+            .returning(table.c.docket_id)
+        )
+        updated = db.session.execute(statement).scalars().all()
+        # the UPDATE skips the flush, where writes are usually noticed
+        if updated:
+            mark_data_changed(db.session)
+        return updated
+
 
 class DetainerWarrantResource(DetainerWarrantResourceBase):
     def get(self, id):
@@ -407,7 +651,9 @@ class DetainerWarrantResource(DetainerWarrantResourceBase):
         return self.upsert(id)
 
 
-class PhoneNumberVerificationResourceBase(GenericModelView):
+class PhoneNumberVerificationResourceBase(
+    FetchByIds, SparseFieldsets, GenericModelView
+):
     model = PhoneNumberVerification
     schema = phone_number_verification_schema
 
@@ -0,0 +1,147 @@
+"""The SQL statements run while serving each request, and how long they took.
+
+Every response says how many statements it ran, in an X-Query-Count header,
+and how long it spent in the database and in all, in a Server-Timing header
+the browser's network tab shows. So a page that has started issuing a
+query per row shows up there, and tests can assert on it. The same numbers go
+to Prometheus as histograms labelled by endpoint.
+
+The histograms are plain module-level metrics. Under gunicorn,
+PROMETHEUS_MULTIPROC_DIR makes each worker write them to its own files,
+which the GunicornPrometheusMetrics exporter started in the gunicorn config
+reads back along with its own, so they need no registering with it.
+
+Statements slower than SLOW_QUERY_SECONDS are logged, with the shapes of
+their parameters rather than the values. A SLOW_QUERY_SAMPLE_RATE below 1
+logs them for only that fraction of requests, chosen once per request so that
+a request that is logged has all of its slow statements logged.
+"""
+
+import random
+import time
+
+from flask import current_app, g, has_app_context, has_request_context, request
+from loguru import logger
+from prometheus_client import Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+QUERY_COUNT_HEADER = "X-Query-Count"
+
+DEFAULT_SLOW_QUERY_SECONDS = 0.5
+DEFAULT_SLOW_QUERY_SAMPLE_RATE = 1.0
+
+REQUEST_QUERIES = Histogram(
+    "flask_http_request_db_statements",
+    "SQL statements run per request",
+    ["endpoint"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+REQUEST_DB_TIME = Histogram(
+    "flask_http_request_db_duration_seconds",
+    "Time spent running SQL statements per request",
+    ["endpoint"],
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def start_query(connection, cursor, statement, parameters, context, executemany):
+    connection.info.setdefault("query_started", []).append(time.perf_counter())
+    if has_request_context():
+        g.query_count = g.get("query_count", 0) + 1
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def end_query(connection, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - connection.info["query_started"].pop()
+    if has_request_context():
+        g.query_time = g.get("query_time", 0.0) + duration
+    if has_app_context():
+        log_if_slow(statement, parameters, duration)
+
+
+@event.listens_for(Engine, "handle_error")
+def abandon_query(exception_context):
+    # a failed statement never reaches after_cursor_execute
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started"):
+        connection.info["query_started"].pop()
+
+
+def shape(value):
+    """What a bound value looks like, without what it holds."""
+    if isinstance(value, (str, bytes, list, tuple)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def parameter_shapes(parameters):
+    if isinstance(parameters, dict):
+        return {key: shape(value) for key, value in parameters.items()}
+    if not parameters:
+        return []
+    if all(isinstance(row, (dict, list, tuple)) for row in parameters):
+        # executemany, where the first row stands for the rest
+        return [parameter_shapes(parameters[0]), f"x{len(parameters)}"]
+    return [shape(value) for value in parameters]
+
+
+def sampled():
+    """Whether slow statements are logged, decided once per request."""
+    rate = current_app.config.get(
+        "SLOW_QUERY_SAMPLE_RATE", DEFAULT_SLOW_QUERY_SAMPLE_RATE
+    )
+    if not has_request_context():
+        return random.random() < rate
+
+    if "slow_queries_sampled" not in g:
+        g.slow_queries_sampled = random.random() < rate
+    return g.slow_queries_sampled
+
+
+def log_if_slow(statement, parameters, duration):
+    threshold = current_app.config.get("SLOW_QUERY_SECONDS", DEFAULT_SLOW_QUERY_SECONDS)
+    if duration < threshold or not sampled():
+        return
+
+    logger.warning(
+        "Slow query took {duration:.3f}s on {endpoint}: {statement} {parameters}",
+        duration=duration,
+        endpoint=request.endpoint if has_request_context() else None,
+        statement=statement,
+        parameters=parameter_shapes(parameters),
+    )
+
+
+def query_count():
+    return g.get("query_count", 0)
+
+
+def query_time():
+    return g.get("query_time", 0.0)
+
+
+def start_request():
+    g.request_started = time.perf_counter()
+
+
+def record_request(response):
+    count, db_time = query_count(), query_time()
+    total = time.perf_counter() - g.get("request_started", time.perf_counter())
+    endpoint = request.endpoint or "none"
+
+    REQUEST_QUERIES.labels(endpoint).observe(count)
+    REQUEST_DB_TIME.labels(endpoint).observe(db_time)
+
+    response.headers[QUERY_COUNT_HEADER] = str(count)
+    response.headers.add(
+        "Server-Timing",
+        f'db;dur={db_time * 1000:.1f};desc="{count} queries", '
+        f"total;dur={total * 1000:.1f}",
+    )
+    return response
+
+
+def init_app(app):
+    app.before_request(start_request)
+    app.after_request(record_request)
@@ -2,6 +2,7 @@ from datetime import datetime, date, timedelta
 from apscheduler.triggers.cron import CronTrigger
 
 import rdc_website.detainer_warrants as detainer_warrants
+import rdc_website.rollups as rollups
 from rdc_website.extensions import scheduler
 
 from loguru import logger
@@ -47,6 +48,36 @@ def import_caselink_warrants(start_date=None, end_date=None):
 
         detainer_warrants.caselink.warrants.import_from_caselink(start, end)
 
+        logger.info(f"Refreshing dashboard rollups")
+
+        rollups.refresh.refresh_daily()
+        rollups.snapshots.write(scheduler.app)
+
+
+@scheduler.task(
+    CronTrigger(hour=3, minute=0, second=0, jitter=200),
+    id="rebuild-rollups",
+)
+def rebuild_rollups():
+    """Rebuild rollup_daily in full, catching moved dates and deleted records."""
+    with scheduler.app.app_context():
+        logger.info(f"Rebuilding dashboard rollups")
+
+        rollups.refresh.refresh_daily(full=True)
+        rollups.snapshots.write(scheduler.app)
+
+
+@scheduler.task(
+    CronTrigger(hour=0, minute=5, second=0, jitter=200),
+    id="write-rollup-snapshots",
+)
+def write_rollup_snapshots():
+    """Write the rollup snapshots nginx serves once their windows move to a new day."""
+    with scheduler.app.app_context():
+        logger.info(f"Writing dashboard rollup snapshots")
+
+        rollups.snapshots.write(scheduler.app)
+
 
 # @scheduler.task(
 #     CronTrigger(day_of_week=weekdays, hour=19, minute=5, second=0, jitter=200),
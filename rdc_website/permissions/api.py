@@ -1,3 +1,10 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, request
 from flask_security import current_user
 from flask_resty import (
     ApiError,
@@ -15,8 +22,20 @@ from flask_resty import (
     meta,
     model_filter,
 )
+from marshmallow import fields
+from rdc_website.database import db
 from rdc_website.detainer_warrants.models import DetainerWarrant, Defendant
-from sqlalchemy import or_
+from psycopg2 import errors
+from sqlalchemy import func, inspect, or_, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Load, defer, load_only
+
+QueryCanceled = errors.lookup("57014")
+
+DEFAULT_TOTAL_MATCHES_TTL = 60
+DEFAULT_TOTAL_MATCHES_MAX_ENTRIES = 1024
+# counts taking longer than this many seconds give way to the planner's estimate
+DEFAULT_TOTAL_MATCHES_COUNT_TIMEOUT = 0.5
 
 
 class AllowDefendant(AuthorizeModifyMixin, HasCredentialsAuthorizationBase):
@@ -125,6 +144,72 @@ class OnlyMe(AuthorizeModifyMixin, HasCredentialsAuthorizationBase):
             raise ApiError(403, {"code": "invalid_user"})
 
 
+class TotalMatches:
+    """Recently computed totals, keyed by the statement that counts them."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = OrderedDict()
+
+    def get(self, key, ttl):
+        with self._lock:
+            entry = self._totals.get(key)
+            if entry is None or entry[0] <= time.monotonic() - ttl:
+                return None
+            self._totals.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, total, max_entries):
+        with self._lock:
+            self._totals[key] = (time.monotonic(), total)
+            self._totals.move_to_end(key)
+            while len(self._totals) > max_entries:
+                self._totals.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._totals.clear()
+
+
+total_matches = TotalMatches()
+
+
+def compile_query(query):
+    compiled = query.statement.compile(
+        dialect=db.engine.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    return str(compiled), compiled.params
+
+
+def count_rows(query, timeout):
+    """Count the query's rows, or return None if that takes over timeout seconds."""
+    statement = select(func.count()).select_from(query.statement.subquery())
+    # a connection of its own, so that a cancelled count leaves the request's
+    # transaction usable and its statement timeout untouched
+    with db.engine.connect() as connection:
+        connection.execute(
+            text("select set_config('statement_timeout', :timeout, true)"),
+            {"timeout": f"{int(timeout * 1000)}ms"},
+        )
+        try:
+            return connection.execute(statement).scalar()
+        except OperationalError as e:
+            if isinstance(e.orig, QueryCanceled):
+                return None
+            raise
+
+
+def estimate_rows(statement, params):
+    plan = (
+        db.session.connection()
+        .exec_driver_sql(f"explain (format json) {statement}", params)
+        .scalar()
+    )
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
 class CursorPagination(RelayCursorPagination, LimitPagination):
     # def get_limit(self):
     #     return 100
@@ -139,6 +224,205 @@ class CursorPagination(RelayCursorPagination, LimitPagination):
             )
 
         meta.update_response_meta({"after_cursor": after_cursor})
-        meta.update_response_meta({"total_matches": query.count()})
+        if request.args.get("with_total") != "false":
+            total, exact = self.get_total_matches(query)
+            meta.update_response_meta(
+                {"total_matches": total, "total_matches_exact": exact}
+            )
 
         return items
+
+    def get_column_fields(self, view, field_orderings):
+        # the serializer may leave out the sort fields when `?fields` is set,
+        # and cursors have to be parsed back with the full schema anyway
+        schema = view.deserializer
+        return tuple(schema.fields[field_name] for field_name, _ in field_orderings)
+
+    def get_total_matches(self, query):
+        """Count the matches, or estimate them when counting is slow.
+
+        The count is cancelled after TOTAL_MATCHES_COUNT_TIMEOUT seconds, and
+        only then is the planner asked for an estimate. Totals are kept for
+        TOTAL_MATCHES_TTL seconds per statement, so paging through one search
+        only counts once. The statement carries every filter, including those
+        scoping it to the current user.
+        """
+        config = current_app.config
+        query = query.order_by(None)
+        statement, params = compile_query(query)
+        key = hashlib.sha1(
+            f"{statement}{sorted(params.items())!r}".encode()
+        ).hexdigest()
+
+        ttl = config.get("TOTAL_MATCHES_TTL", DEFAULT_TOTAL_MATCHES_TTL)
+        total = total_matches.get(key, ttl)
+        if total is not None:
+            return total
+
+        count = count_rows(
+            query,
+            config.get(
+                "TOTAL_MATCHES_COUNT_TIMEOUT", DEFAULT_TOTAL_MATCHES_COUNT_TIMEOUT
+            ),
+        )
+        if count is None:
+            total = (estimate_rows(statement, params), False)
+        else:
+            total = (count, True)
+
+        total_matches.set(
+            key,
+            total,
+            config.get("TOTAL_MATCHES_MAX_ENTRIES", DEFAULT_TOTAL_MATCHES_MAX_ENTRIES),
+        )
+        return total
+
+
+def request_list(name):
+    value = request.args.get(name)
+    if not value:
+        return None
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+class SparseFieldsets:
+    """Let GET requests choose what they get back.
+
+    `?fields=docket_id,file_date,plaintiff` dumps only those fields, and
+    `?expand=hearings` adds nested relations to them. Relations left out are
+    not loaded, and only the columns behind the chosen fields are selected.
+    Without `?fields` everything is returned as before, except for the
+    `large_columns`, which are only loaded when their field is dumped.
+    """
+
+    large_columns = ()
+
+    @property
+    def serializer(self):
+        names = self.requested_fields()
+        if names is None:
+            return self.schema
+        return type(self.schema)(only=names)
+
+    def requested_fields(self):
+        if request.method != "GET":
+            return None
+
+        names = request_list("fields")
+        expand = request_list("expand")
+        for parameter, requested in (("fields", names), ("expand", expand)):
+            unknown = set(requested or ()) - set(self.schema.fields)
+            if unknown:
+                raise ApiError(
+                    400,
+                    {
+                        "code": "invalid_fields",
+                        "detail": ", ".join(sorted(unknown)),
+                        "source": {"parameter": parameter},
+                    },
+                )
+
+        if names is None:
+            return None
+        return [*names, *(expand or [])]
+
+    @property
+    def query_options(self):
+        serializer = self.serializer
+        options = []
+        if hasattr(serializer, "get_query_options"):
+            options.extend(serializer.get_query_options(Load(self.model)))
+
+        columns = self.selected_columns(serializer)
+        if columns is not None:
+            options.append(load_only(*columns))
+        else:
+            options.extend(
+                defer(getattr(self.model, name))
+                for name in self.large_columns
+                if name not in serializer.fields
+            )
+        return options
+
+    def selected_columns(self, serializer):
+        """The columns behind the dumped fields, or None to load them all.
+
+        A field is matched to the column of the same name, its underscored
+        hybrid backing column, or its `_id` column. Nested fields are loaded
+        by the schema's eager loads. Any other field might read anything, so
+        all columns are loaded.
+        """
+        if serializer is self.schema:
+            return None
+
+        mapper = inspect(self.model)
+        names = {
+            name
+            for name, field in serializer.fields.items()
+            if not isinstance(field, fields.Nested)
+        }
+        # cursors are built from the sort fields
+        if self.sorting:
+            names.update(
+                name for name, _ in self.sorting.get_request_field_orderings(self)
+            )
+
+        columns = []
+        for name in names:
+            for key in (name, f"_{name}", f"{name}_id"):
+                if key in mapper.column_attrs:
+                    columns.append(getattr(self.model, key))
+                    break
+            else:
+                return None
+        return columns
+
+
+class FetchByIds:
+    """Let list requests ask for specific items with `?id=a,b,c`.
+
+    The ids are those of the view's primary key, so `docket_id` for warrants
+    and `image_path` for pleading documents. They are fetched with one IN
+    query, with the usual filters and eager loads, and come back together on
+    one page. At most `max_ids` can be asked for at once.
+    """
+
+    max_ids = 100
+
+    def requested_ids(self):
+        ids = request_list("id")
+        if ids is None:
+            return None
+
+        if len(ids) > self.max_ids:
+            raise ApiError(
+                400,
+                {
+                    "code": "too_many_ids",
+                    "detail": str(self.max_ids),
+                    "source": {"parameter": "id"},
+                },
+            )
+
+        python_type = self.id_column().type.python_type
+        try:
+            return [python_type(id) for id in dict.fromkeys(ids)]
+        except ValueError:
+            raise ApiError(400, {"code": "invalid_id", "source": {"parameter": "id"}})
+
+    def id_column(self):
+        (column,) = inspect(self.model).primary_key
+        return column
+
+    def filter_list_query(self, query):
+        query = super().filter_list_query(query)
+        ids = self.requested_ids()
+        if ids is not None:
+            query = query.filter(self.id_column().in_(ids))
+        return query
+
+    def paginate_list_query(self, query):
+        # the number of ids already bounds the page
+        if self.requested_ids() is not None:
+            return query.all()
+        return super().paginate_list_query(query)
@@ -0,0 +1,12 @@
+"""The dashboard rollup module."""
+
+from . import (
+    bundle,
+    cache,
+    coalesce,
+    columns,
+    models,
+    queries,
+    refresh,
+    snapshots,
+)
@@ -0,0 +1,125 @@
+"""Every dashboard rollup in one response.
+
+The route is cached like the others, under the data version, which moves
+with any change a part could depend on. So a stale bundle is served while one
+worker recomputes it, and a miss is computed once however many dashboards
+ask for it at the same moment.
+
+Computing it uses the parts' own cache entries when every one of them is
+fresh. Otherwise every part is computed, on a small thread pool. Each thread
+has its own connection, and all of them read through one exported Postgres
+snapshot, so together they see the database as a single transaction would.
+Stale parts are never mixed in, since they may come from an older version of
+the data than the rest.
+"""
+
+import gzip
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app, request
+from sqlalchemy.sql import text
+
+from rdc_website.database import db
+from .cache import (
+    ROLLUP_PREFIX,
+    render,
+    request_key,
+    response_cache,
+    version_name,
+    view_for,
+)
+
+PATH = ROLLUP_PREFIX + "bundle"
+
+POOL_SIZE = 4
+
+PARTS = {
+    "detainer_warrants": "/api/v1/rollup/detainer-warrants",
+    "plaintiffs": "/api/v1/rollup/plaintiffs",
+    "plaintiffs_amount_claimed_bands": "/api/v1/rollup/plaintiffs/amount_claimed_bands",
+    "plaintiff_attorney": "/api/v1/rollup/plaintiff-attorney",
+    "judges": "/api/v1/rollup/judges",
+    "pending": "/api/v1/rollup/detainer-warrants/pending",
+    "amount_awarded": "/api/v1/rollup/amount-awarded",
+    "amount_awarded_history": "/api/v1/rollup/amount-awarded/history",
+    "meta": "/api/v1/rollup/meta",
+}
+
+
+def compute(app, path, snapshot):
+    """Run the uncached view behind path inside the shared snapshot."""
+    with app.test_request_context(path):
+        db.session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        db.session.execute(
+            text("set transaction snapshot :snapshot"), {"snapshot": snapshot}
+        )
+        view = app.view_functions[request.url_rule.endpoint]
+        try:
+            return render(request_key(), view).get_data()
+        finally:
+            db.session.rollback()
+
+
+def cached_parts():
+    """Every part from the cache, or None unless all of them are fresh there."""
+    parts = {}
+    for name, path in PARTS.items():
+        version = version_name(view_for(current_app, path))
+        if version is None:
+            return None
+
+        body, fresh = response_cache.get(f"{path}?", version)
+        if not fresh:
+            return None
+        parts[name] = body
+    return parts
+
+
+def compute_parts(paths):
+    app = current_app._get_current_object()
+    with db.engine.connect().execution_options(
+        isolation_level="REPEATABLE READ"
+    ) as connection:
+        # the exporting transaction has to stay open until every thread has
+        # imported the snapshot
+        snapshot = connection.execute(text("select pg_export_snapshot()")).scalar()
+        with ThreadPoolExecutor(max_workers=POOL_SIZE) as pool:
+            futures = {
+                name: pool.submit(compute, app, path, snapshot)
+                for name, path in paths.items()
+            }
+            return {name: future.result() for name, future in futures.items()}
+
+
+def response():
+    parts = cached_parts()
+    if parts is None:
+        parts = compute_parts(PARTS)
+
+    # parts are already serialized, so splice them rather than re-encode
+    body = (
+        "{"
+        + ",".join(f"{json.dumps(name)}:{parts[name].decode()}" for name in PARTS)
+        + "}"
+    ).encode()
+    return current_app.response_class(body, mimetype="application/json")
+
+
+def compress(response):
+    """Gzip the bundle for clients that take it.
+
+    This is done after the cache, which keeps the plain body.
+    """
+    if request.path != PATH or response.status_code != 200:
+        return response
+
+    response.vary.add("Accept-Encoding")
+    if "gzip" in request.accept_encodings and response.content_encoding is None:
+        response.set_data(gzip.compress(response.get_data()))
+        response.content_encoding = "gzip"
+    return response
+
+
+def init_app(app):
+    app.after_request(compress)
@@ -0,0 +1,398 @@
+"""A response cache for the rollup routes, shared by every worker on the host.
+
+Entries live in a SQLite file under DATA_DIR so that one worker's answer
+serves them all. The file also records two versions: the time of the last
+committed write to the case data, which the conditional request handling uses
+as its watermark, and the time rollup_daily was last refreshed. Entries are
+stored under the version their view depends on: the rollups version for
+views over rollup_daily, and the data version for views reading live tables,
+so that any write makes those stale. An entry stored under an older version,
+before today, or more than ROLLUP_CACHE_TTL seconds ago is stale. Stale
+entries are still served while a background thread computes their
+replacement, so after the first computation no request waits on an
+aggregate query.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+from functools import partial, wraps
+from itertools import chain
+from urllib.parse import urlencode
+
+from flask import current_app, g, request
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .coalesce import single_flight, try_single_flight
+
+DEFAULT_TTL = 60 * 60
+DEFAULT_MAX_ENTRIES = 512
+
+# stale entries older than this are dropped rather than served
+MAX_STALE = 7 * 24 * 60 * 60
+
+# reads only record their access once the last record is this many seconds
+# old, which is as fine as eviction needs and spares most hits a write
+ACCESS_RESOLUTION = 60
+
+ROLLUP_PREFIX = "/api/v1/rollup/"
+
+SCHEMA = """
+    create table if not exists responses (
+        key text primary key,
+        body blob not null,
+        version real not null,
+        stored_at real not null,
+        accessed_at real not null
+    );
+    create table if not exists versions (
+        name text primary key,
+        changed_at real not null
+    );
+"""
+
+
+class ResponseCache:
+    def __init__(self, app=None):
+        self.path = None
+        self.ttl = DEFAULT_TTL
+        self.max_entries = DEFAULT_MAX_ENTRIES
+        self._local = threading.local()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.ttl = app.config.get("ROLLUP_CACHE_TTL", DEFAULT_TTL)
+        self.max_entries = app.config.get(
+            "ROLLUP_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES
+        )
+        self.path = app.config.get(
+            "ROLLUP_CACHE_PATH",
+            (
+                None
+                if app.config["ENV"] == "test"
+                else os.path.join(app.config["DATA_DIR"], "rollup-cache.sqlite3")
+            ),
+        )
+        app.extensions["rollup_cache"] = self
+
+    @property
+    def enabled(self):
+        return self.path is not None and self.ttl > 0
+
+    def _connection(self):
+        # gunicorn forks after the app is loaded, so connections are opened
+        # lazily and never shared across processes or threads
+        owner = (os.getpid(), self.path)
+        if getattr(self._local, "owner", None) != owner:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("pragma journal_mode=wal")
+            connection.executescript(SCHEMA)
+            self._local.connection = connection
+            self._local.owner = owner
+        return self._local.connection
+
+    def get(self, key, depends_on="rollups"):
+        """Return the cached body for key and whether it is still fresh.
+
+        `depends_on` names the version the entry was stored under.
+        """
+        if not self.enabled:
+            return None, False
+
+        now = time.time()
+        try:
+            connection = self._connection()
+            row = connection.execute(
+                """
+                select body, version, stored_at, accessed_at
+                from responses
+                where key = ?
+                """,
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None, False
+            body, version, stored_at, accessed_at = row
+            if accessed_at <= now - ACCESS_RESOLUTION:
+                connection.execute(
+                    "update responses set accessed_at = ? where key = ?", (now, key)
+                )
+            fresh = (
+                version == self._version(connection, depends_on)
+                and stored_at > now - self.ttl
+                and stored_at >= start_of_today()
+            )
+            return body, fresh
+        except sqlite3.Error:
+            logger.exception("Rollup cache read failed for {key}", key=key)
+            return None, False
+
+    def set(self, key, body, version):
+        if not self.enabled:
+            return
+
+        now = time.time()
+        try:
+            connection = self._connection()
+            connection.execute(
+                "insert or replace into responses values (?, ?, ?, ?, ?)",
+                (key, body, version, now, now),
+            )
+            connection.execute(
+                "delete from responses where stored_at <= ?", (now - MAX_STALE,)
+            )
+            connection.execute(
+                """
+                delete from responses
+                where key not in
+                    (select key from responses order by accessed_at desc limit ?)
+                """,
+                (self.max_entries,),
+            )
+        except sqlite3.Error:
+            logger.exception("Rollup cache write failed for {key}", key=key)
+
+    def _bump(self, connection, *names):
+        changed_at = time.time()
+        connection.executemany(
+            "insert or replace into versions values (?, ?)",
+            [(name, changed_at) for name in names],
+        )
+        return changed_at
+
+    def _version(self, connection, name):
+        row = connection.execute(
+            "select changed_at from versions where name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            # nothing recorded yet, so anything stored before now is stale
+            return self._bump(connection, name)
+        return row[0]
+
+    def expire(self):
+        """Mark every rollup stale, keeping them to serve until replaced."""
+        if self.path is None:
+            return
+
+        # rollup responses are validated against the data version too
+        try:
+            self._bump(self._connection(), "data", "rollups")
+        except sqlite3.Error:
+            logger.exception("Rollup cache could not be expired")
+
+    def bump_version(self):
+        if self.path is None:
+            return
+
+        try:
+            self._bump(self._connection(), "data")
+        except sqlite3.Error:
+            logger.exception("Data version could not be bumped")
+
+    def data_version(self):
+        """Time of the last committed write, or None when versions are off."""
+        return self._read_version("data")
+
+    def rollups_version(self):
+        return self._read_version("rollups")
+
+    def version(self, name):
+        return self._read_version(name)
+
+    def _read_version(self, name):
+        if self.path is None:
+            return None
+
+        try:
+            return self._version(self._connection(), name)
+        except sqlite3.Error:
+            logger.exception("{name} version could not be read", name=name)
+            return None
+
+
+response_cache = ResponseCache()
+
+# writes to these leave the data version alone, since no rollup or versioned
+# response reads them, and users are written on every sign in
+ACCOUNT_TABLES = frozenset({"user", "role"})
+
+# keys this process is already recomputing in the background
+revalidating = set()
+revalidating_lock = threading.Lock()
+
+
+def start_of_today():
+    return datetime.combine(date.today(), datetime.min.time()).timestamp()
+
+
+def request_key():
+    args = sorted(request.args.items(multi=True))
+    return f"{request.path}?{urlencode(args)}"
+
+
+def json_response(body):
+    return current_app.response_class(body, mimetype="application/json")
+
+
+def version_name(view):
+    """The version a cached view's entries are stored under, or None if uncached."""
+    name = getattr(view, "depends_on", "rollups")
+    return name() if callable(name) else name
+
+
+def view_for(app, path):
+    endpoint, _ = app.url_map.bind("").match(path)
+    return app.view_functions[endpoint]
+
+
+def render(key, view, *args, **kwargs):
+    """Run the cached view uncached, storing a successful response under key."""
+    name = version_name(view)
+    # read before the view runs, so a write committed meanwhile stales the entry
+    version = response_cache.version(name) if name else None
+    response = current_app.make_response(view.__wrapped__(*args, **kwargs))
+    if name and response.status_code == 200:
+        response_cache.set(key, response.get_data(), version)
+    return response
+
+
+def revalidate(app, key, path, query_string):
+    """Recompute a stale entry unless another thread or worker already is."""
+    with revalidating_lock:
+        if key in revalidating:
+            return
+        revalidating.add(key)
+
+    try:
+        with app.test_request_context(path, query_string=query_string):
+            with try_single_flight(key) as leader:
+                view = app.view_functions[request.url_rule.endpoint]
+                if not leader or response_cache.get(key, version_name(view))[1]:
+                    return
+                render(key, view, **request.view_args)
+    except Exception:
+        logger.exception("Could not revalidate rollup {key}", key=key)
+    finally:
+        with revalidating_lock:
+            revalidating.discard(key)
+
+
+def revalidate_in_background(key, path=None, query_string=b""):
+    if path is None:
+        path, query_string = request.path, request.query_string
+
+    thread = threading.Thread(
+        target=revalidate,
+        args=(current_app._get_current_object(), key, path, query_string),
+    )
+    thread.daemon = True
+    thread.start()
+
+
+def cached(view=None, *, depends_on="rollups"):
+    """Serve a JSON view from the shared cache, storing successful responses.
+
+    Stale entries are served as they are and refreshed in the background. On
+    a miss, concurrent requests for the same key are coalesced so that only
+    one of them runs the view.
+
+    `depends_on` names the version the view's entries are stored under, "data"
+    for views reading live tables. It may be a function, called per request,
+    returning None when the view should not be cached at all.
+    """
+    if view is None:
+        return partial(cached, depends_on=depends_on)
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        name = version_name(wrapper)
+        if name is None:
+            return view(*args, **kwargs)
+
+        key = request_key()
+        body, fresh = response_cache.get(key, name)
+        if body is not None:
+            if not fresh:
+                # validators describe the current data, which this body is not
+                g.pop("conditional", None)
+                revalidate_in_background(key)
+            return json_response(body)
+
+        if not response_cache.enabled:
+            return view(*args, **kwargs)
+
+        with single_flight(key):
+            # whoever held the flight before us has likely filled the cache
+            body, _ = response_cache.get(key, name)
+            if body is not None:
+                return json_response(body)
+
+            return render(key, wrapper, *args, **kwargs)
+
+    wrapper.depends_on = depends_on
+    return wrapper
+
+
+def warm(app):
+    """Compute every cached rollup route that takes no arguments, if not fresh."""
+    if not response_cache.enabled:
+        return
+
+    for rule in app.url_map.iter_rules():
+        view = app.view_functions[rule.endpoint]
+        if (
+            rule.rule.startswith(ROLLUP_PREFIX)
+            and not rule.arguments
+            and hasattr(view, "__wrapped__")
+        ):
+            with app.app_context():
+                if version_name(view) is None:
+                    continue
+            revalidate(app, f"{rule.rule}?", rule.rule, b"")
+
+
+def warm_in_background(app):
+    thread = threading.Thread(target=warm, args=(app,))
+    thread.daemon = True
+    thread.start()
+
+
+def mark_data_changed(session):
+    """Note a write, to move the data version on when it commits.
+
+    Flushed changes are noted by the listener below, so only statements
+    run outside the unit of work, like a bulk UPDATE or an upsert, need to
+    call this. Changes only to ACCOUNT_TABLES are not noted.
+    The rollups version is left to `refresh_daily`, which is when what the
+    rollups read changes.
+    """
+    session.info["data_changed"] = True
+
+
+def is_versioned(model):
+    """Whether writes to model's table move the data version."""
+    return getattr(model, "__tablename__", None) not in ACCOUNT_TABLES
+
+
+@event.listens_for(Session, "after_flush")
+def mark_changes(session, flush_context):
+    changed = chain(session.new, session.dirty, session.deleted)
+    if any(is_versioned(instance) for instance in changed):
+        mark_data_changed(session)
+
+
+@event.listens_for(Session, "after_commit")
+def bump_data_version(session):
+    if session.info.pop("data_changed", False):
+        response_cache.bump_version()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def forget_changes(session, previous_transaction):
+    session.info.pop("data_changed", None)
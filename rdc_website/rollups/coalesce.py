@@ -0,0 +1,134 @@
+"""Single-flight coalescing for rollup computations.
+
+When a rollup is missing from the shared cache, only one caller computes it.
+Callers in the same worker queue on a lock held per cache key, and callers in
+other workers queue on a Postgres advisory lock for the same key. Once the
+leader has filled the cache, each waiter finds the answer there instead of
+running the aggregate itself.
+"""
+
+import hashlib
+import threading
+from contextlib import contextmanager
+
+from loguru import logger
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.sql import text
+
+from rdc_website.database import db
+
+# first half of the two-part advisory lock key, keeping rollup locks apart
+# from other advisory lock users
+LOCK_NAMESPACE = 7_201_220
+
+LOCK_TIMEOUT = "30s"
+
+
+class Flights:
+    """Per-key locks for callers within one process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+
+    @contextmanager
+    def hold(self, key, blocking=True):
+        """Hold the lock for key, yielding whether it was acquired."""
+        with self._lock:
+            lock, callers = self._flights.get(key, (threading.Lock(), 0))
+            self._flights[key] = (lock, callers + 1)
+
+        acquired = lock.acquire(blocking)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                lock.release()
+            with self._lock:
+                lock, callers = self._flights[key]
+                if callers == 1:
+                    del self._flights[key]
+                else:
+                    self._flights[key] = (lock, callers - 1)
+
+
+flights = Flights()
+
+
+def lock_id(key):
+    digest = hashlib.blake2b(key.encode(), digest_size=4).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def release(connection, params):
+    try:
+        connection.execute(text("select pg_advisory_unlock(:namespace, :key)"), params)
+        connection.commit()
+    except Exception:
+        # never return a connection still holding the lock to the pool
+        connection.invalidate()
+        raise
+
+
+@contextmanager
+def advisory_lock(key):
+    """Hold a session-level advisory lock for key on a dedicated connection.
+
+    If the lock cannot be had within LOCK_TIMEOUT the caller goes ahead
+    without it, trading a duplicate computation for a bounded wait.
+    """
+    params = {"namespace": LOCK_NAMESPACE, "key": lock_id(key)}
+    with db.engine.connect() as connection:
+        try:
+            connection.execute(text(f"set local lock_timeout = '{LOCK_TIMEOUT}'"))
+            connection.execute(
+                text("select pg_advisory_lock(:namespace, :key)"), params
+            )
+            # the lock belongs to the session and outlives this transaction
+            connection.commit()
+        except OperationalError:
+            logger.warning("Timed out waiting on the rollup lock for {key}", key=key)
+            connection.rollback()
+            yield
+            return
+
+        try:
+            yield
+        finally:
+            release(connection, params)
+
+
+@contextmanager
+def try_advisory_lock(key):
+    """Take the advisory lock for key only if it is free, yielding whether it was."""
+    params = {"namespace": LOCK_NAMESPACE, "key": lock_id(key)}
+    with db.engine.connect() as connection:
+        acquired = connection.execute(
+            text("select pg_try_advisory_lock(:namespace, :key)"), params
+        ).scalar()
+        connection.commit()
+
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                release(connection, params)
+
+
+@contextmanager
+def single_flight(key):
+    with flights.hold(key):
+        with advisory_lock(key):
+            yield
+
+
+@contextmanager
+def try_single_flight(key):
+    """Lead the flight for key if nobody else is, yielding whether we are."""
+    with flights.hold(key, blocking=False) as local:
+        if not local:
+            yield False
+            return
+
+        with try_advisory_lock(key) as shared:
+            yield shared
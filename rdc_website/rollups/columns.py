@@ -0,0 +1,371 @@
+"""A per-process columnar copy of the warrant fields the dashboard rollups use.
+
+Each worker keeps one array per column, with one slot per detainer warrant,
+plus a row order sorted by file date so that a date window is two bisects.
+Rollups over it never touch Postgres except to look up a handful of names.
+
+The copy is only used when ROLLUP_COLUMNS is set. Each worker loads it at
+warm-up, then tops it up in the background by `updated_at` watermark at most
+every ROLLUP_COLUMNS_REFRESH seconds and reloads it in full once a day, which
+is when deleted warrants drop out. Requests keep reading the current copy
+while that happens.
+"""
+
+import heapq
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+
+from flask import current_app
+from loguru import logger
+from sqlalchemy.sql import text
+
+from rdc_website.database import db
+from rdc_website.time_util import millis
+from .queries import window
+
+DEFAULT_REFRESH = 60
+
+# rows written by transactions that were still open at the last refresh carry
+# an updated_at from before the watermark, so each refresh looks back this far
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+# stands in for null in the integer columns
+MISSING = -(2**62)
+
+# upper bounds of the claimed amount bands, matching rollup_daily
+BAND_EDGES = (500, 1000, 1500, 2000)
+
+WATERMARK = text(
+    """
+    select greatest(
+        (select max(cases.updated_at) from cases),
+        (select max(judgments.updated_at) from judgments)
+    )
+    """
+)
+
+WARRANTS = """
+    select cases.docket_id,
+        cases.file_date,
+        cases.plaintiff_id,
+        cases.plaintiff_attorney_id,
+        cases.amount_claimed,
+        cases.status_id,
+        latest.in_favor_of_id
+    from cases
+    left join lateral
+        (select judgments.in_favor_of_id
+        from judgments
+        where judgments.detainer_warrant_id = cases.docket_id
+        order by judgments.file_date desc nulls last, judgments.id desc
+        limit 1) as latest on true
+    where cases.type = 'detainer_warrant'
+        {since_filter}
+"""
+
+# each half can use its table's updated_at index, where an OR of the two
+# would scan every warrant
+SINCE_FILTER = """
+        and cases.docket_id in
+            (select cases.docket_id
+            from cases
+            where cases.updated_at > :since
+            union
+            select judgments.detainer_warrant_id
+            from judgments
+            where judgments.updated_at > :since)
+"""
+
+
+def or_missing(value):
+    return MISSING if value is None else value
+
+
+def month_key(day):
+    return day.year * 12 + day.month - 1
+
+
+def month_start(key):
+    return date(key // 12, key % 12 + 1, 1)
+
+
+def month_keys(start, end):
+    """Every month touched by the half-open window [start, end)."""
+    return range(month_key(start), month_key(end - timedelta(days=1)) + 1)
+
+
+class WarrantColumns:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._clear()
+
+    def _clear(self):
+        self.rows = {}
+        self.file_day = array("q")
+        self.file_month = array("q")
+        self.plaintiff_id = array("q")
+        self.plaintiff_attorney_id = array("q")
+        self.amount_claimed = array("d")
+        self.status_id = array("q")
+        self.judgment_in_favor_of_id = array("q")
+        self.by_day = array("q")
+        self.sorted_days = array("q")
+        self.watermark = None
+        self.loaded_on = None
+        self.checked_at = 0.0
+
+    def _upsert(self, row):
+        docket_id, file_date, plaintiff_id, attorney_id, amount, status_id, outcome = (
+            row
+        )
+        values = (
+            (self.file_day, file_date.toordinal() if file_date else MISSING),
+            (self.file_month, month_key(file_date) if file_date else MISSING),
+            (self.plaintiff_id, or_missing(plaintiff_id)),
+            (self.plaintiff_attorney_id, or_missing(attorney_id)),
+            (self.amount_claimed, float("nan") if amount is None else float(amount)),
+            (self.status_id, or_missing(status_id)),
+            (self.judgment_in_favor_of_id, or_missing(outcome)),
+        )
+        index = self.rows.get(docket_id)
+        if index is None:
+            self.rows[docket_id] = len(self.rows)
+            for column, value in values:
+                column.append(value)
+        else:
+            for column, value in values:
+                column[index] = value
+
+    def _sort(self):
+        dated = [i for i, day in enumerate(self.file_day) if day != MISSING]
+        dated.sort(key=self.file_day.__getitem__)
+        self.by_day = array("q", dated)
+        self.sorted_days = array("q", (self.file_day[i] for i in dated))
+
+    def load(self, full=False):
+        """Fetch warrants changed since the watermark, or all of them.
+
+        Everything is fetched once a day, and whenever there is no watermark
+        to go from, as when no warrant had been written at the last load.
+        """
+        full = full or self.loaded_on != date.today() or self.watermark is None
+        if full:
+            query, params = WARRANTS.format(since_filter=""), {}
+        else:
+            query = WARRANTS.format(since_filter=SINCE_FILTER)
+            params = {"since": self.watermark - WATERMARK_OVERLAP}
+
+        # a connection of its own, so as not to end the caller's transaction
+        with db.engine.connect() as connection:
+            watermark = connection.execute(WATERMARK).scalar()
+            rows = connection.execute(text(query), params).all()
+
+        with self._lock:
+            if full:
+                self._clear()
+            for row in rows:
+                self._upsert(row)
+            if full or rows:
+                self._sort()
+            self.watermark = watermark
+            self.loaded_on = date.today()
+            self.checked_at = time.monotonic()
+
+    def due(self):
+        interval = current_app.config.get("ROLLUP_COLUMNS_REFRESH", DEFAULT_REFRESH)
+        return (
+            self.watermark is None
+            or self.loaded_on != date.today()
+            or time.monotonic() - self.checked_at >= interval
+        )
+
+    def refresh(self):
+        """Load the copy if it never was, otherwise top it up in the background."""
+        if self.loaded_on is None:
+            with self._refresh_lock:
+                # another thread may have loaded while we waited
+                if self.loaded_on is None:
+                    self.load()
+        elif self.due():
+            self.refresh_in_background(current_app._get_current_object())
+        return self
+
+    def refresh_in_background(self, app):
+        # a load already under way will do
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+
+        def run():
+            try:
+                with app.app_context():
+                    self.load()
+            except Exception:
+                logger.exception("Could not refresh the warrant columns")
+            finally:
+                self._refresh_lock.release()
+
+        thread = threading.Thread(target=run)
+        thread.daemon = True
+        thread.start()
+
+    def between(self, start, end):
+        """Row indexes of warrants filed in the half-open window [start, end)."""
+        low = bisect_left(self.sorted_days, start.toordinal())
+        high = bisect_left(self.sorted_days, end.toordinal())
+        return self.by_day[low:high]
+
+
+columns = WarrantColumns()
+
+
+def enabled():
+    return current_app.config.get("ROLLUP_COLUMNS", False)
+
+
+def cache_version():
+    """Rollups over this copy are left out of the response cache.
+
+    They are quicker to compute than to fetch from it, and a cached answer
+    would outlive the next write.
+    """
+    return None if enabled() else "rollups"
+
+
+def current():
+    return columns.refresh()
+
+
+def warm_in_background(app):
+    """Load the copy ahead of the first request, when it is in use."""
+    with app.app_context():
+        if enabled():
+            columns.refresh_in_background(app)
+
+
+def names(table, ids):
+    if not ids:
+        return {}
+    rows = db.session.execute(
+        text(f"select id, name from {table} where id = any(:ids)"), {"ids": list(ids)}
+    )
+    return dict(rows.all())
+
+
+def band(amount):
+    """Index into the amount bands, low to high, or None when in no band."""
+    # amounts of exactly 500 have never fallen in a band
+    if amount != amount or amount == BAND_EDGES[0]:
+        return None
+    return bisect_left(BAND_EDGES, amount)
+
+
+def warrants_by_month(start, end):
+    store = current()
+    with store._lock:
+        counts = Counter(store.file_month[i] for i in store.between(start, end))
+
+    return [
+        {"time": millis(month_start(key)), "total_warrants": counts[key]}
+        for key in month_keys(start, end)
+    ]
+
+
+def top_plaintiffs_by_month(start, end, limit=10):
+    store = current()
+    with store._lock:
+        monthly = Counter(
+            (store.plaintiff_id[i], store.file_month[i])
+            for i in store.between(start, end)
+            if store.plaintiff_id[i] != MISSING
+        )
+
+    totals = Counter()
+    for (plaintiff_id, _), count in monthly.items():
+        totals[plaintiff_id] += count
+    top = heapq.nsmallest(
+        limit, totals.items(), key=lambda total: (-total[1], total[0])
+    )
+    plaintiff_names = names("plaintiffs", [plaintiff_id for plaintiff_id, _ in top])
+
+    return [
+        {
+            "name": plaintiff_names[plaintiff_id],
+            "history": [
+                {
+                    "date": millis(month_start(key)),
+                    "eviction_count": monthly[(plaintiff_id, key)],
+                }
+                for key in month_keys(start, end)
+            ],
+        }
+        for plaintiff_id, _ in top
+        if plaintiff_id in plaintiff_names
+    ]
+
+
+def plaintiffs_by_amount_claimed(start, end):
+    store = current()
+    totals = Counter()
+    bands = defaultdict(lambda: [0] * (len(BAND_EDGES) + 1))
+    with store._lock:
+        for i in store.between(start, end):
+            plaintiff_id = store.plaintiff_id[i]
+            if plaintiff_id == MISSING:
+                continue
+            totals[plaintiff_id] += 1
+            index = band(store.amount_claimed[i])
+            if index is not None:
+                bands[plaintiff_id][index] += 1
+
+    # ties are ranked by name, so look up everyone tied with the fifth
+    fifth = heapq.nlargest(5, totals.values())
+    plaintiff_names = names(
+        "plaintiffs",
+        (
+            [
+                plaintiff_id
+                for plaintiff_id, total in totals.items()
+                if total >= fifth[-1]
+            ]
+            if fifth
+            else []
+        ),
+    )
+    top_five = sorted(
+        plaintiff_names,
+        key=lambda plaintiff_id: (-totals[plaintiff_id], plaintiff_names[plaintiff_id]),
+    )[:5]
+
+    rows = [
+        (plaintiff_names[plaintiff_id], totals[plaintiff_id], bands[plaintiff_id])
+        for plaintiff_id in top_five
+    ]
+    rest = [plaintiff_id for plaintiff_id in totals if plaintiff_id not in top_five]
+    if rest:
+        rows.append(
+            (
+                "ALL OTHER",
+                sum(totals[plaintiff_id] for plaintiff_id in rest),
+                [sum(counts) for counts in zip(*(bands[i] for i in rest))],
+            )
+        )
+    rows.sort(key=lambda row: -row[1])
+
+    return [
+        {
+            "plaintiff_name": name,
+            "warrant_count": total,
+            "greater_than_2k": counts[4],
+            "between_1.5k_and_2k": counts[3],
+            "between_1k_and_1.5k": counts[2],
+            "between_500_and_1k": counts[1],
+            "less_than_500": counts[0],
+            **window(start, end),
+        }
+        for name, total, counts in rows
+    ]
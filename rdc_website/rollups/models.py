@@ -0,0 +1,37 @@
+from rdc_website.database import db, Column
+from sqlalchemy import func
+
+
+class RollupDaily(db.Model):
+    """Pre-aggregated dashboard facts, one row per day and dimension combination.
+
+    Filing facts are keyed on the warrant's file date and carry no judge or
+    courtroom. Judgment facts are keyed on the hearing's court date, falling
+    back to the judgment's file date when there is no hearing.
+    """
+
+    __tablename__ = "rollup_daily"
+
+    id = Column(db.Integer, primary_key=True)
+    day = Column(db.Date, nullable=False, index=True)
+    plaintiff_id = Column(db.Integer)
+    plaintiff_attorney_id = Column(db.Integer)
+    judge_id = Column(db.Integer)
+    courtroom_id = Column(db.Integer)
+
+    warrants_filed = Column(db.Integer, nullable=False, server_default="0")
+    amount_claimed_high = Column(db.Integer, nullable=False, server_default="0")
+    amount_claimed_medium_high = Column(db.Integer, nullable=False, server_default="0")
+    amount_claimed_medium = Column(db.Integer, nullable=False, server_default="0")
+    amount_claimed_medium_low = Column(db.Integer, nullable=False, server_default="0")
+    amount_claimed_low = Column(db.Integer, nullable=False, server_default="0")
+
+    judgments = Column(db.Integer, nullable=False, server_default="0")
+    possession_judgments = Column(db.Integer, nullable=False, server_default="0")
+    default_judgments = Column(db.Integer, nullable=False, server_default="0")
+    awards_fees = Column(db.Numeric(scale=2), nullable=False, server_default="0")
+
+    refreshed_at = Column(db.DateTime, nullable=False, server_default=func.now())
+
+    def __repr__(self):
+        return f"<RollupDaily(day='{self.day}', plaintiff_id='{self.plaintiff_id}', judge_id='{self.judge_id}')>"
@@ -0,0 +1,425 @@
+"""Dashboard rollups, read from the rollup_daily summary table."""
+
+from datetime import timedelta
+from itertools import groupby
+
+from sqlalchemy import func, desc
+from sqlalchemy.sql import text
+
+from rdc_website.database import db
+from rdc_website.detainer_warrants.models import Attorney, DetainerWarrant, Hearing
+from rdc_website.time_util import millis
+from .models import RollupDaily
+
+PLAINTIFF_REPRESENTING_SELF = -1
+
+
+def round_dec(dec):
+    return int(round(dec))
+
+
+def between_days(start, end, query):
+    return query.filter(RollupDaily.day >= start, RollupDaily.day < end)
+
+
+def warrants_by_month(start, end):
+    rows = db.session.execute(
+        text(
+            """
+    with counts as
+        (select date_trunc('month', r.day)::date as month,
+         sum(r.warrants_filed) as total_warrants
+    from rollup_daily r
+    where r.day >= :start
+        and r.day < :end
+    group by 1)
+    select months.month::date, coalesce(counts.total_warrants, 0)
+    from generate_series(
+        date_trunc('month', cast(:start as timestamp)),
+        cast(:end as timestamp) - interval '1 day',
+        interval '1 month'
+    ) as months(month)
+    left join counts on counts.month = months.month::date
+    order by months.month
+    """
+        ),
+        {"start": start, "end": end},
+    )
+
+    return [
+        {"time": millis(month), "total_warrants": round_dec(total_warrants)}
+        for month, total_warrants in rows
+    ]
+
+
+def top_plaintiffs_by_month(start, end, limit=10):
+    rows = db.session.execute(
+        text(
+            """
+    with monthly as
+        (select r.plaintiff_id,
+         date_trunc('month', r.day)::date as month,
+         sum(r.warrants_filed) as eviction_count
+    from rollup_daily r
+    where r.plaintiff_id is not null
+        and r.warrants_filed > 0
+        and r.day >= :start
+        and r.day < :end
+    group by 1, 2),
+    top as
+        (select monthly.plaintiff_id, sum(monthly.eviction_count) as total
+    from monthly
+    group by monthly.plaintiff_id
+    order by total desc, monthly.plaintiff_id
+    limit :limit)
+    select p.id, p.name, months.month::date, coalesce(monthly.eviction_count, 0)
+    from top
+    inner join plaintiffs p on p.id = top.plaintiff_id
+    cross join generate_series(
+        date_trunc('month', cast(:start as timestamp)),
+        cast(:end as timestamp) - interval '1 day',
+        interval '1 month'
+    ) as months(month)
+    left join monthly
+        on monthly.plaintiff_id = top.plaintiff_id
+        and monthly.month = months.month::date
+    order by top.total desc, p.id, months.month
+    """
+        ),
+        {"start": start, "end": end, "limit": limit},
+    )
+
+    top_evictors = []
+    for _, history in groupby(rows, key=lambda row: row[0]):
+        history = list(history)
+        top_evictors.append(
+            {
+                "name": history[0][1],
+                "history": [
+                    {"date": millis(month), "eviction_count": round_dec(count)}
+                    for _, _, month, count in history
+                ],
+            }
+        )
+
+    return top_evictors
+
+
+def top_five_and_the_rest(totals, sums):
+    """Wrap a per-entity totals query, keeping the top five and summing the rest.
+
+    `totals` must select a name and a `total` to rank by, followed by any
+    other counts to carry along, and `sums` adds those up over `ranked`.
+    """
+    return f"""
+    with totals as ({totals}),
+    ranked as
+        (select totals.*,
+         row_number() over (order by totals.total desc, totals.name) as rank
+    from totals)
+    select case when ranked.rank <= 5 then ranked.name else 'ALL OTHER' end as name,
+        {sums}
+    from ranked
+    group by 1
+    order by 2 desc
+    limit 6
+    """
+
+
+def window(start, end):
+    """Windows are half-open, but end_date is shown as the last day included."""
+    return {"start_date": millis(start), "end_date": millis(end - timedelta(days=1))}
+
+
+def plaintiffs_by_amount_claimed(start, end):
+    query = top_five_and_the_rest(
+        """
+    select p.name,
+        sum(r.warrants_filed) as total,
+        sum(r.amount_claimed_high) as high,
+        sum(r.amount_claimed_medium_high) as medium_high,
+        sum(r.amount_claimed_medium) as medium,
+        sum(r.amount_claimed_medium_low) as medium_low,
+        sum(r.amount_claimed_low) as low
+    from rollup_daily r
+    inner join plaintiffs p on p.id = r.plaintiff_id
+    where r.day >= :start
+        and r.day < :end
+        and r.warrants_filed > 0
+    group by p.id, p.name
+    """,
+        """sum(ranked.total),
+        sum(ranked.high),
+        sum(ranked.medium_high),
+        sum(ranked.medium),
+        sum(ranked.medium_low),
+        sum(ranked.low)""",
+    )
+    top_six = db.session.execute(text(query), {"start": start, "end": end})
+
+    return [
+        {
+            "plaintiff_name": result[0],
+            "warrant_count": round_dec(result[1]),
+            "greater_than_2k": round_dec(result[2]),
+            "between_1.5k_and_2k": round_dec(result[3]),
+            "between_1k_and_1.5k": round_dec(result[4]),
+            "between_500_and_1k": round_dec(result[5]),
+            "less_than_500": round_dec(result[6]),
+            **window(start, end),
+        }
+        for result in top_six
+    ]
+
+
+def plaintiff_attorney_warrant_share(start, end):
+    query = top_five_and_the_rest(
+        """
+    select a.name, sum(r.warrants_filed) as total
+    from rollup_daily r
+    inner join attorneys a on a.id = r.plaintiff_attorney_id
+    where r.day >= :start
+        and r.day < :end
+        and r.warrants_filed > 0
+        and a.id <> :representing_self
+    group by a.id, a.name
+    """,
+        "sum(ranked.total)",
+    )
+    top_six = db.session.execute(
+        text(query),
+        {"start": start, "end": end, "representing_self": PLAINTIFF_REPRESENTING_SELF},
+    )
+
+    top_plaintiffs = [
+        {
+            "warrant_count": round_dec(warrant_count),
+            "plaintiff_attorney_name": attorney_name,
+            **window(start, end),
+        }
+        for attorney_name, warrant_count in top_six
+    ]
+
+    representing_self = between_days(
+        start,
+        end,
+        db.session.query(func.coalesce(func.sum(RollupDaily.warrants_filed), 0)),
+    ).filter(RollupDaily.plaintiff_attorney_id == PLAINTIFF_REPRESENTING_SELF)
+
+    prs = {
+        "warrant_count": round_dec(representing_self.scalar()),
+        "plaintiff_attorney_name": db.session.get(
+            Attorney, PLAINTIFF_REPRESENTING_SELF
+        ).name,
+        **window(start, end),
+    }
+
+    return top_plaintiffs + [prs]
+
+
+def judge_warrant_share(start, end):
+    query = top_five_and_the_rest(
+        """
+    select j.name, sum(r.judgments) as total
+    from rollup_daily r
+    inner join judges j on j.id = r.judge_id
+    where r.day >= :start
+        and r.day < :end
+        and r.judgments > 0
+    group by j.id, j.name
+    """,
+        "sum(ranked.total)",
+    )
+    top_six = db.session.execute(text(query), {"start": start, "end": end})
+
+    return [
+        {
+            "warrant_count": round_dec(warrant_count),
+            "presiding_judge_name": judge_name,
+            **window(start, end),
+        }
+        for judge_name, warrant_count in top_six
+    ]
+
+
+def pending_scheduled_case_count(start, end):
+    # a warrant's status is current state rather than a daily fact, so this
+    # reads the live tables through the hearings court date index
+    count = (
+        db.session.query(DetainerWarrant)
+        .join(Hearing)
+        .filter(
+            Hearing._court_date >= start,
+            Hearing._court_date < end,
+            DetainerWarrant.status_id == DetainerWarrant.statuses["PENDING"],
+        )
+        .count()
+    )
+    return {"pending_scheduled_case_count": count}
+
+
+def amount_awarded_between(start, end):
+    return between_days(
+        start,
+        end,
+        db.session.query(func.coalesce(func.sum(RollupDaily.awards_fees), 0)),
+    ).scalar()
+
+
+def amount_awarded(start, end):
+    return {"data": round_dec(amount_awarded_between(start, end))}
+
+
+def amount_awarded_history(start, end):
+    rows = db.session.execute(
+        text(
+            """
+    with awards as
+        (select date_trunc('month', r.day)::date as month,
+         sum(r.awards_fees) as total_amount
+    from rollup_daily r
+    where r.day >= :start
+        and r.day < :end
+    group by 1)
+    select months.month::date, coalesce(awards.total_amount, 0)
+    from generate_series(
+        date_trunc('month', cast(:start as timestamp)),
+        cast(:end as timestamp) - interval '1 day',
+        interval '1 month'
+    ) as months(month)
+    left join awards on awards.month = months.month::date
+    order by months.month
+    """
+        ),
+        {"start": start, "end": end},
+    )
+
+    return {
+        "data": [
+            {"time": millis(month), "total_amount": round_dec(total_amount)}
+            for month, total_amount in rows
+        ]
+    }
+
+
+TIMESERIES_METRICS = {
+    "filings": "warrants_filed",
+    "judgments": "judgments",
+    "awards": "awards_fees",
+}
+
+GRANULARITIES = ("day", "week", "month")
+
+
+def bucket_start(day, granularity):
+    """The first day of the bucket holding day, as date_trunc would have it."""
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def timeseries(metric, granularity, start, end, plaintiff_id=None):
+    column = TIMESERIES_METRICS[metric]
+    rows = db.session.execute(
+        text(
+            f"""
+    with totals as
+        (select date_trunc(:granularity, r.day)::date as bucket,
+         sum(r.{column}) as total
+    from rollup_daily r
+    where r.day >= :start
+        and r.day < :end
+        and (cast(:plaintiff_id as integer) is null
+            or r.plaintiff_id = :plaintiff_id)
+    group by 1)
+    select buckets.bucket::date, coalesce(totals.total, 0)
+    from generate_series(
+        date_trunc(:granularity, cast(:start as timestamp)),
+        cast(:end as timestamp) - interval '1 day',
+        cast('1 ' || :granularity as interval)
+    ) as buckets(bucket)
+    left join totals on totals.bucket = buckets.bucket::date
+    order by buckets.bucket
+    """
+        ),
+        {
+            "granularity": granularity,
+            "start": start,
+            "end": end,
+            "plaintiff_id": plaintiff_id,
+        },
+    )
+
+    value = float if metric == "awards" else round_dec
+    return {
+        "metric": metric,
+        "granularity": granularity,
+        **window(start, end),
+        "data": [
+            {"time": millis(bucket), "value": value(total)} for bucket, total in rows
+        ],
+    }
+
+
+def monthly_rollups(start, end):
+    rows = db.session.execute(
+        text(
+            """
+    with totals as
+        (select date_trunc('month', r.day)::date as month,
+         sum(r.warrants_filed) as warrants_filed,
+         sum(r.possession_judgments) as eviction_judgments,
+         sum(r.awards_fees) as awards,
+         sum(r.default_judgments) as default_evictions
+    from rollup_daily r
+    where r.day >= :start
+        and r.day < :end
+    group by 1)
+    select months.month::date,
+        coalesce(totals.warrants_filed, 0),
+        coalesce(totals.eviction_judgments, 0),
+        coalesce(totals.awards, 0),
+        coalesce(totals.default_evictions, 0)
+    from generate_series(
+        date_trunc('month', cast(:start as timestamp)),
+        cast(:end as timestamp) - interval '1 day',
+        interval '1 month'
+    ) as months(month)
+    left join totals on totals.month = months.month::date
+    order by months.month
+    """
+        ),
+        {"start": start, "end": end},
+    )
+
+    return [
+        {
+            "month": millis(month),
+            "detainer_warrants_filed": round_dec(warrants_filed),
+            "eviction_judgments": round_dec(eviction_judgments),
+            "plaintiff_awards": float(awards),
+            "evictions_entered_by_default": float(default_evictions),
+        }
+        for month, warrants_filed, eviction_judgments, awards, default_evictions in rows
+    ]
+
+
+def monthly_rollup(start, end):
+    totals = monthly_rollups(start, end)[0]
+    del totals["month"]
+    return totals
+
+
+def data_meta():
+    last_warrant = (
+        db.session.query(DetainerWarrant)
+        .order_by(desc(DetainerWarrant._updated_at))
+        .first()
+    )
+    return {
+        "last_detainer_warrant_update": (
+            last_warrant.updated_at if last_warrant else None
+        )
+    }
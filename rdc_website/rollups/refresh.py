@@ -0,0 +1,164 @@
+"""Incremental maintenance of the rollup_daily summary table."""
+
+from datetime import timedelta
+
+from sqlalchemy import func
+from sqlalchemy.sql import text
+from loguru import logger
+
+from rdc_website.database import db
+from .cache import response_cache
+from .models import RollupDaily
+
+# arbitrary key shared by every process that rebuilds rollup_daily
+REFRESH_LOCK_KEY = 7_201_220_001
+
+# rows written by transactions that were still open at the last refresh carry
+# an updated_at from before it, so each refresh looks back this far
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+INSERT_FACTS = """
+    insert into rollup_daily (
+        day,
+        plaintiff_id,
+        plaintiff_attorney_id,
+        judge_id,
+        courtroom_id,
+        warrants_filed,
+        amount_claimed_high,
+        amount_claimed_medium_high,
+        amount_claimed_medium,
+        amount_claimed_medium_low,
+        amount_claimed_low,
+        judgments,
+        possession_judgments,
+        default_judgments,
+        awards_fees
+    )
+    select cases.file_date,
+        cases.plaintiff_id,
+        cases.plaintiff_attorney_id,
+        null,
+        null,
+        count(cases.docket_id),
+        count(*) filter (where cases.amount_claimed > 2000),
+        count(*) filter (where cases.amount_claimed > 1500 and cases.amount_claimed <= 2000),
+        count(*) filter (where cases.amount_claimed > 1000 and cases.amount_claimed <= 1500),
+        count(*) filter (where cases.amount_claimed > 500 and cases.amount_claimed <= 1000),
+        count(*) filter (where cases.amount_claimed < 500),
+        0,
+        0,
+        0,
+        0
+    from cases
+    where cases.type = 'detainer_warrant'
+        and cases.file_date is not null
+        {cases_filter}
+    group by 1, 2, 3
+    union all
+    select judgment_facts.day,
+        judgment_facts.plaintiff_id,
+        judgment_facts.plaintiff_attorney_id,
+        judgment_facts.judge_id,
+        judgment_facts.courtroom_id,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        count(*),
+        count(*) filter (where judgment_facts.awards_possession),
+        count(*) filter (where judgment_facts.entered_by_id = 0),
+        coalesce(sum(judgment_facts.awards_fees), 0)
+    from
+        (select coalesce(hearings.court_date::date, judgments.file_date) as day,
+            judgments.plaintiff_id,
+            judgments.plaintiff_attorney_id,
+            judgments.judge_id,
+            hearings.courtroom_id,
+            judgments.awards_possession,
+            judgments.entered_by_id,
+            judgments.awards_fees
+        from judgments
+        left join hearings on hearings.id = judgments.hearing_id) as judgment_facts
+    where judgment_facts.day is not null
+        {judgments_filter}
+    group by 1, 2, 3, 4, 5
+"""
+
+CHANGED_DAYS = text(
+    """
+    select distinct changed.day
+    from
+        (select cases.file_date as day
+        from cases
+        where cases.type = 'detainer_warrant'
+            and cases.updated_at >= :since
+        union all
+        select coalesce(hearings.court_date::date, judgments.file_date)
+        from judgments
+        left join hearings on hearings.id = judgments.hearing_id
+        where judgments.updated_at >= :since
+            or hearings.updated_at >= :since) as changed
+    where changed.day is not null
+    """
+)
+
+
+def last_refreshed_at():
+    return db.session.query(func.max(RollupDaily.refreshed_at)).scalar()
+
+
+def changed_days(since):
+    return [row[0] for row in db.session.execute(CHANGED_DAYS, {"since": since})]
+
+
+def rebuild():
+    db.session.execute(text("delete from rollup_daily"))
+    db.session.execute(text(INSERT_FACTS.format(cases_filter="", judgments_filter="")))
+
+
+def refresh_days(days):
+    db.session.execute(RollupDaily.__table__.delete().where(RollupDaily.day.in_(days)))
+    db.session.execute(
+        text(
+            INSERT_FACTS.format(
+                cases_filter="and cases.file_date = any(:days)",
+                judgments_filter="and judgment_facts.day = any(:days)",
+            )
+        ),
+        {"days": days},
+    )
+
+
+def refresh_daily(full=False):
+    """Bring rollup_daily up to date.
+
+    Only days with cases, hearings or judgments updated since the last refresh
+    are rebuilt, unless `full` is set or the table is empty. A warrant whose
+    file date moved, a hearing that was continued to another day or a deleted
+    record is only picked up by a full rebuild, which the scheduler runs
+    nightly.
+    """
+    db.session.execute(
+        text("select pg_advisory_xact_lock(:key)"), {"key": REFRESH_LOCK_KEY}
+    )
+
+    last_refresh = None if full else last_refreshed_at()
+    if last_refresh is None:
+        logger.info("Rebuilding all rollups")
+        rebuild()
+    else:
+        since = last_refresh - REFRESH_OVERLAP
+        days = changed_days(since)
+        logger.info(
+            "Refreshing rollups for {count} days changed since {since}",
+            count=len(days),
+            since=since,
+        )
+        if days:
+            refresh_days(days)
+
+    db.session.commit()
+    response_cache.expire()
@@ -0,0 +1,107 @@
+"""Rollup payloads written to disk for nginx to serve without the app.
+
+Each run writes every argument-free rollup route, the bundle among them, into
+a new versioned directory as plain and gzipped JSON. It then points the `current`
+symlink and `manifest.json` at it. Versioned files never change, so they can
+be cached forever. Only `current` and the manifest need revalidating.
+"""
+
+import gzip
+import json
+import os
+import shutil
+from datetime import datetime
+
+from loguru import logger
+
+from rdc_website.time_util import file_friendly_timestamp
+from .cache import ROLLUP_PREFIX, render, request_key
+
+KEEP_VERSIONS = 3
+
+
+def snapshot_dir(app):
+    return os.path.join(app.config["DATA_DIR"], "rollups")
+
+
+def file_name(path):
+    return path[len(ROLLUP_PREFIX) :].replace("/", "-") + ".json"
+
+
+def render_payload(app, path, view):
+    with app.test_request_context(path):
+        response = view()
+
+    if response.status_code != 200:
+        logger.error(
+            "Skipping the {path} snapshot, got {status}",
+            path=path,
+            status=response.status_code,
+        )
+        return None
+
+    return response.get_data()
+
+
+def payloads(app):
+    """Render every argument-free rollup route, bypassing any stale cache."""
+    for rule in app.url_map.iter_rules():
+        view = app.view_functions[rule.endpoint]
+        if (
+            rule.rule.startswith(ROLLUP_PREFIX)
+            and not rule.arguments
+            and hasattr(view, "__wrapped__")
+        ):
+            # routes are registered with the bundle after its parts, which
+            # are fresh in the cache by the time it is rendered
+            body = render_payload(app, rule.rule, lambda: render(request_key(), view))
+            if body is not None:
+                yield file_name(rule.rule), body
+
+
+def write_atomically(path, data):
+    partial = f"{path}.partial"
+    with open(partial, "wb") as f:
+        f.write(data)
+    os.replace(partial, path)
+
+
+def prune(root, keep):
+    versions = sorted(
+        entry.name for entry in os.scandir(root) if entry.is_dir(follow_symlinks=False)
+    )
+    for version in versions[:-keep]:
+        shutil.rmtree(os.path.join(root, version))
+
+
+def write(app):
+    root = snapshot_dir(app)
+    version = file_friendly_timestamp(datetime.now())
+    version_dir = os.path.join(root, version)
+    os.makedirs(version_dir, exist_ok=True)
+
+    files = []
+    for name, body in payloads(app):
+        with open(os.path.join(version_dir, name), "wb") as f:
+            f.write(body)
+        with open(os.path.join(version_dir, name + ".gz"), "wb") as f:
+            f.write(gzip.compress(body))
+        files.append(name)
+
+    current = os.path.join(root, "current")
+    link = f"{current}.partial"
+    if os.path.lexists(link):
+        os.remove(link)
+    os.symlink(version, link)
+    os.replace(link, current)
+
+    manifest = {"version": version, "files": sorted(files)}
+    write_atomically(os.path.join(root, "manifest.json"), json.dumps(manifest).encode())
+
+    prune(root, KEEP_VERSIONS)
+    logger.info(
+        "Wrote {count} rollup snapshots to {version_dir}",
+        count=len(files),
+        version_dir=version_dir,
+    )
+    return version
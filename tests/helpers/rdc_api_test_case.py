@@ -0,0 +1,50 @@
+import uuid
+
+from rdc_website.admin.models import user_datastore
+from rdc_website.database import db
+from .rdc_test_case import RDCTestCase
+
+
+class RDCApiTestCase(RDCTestCase):
+    """Requests to the API, made by a signed in user with the given role."""
+
+    role = "Organizer"
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user(self.role)
+        self.sign_in(self.user)
+
+    def create_user(self, role):
+        user = user_datastore.create_user(
+            email=f"{uuid.uuid4().hex}@example.com",
+            first_name="Test",
+            last_name="User",
+            password="password",
+            fs_uniquifier=uuid.uuid4().hex,
+            roles=[user_datastore.find_or_create_role(role)],
+        )
+        db.session.commit()
+        return user
+
+    def sign_in(self, user):
+        with self.client.session_transaction() as session:
+            session["_user_id"] = user.fs_uniquifier
+            session["_fresh"] = True
+
+    @property
+    def headers(self):
+        return {"Authorization": f"Bearer {self.user.id}"}
+
+    def get(self, url, **kwargs):
+        return self.client.get(
+            url, headers={**self.headers, **kwargs.pop("headers", {})}, **kwargs
+        )
+
+    def patch(self, url, data, **kwargs):
+        return self.client.patch(
+            url,
+            json={"data": data},
+            headers={**self.headers, **kwargs.pop("headers", {})},
+            **kwargs,
+        )
@@ -0,0 +1,76 @@
+from datetime import date
+from dateutil.relativedelta import relativedelta
+
+from rdc_website.detainer_warrants.models import (
+    Attorney,
+    DetainerWarrant,
+    Judge,
+    Judgment,
+    Plaintiff,
+)
+from rdc_website.rollups.queries import PLAINTIFF_REPRESENTING_SELF
+from rdc_website.rollups.refresh import refresh_daily
+from .rdc_test_case import RDCTestCase
+
+
+class RDCRollupTestCase(RDCTestCase):
+    """A few warrants and judgments over this month and last, rolled up.
+
+    AVANA files two warrants last month and one this month, all through
+    SMITH, and BELL files one this month for itself. JUDY rules on one
+    warrant each month.
+    """
+
+    def setUp(self):
+        super().setUp()
+        # rollups are read from rollup_daily unless a test says otherwise
+        self.app.config["ROLLUP_COLUMNS"] = False
+
+        self.this_month = date.today().replace(day=1)
+        self.last_month = self.this_month - relativedelta(months=1)
+
+        Attorney.create(
+            id=PLAINTIFF_REPRESENTING_SELF, name="PLAINTIFF REPRESENTING SELF"
+        )
+        self.smith = Attorney.create(name="SMITH")
+        self.avana = Plaintiff.create(name="AVANA")
+        self.bell = Plaintiff.create(name="BELL")
+        self.judy = Judge.create(name="JUDY")
+
+        first = self.warrant("23GT1", self.last_month, self.avana, 750, self.smith)
+        self.warrant("23GT2", self.last_month, self.avana, 1750, self.smith)
+        second = self.warrant("23GT3", self.this_month, self.avana, 2500, self.smith)
+        self.warrant("23GT4", self.this_month, self.bell, 250)
+
+        self.judgment(first, self.last_month, awards_fees=300)
+        self.judgment(
+            second, self.this_month, awards_fees=1200, possession=True, default=True
+        )
+
+        refresh_daily(full=True)
+
+    def warrant(self, docket_id, file_date, plaintiff, amount_claimed, attorney=None):
+        return DetainerWarrant.create(
+            docket_id=docket_id,
+            _file_date=file_date,
+            plaintiff_id=plaintiff.id,
+            plaintiff_attorney_id=(
+                attorney.id if attorney else PLAINTIFF_REPRESENTING_SELF
+            ),
+            amount_claimed=amount_claimed,
+            status="PENDING",
+        )
+
+    def judgment(
+        self, warrant, file_date, awards_fees=0, possession=False, default=False
+    ):
+        return Judgment.create(
+            detainer_warrant_id=warrant.docket_id,
+            _file_date=file_date,
+            judge_id=self.judy.id,
+            plaintiff_id=warrant.plaintiff_id,
+            plaintiff_attorney_id=warrant.plaintiff_attorney_id,
+            awards_fees=awards_fees,
+            awards_possession=possession,
+            entered_by="DEFAULT" if default else "TRIAL_IN_COURT",
+        )
@@ -1,4 +1,9 @@
+import os
+import shutil
+import tempfile
+
 from rdc_website.database import db
+from rdc_website.rollups.cache import response_cache
 from flask_testing import TestCase
 from .setup import create_test_app
 
@@ -16,3 +21,14 @@ class RDCTestCase(TestCase):
     def tearDown(self):
         db.session.remove()
         db.drop_all()
+
+    def use_response_cache(self):
+        """Keep the rollup cache and data versions, which are off under test."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.addCleanup(response_cache.init_app, self.app)
+        self.addCleanup(self.app.config.pop, "ROLLUP_CACHE_PATH")
+        self.app.config["ROLLUP_CACHE_PATH"] = os.path.join(
+            directory, "rollup-cache.sqlite3"
+        )
+        response_cache.init_app(self.app)
@@ -0,0 +1,61 @@
+import pytest
+
+from rdc_website.database import db
+from rdc_website.detainer_warrants.models import DetainerWarrant
+from tests.helpers.rdc_api_test_case import RDCApiTestCase
+
+URL = "/api/v1/detainer-warrants/"
+
+
+@pytest.mark.integration
+class TestBulkUpdate(RDCApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        DetainerWarrant.create(docket_id="23GT1", address="1 First St")
+        DetainerWarrant.create(docket_id="23GT2", address="2 Second St")
+
+    def test_updates_each_warrant(self):
+        response = self.patch(
+            URL,
+            [
+                {"docket_id": "23GT1", "audit_status": "CONFIRMED"},
+                {"docket_id": "23GT2", "address": "22 Second St", "notes": "Moved"},
+                {"docket_id": "23GT3", "notes": "Missing"},
+                {"docket_id": "23GT1", "notes": "Again"},
+                {"docket_id": "23GT2", "status": "NOPE"},
+            ],
+        )
+
+        self.assert200(response)
+        self.assertEqual(
+            [item["status"] for item in response.json["data"]],
+            ["updated", "updated", "not_found", "invalid", "invalid"],
+        )
+
+        db.session.expire_all()
+        first = db.session.get(DetainerWarrant, "23GT1")
+        second = db.session.get(DetainerWarrant, "23GT2")
+        self.assertEqual(first.audit_status, "CONFIRMED")
+        self.assertEqual(first.address, "1 First St")
+        self.assertEqual(second.address, "22 Second St")
+        self.assertEqual(second.notes, "Moved")
+        self.assertEqual(first.last_edited_by_id, self.user.id)
+
+    def test_too_many_items(self):
+        response = self.patch(URL, [{"docket_id": "23GT1"}] * 501)
+
+        self.assert400(response)
+        self.assertEqual(response.json["errors"][0]["code"], "too_many_items")
+
+    def test_changes_etag(self):
+        self.use_response_cache()
+        before = self.get(f"{URL}23GT1")
+        etag = before.headers["ETag"]
+
+        self.patch(URL, [{"docket_id": "23GT1", "notes": "Called"}])
+        after = self.get(f"{URL}23GT1", headers={"If-None-Match": etag})
+
+        self.assert200(after)
+        self.assertNotEqual(after.headers["ETag"], etag)
+        self.assertEqual(after.json["data"]["notes"], "Called")
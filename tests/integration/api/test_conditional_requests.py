@@ -0,0 +1,95 @@
+import pytest
+
+from rdc_website.database import db
+from rdc_website.detainer_warrants.models import DetainerWarrant
+from tests.helpers.rdc_api_test_case import RDCApiTestCase
+
+URL = "/api/v1/detainer-warrants/"
+
+
+@pytest.mark.integration
+class TestConditionalRequests(RDCApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.use_response_cache()
+        DetainerWarrant.create(docket_id="23GT1")
+
+    def test_not_modified(self):
+        response = self.get(URL)
+        self.assert200(response)
+        self.assertIn("private", response.headers["Cache-Control"])
+
+        response = self.get(URL, headers={"If-None-Match": response.headers["ETag"]})
+
+        self.assertStatus(response, 304)
+
+    def test_modified_since(self):
+        response = self.get(URL)
+
+        response = self.get(
+            URL, headers={"If-Modified-Since": response.headers["Last-Modified"]}
+        )
+
+        self.assertStatus(response, 304)
+
+    def test_modified_after_a_write(self):
+        etag = self.get(URL).headers["ETag"]
+        DetainerWarrant.create(docket_id="23GT2")
+
+        response = self.get(URL, headers={"If-None-Match": etag})
+
+        self.assert200(response)
+        self.assertEqual(len(response.json["data"]), 2)
+
+    def test_tags_differ_per_user(self):
+        etag = self.get(URL).headers["ETag"]
+        self.user = self.create_user("Partner")
+        self.sign_in(self.user)
+
+        response = self.get(URL, headers={"If-None-Match": etag})
+
+        self.assert200(response)
+
+    def test_unauthenticated_with_a_stale_tag(self):
+        etag = self.get(URL).headers["ETag"]
+
+        response = self.client.get(URL, headers={"If-None-Match": etag})
+
+        self.assert401(response)
+
+    def test_other_credentials_with_a_stale_tag(self):
+        etag = self.get(URL).headers["ETag"]
+        other = self.create_user("Organizer")
+
+        response = self.get(
+            URL,
+            headers={"If-None-Match": etag, "Authorization": f"Bearer {other.id}"},
+        )
+
+        self.assert200(response)
+
+    def test_forbidden_with_a_stale_tag(self):
+        etag = self.get(URL).headers["ETag"]
+        self.user.roles = []
+        db.session.commit()
+
+        response = self.get(URL, headers={"If-None-Match": etag})
+
+        self.assert403(response)
+
+    def test_rollups(self):
+        response = self.client.get("/api/v1/rollup/meta")
+        self.assert200(response)
+
+        response = self.client.get(
+            "/api/v1/rollup/meta", headers={"If-None-Match": response.headers["ETag"]}
+        )
+
+        self.assertStatus(response, 304)
+
+    def test_account_resources_left_unversioned(self):
+        response = self.get("/api/v1/users/")
+
+        self.assert200(response)
+        self.assertNotIn("ETag", response.headers)
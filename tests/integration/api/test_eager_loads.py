@@ -0,0 +1,128 @@
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Load
+
+from rdc_website.database import db, raise_on_lazy_load
+from rdc_website.detainer_warrants.models import (
+    Attorney,
+    Courtroom,
+    Defendant,
+    DetainerWarrant,
+    Hearing,
+    Judge,
+    Judgment,
+    PhoneNumberVerification,
+    PleadingDocument,
+    Plaintiff,
+)
+from rdc_website.detainer_warrants.serializers import detainer_warrant_schema
+from tests.helpers.rdc_api_test_case import RDCApiTestCase
+from datetime import date, datetime
+
+URLS = (
+    "/api/v1/detainer-warrants/",
+    "/api/v1/judgments/",
+    "/api/v1/defendants/",
+    "/api/v1/hearings/",
+)
+
+
+@pytest.mark.integration
+class TestEagerLoads(RDCApiTestCase):
+    """Nested list endpoints, where a lazy load raises under test."""
+
+    def add_cases(self, count):
+        start = DetainerWarrant.query.count()
+        for number in range(start + 1, start + count + 1):
+            self.add_case(number)
+
+    def add_case(self, number):
+        plaintiff = Plaintiff.create(name=f"PLAINTIFF {number}")
+        plaintiff_attorney = Attorney.create(name=f"PLAINTIFF ATTORNEY {number}")
+        defendant_attorney = Attorney.create(name=f"DEFENDANT ATTORNEY {number}")
+        judge = Judge.create(name=f"JUDGE {number}")
+        courtroom = Courtroom.create(name=f"{number}A")
+
+        warrant = DetainerWarrant.create(
+            docket_id=f"23GT{number}",
+            _file_date=date(2023, 1, number),
+            plaintiff_id=plaintiff.id,
+            plaintiff_attorney_id=plaintiff_attorney.id,
+            last_edited_by_id=self.user.id,
+        )
+        document = PleadingDocument.create(
+            image_path=f"https://example.com/23GT{number}.png",
+            docket_id=warrant.docket_id,
+            text="DETAINER WARRANT",
+        )
+        warrant.update(document_image_path=document.image_path)
+
+        hearing = Hearing.create(
+            docket_id=warrant.docket_id,
+            _court_date=datetime(2023, 2, number, 9),
+            courtroom_id=courtroom.id,
+            plaintiff_id=plaintiff.id,
+            plaintiff_attorney_id=plaintiff_attorney.id,
+            defendant_attorney_id=defendant_attorney.id,
+        )
+        Judgment.create(
+            detainer_warrant_id=warrant.docket_id,
+            hearing_id=hearing.id,
+            _file_date=date(2023, 2, number),
+            judge_id=judge.id,
+            plaintiff_id=plaintiff.id,
+            plaintiff_attorney_id=plaintiff_attorney.id,
+            defendant_attorney_id=defendant_attorney.id,
+            document_image_path=document.image_path,
+        )
+
+        phone = PhoneNumberVerification.create(phone_number=f"+1615555010{number}")
+        Defendant.create(
+            first_name="DEFENDANT", last_name=str(number), verified_phone_id=phone.id
+        )
+
+    def list(self, url):
+        response = self.get(url, query_string={"with_total": "false"})
+
+        self.assert200(response)
+        return response
+
+    def test_query_count_independent_of_rows(self):
+        self.add_cases(1)
+        few = {url: self.list(url).headers["X-Query-Count"] for url in URLS}
+
+        self.add_cases(4)
+
+        for url in URLS:
+            with self.subTest(url=url):
+                response = self.list(url)
+                self.assertEqual(len(response.json["data"]), 5)
+                self.assertEqual(response.headers["X-Query-Count"], few[url])
+
+    def test_nested_rows_dumped(self):
+        self.add_cases(2)
+
+        warrants = self.list(URLS[0]).json["data"]
+
+        warrant = next(item for item in warrants if item["docket_id"] == "23GT1")
+
+        self.assertEqual(warrant["plaintiff"]["name"], "PLAINTIFF 1")
+        self.assertEqual(warrant["hearings"][0]["courtroom"]["name"], "1A")
+        self.assertEqual(warrant["last_edited_by"]["id"], self.user.id)
+        self.assertEqual(warrant["document"]["text"], "DETAINER WARRANT")
+
+    def load_warrant(self, options):
+        # a fresh session, so that nothing nested is already in the identity map
+        db.session.expunge_all()
+        return DetainerWarrant.query.options(*options).one()
+
+    def test_missing_eager_load_raises(self):
+        self.add_cases(1)
+        load = Load(DetainerWarrant)
+
+        warrant = self.load_warrant(detainer_warrant_schema.get_query_options(load))
+        self.assertEqual(warrant.plaintiff.name, "PLAINTIFF 1")
+
+        warrant = self.load_warrant(raise_on_lazy_load(load))
+        with self.assertRaises(InvalidRequestError):
+            warrant.plaintiff
@@ -0,0 +1,114 @@
+import os
+import time
+import pytest
+from unittest import mock
+
+from rdc_website.detainer_warrants.models import (
+    Attorney,
+    DetainerWarrant,
+    Judge,
+    Plaintiff,
+    PleadingDocument,
+)
+from rdc_website.fast_lists import FastLists
+from tests.helpers.rdc_api_test_case import RDCApiTestCase
+from datetime import date
+
+LISTS = (
+    ("/api/v1/plaintiffs/", {}),
+    ("/api/v1/attorneys/", {}),
+    ("/api/v1/judges/", {}),
+    ("/api/v1/pleading-documents/", {}),
+    (
+        "/api/v1/detainer-warrants/",
+        {
+            "fields": "docket_id,address,file_date,status,amount_claimed,"
+            "claims_possession,notes,audit_status,created_at,updated_at"
+        },
+    ),
+)
+
+
+@pytest.mark.integration
+class TestFastLists(RDCApiTestCase):
+    """The fast path against the schema, on a host pinned to UTC.
+
+    The fast path is off in any other zone, so without pinning it these would
+    compare the schema path with itself on most machines.
+    """
+
+    def setUp(self):
+        self.use_timezone("UTC")
+        super().setUp()
+        self.app.config["FAST_LISTS"] = True
+        self.addCleanup(self.app.config.pop, "FAST_LISTS")
+
+        for number in range(1, 4):
+            Plaintiff.create(name=f"PLAINTIFF {number}", aliases=[f"P{number}"])
+            Attorney.create(name=f"ATTORNEY {number}", aliases=[])
+            Judge.create(name=f"JUDGE {number}", aliases=[f"J{number}", "JUDGE"])
+            DetainerWarrant.create(
+                docket_id=f"23GT{number}",
+                address=f"{number} Main St",
+                _file_date=date(2023, 1, number),
+                status="PENDING",
+                amount_claimed=1000 * number + 0.5,
+                claims_possession=number % 2 == 0,
+                notes=None if number == 1 else f"Called {number} times",
+            )
+            PleadingDocument.create(
+                image_path=f"https://example.com/23GT{number}.png",
+                docket_id=f"23GT{number}",
+                text="DETAINER WARRANT",
+            )
+
+    def use_timezone(self, zone):
+        previous = os.environ.get("TZ")
+        os.environ["TZ"] = zone
+        time.tzset()
+
+        def restore():
+            if previous is None:
+                os.environ.pop("TZ", None)
+            else:
+                os.environ["TZ"] = previous
+            time.tzset()
+
+        self.addCleanup(restore)
+
+    def bodies(self, url, **args):
+        with mock.patch.object(
+            FastLists, "fast_dump", autospec=True, side_effect=FastLists.fast_dump
+        ) as fast_dump:
+            fast = self.get(url, query_string=args)
+        self.assertTrue(fast_dump.called, "the fast path was not taken")
+
+        self.app.config["FAST_LISTS"] = False
+        try:
+            schema = self.get(url, query_string=args)
+        finally:
+            self.app.config["FAST_LISTS"] = True
+
+        self.assert200(fast)
+        self.assert200(schema)
+        return fast.get_data(), schema.get_data()
+
+    def test_same_bodies(self):
+        for url, args in LISTS:
+            with self.subTest(url=url):
+                fast, schema = self.bodies(url, **args)
+                self.assertEqual(fast, schema)
+
+    def test_same_pages(self):
+        for url, args in LISTS:
+            with self.subTest(url=url):
+                fast, schema = self.bodies(url, limit=2, **args)
+                self.assertEqual(fast, schema)
+
+    def test_off_utc_uses_the_schema(self):
+        self.use_timezone("America/Chicago")
+
+        with mock.patch.object(FastLists, "fast_dump") as fast_dump:
+            self.assert200(self.get("/api/v1/plaintiffs/"))
+
+        fast_dump.assert_not_called()
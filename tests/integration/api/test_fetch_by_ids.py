@@ -0,0 +1,100 @@
+import pytest
+
+from rdc_website.detainer_warrants.models import (
+    Defendant,
+    DetainerWarrant,
+    Plaintiff,
+    PleadingDocument,
+)
+from tests.helpers.rdc_api_test_case import RDCApiTestCase
+
+
+@pytest.mark.integration
+class TestFetchByIds(RDCApiTestCase):
+
+    def fetch(self, url, ids, **args):
+        return self.get(url, query_string={"id": ",".join(ids), **args})
+
+    def assert_error(self, response, code):
+        self.assert400(response)
+        self.assertEqual(response.json["errors"][0]["code"], code)
+
+    def test_only_requested_rows(self):
+        plaintiffs = [Plaintiff.create(name=f"PLAINTIFF {n}") for n in range(4)]
+        ids = [str(plaintiffs[0].id), str(plaintiffs[2].id)]
+
+        response = self.fetch("/api/v1/plaintiffs/", ids)
+
+        self.assert200(response)
+        self.assertEqual(
+            sorted(plaintiff["id"] for plaintiff in response.json["data"]),
+            [plaintiffs[0].id, plaintiffs[2].id],
+        )
+
+    def test_duplicates_returned_once(self):
+        for number in range(1, 4):
+            DetainerWarrant.create(docket_id=f"23GT{number}")
+
+        response = self.fetch(
+            "/api/v1/detainer-warrants/", ["23GT1", "23GT3", "23GT1", " 23GT3 "]
+        )
+
+        self.assert200(response)
+        self.assertEqual(
+            sorted(warrant["docket_id"] for warrant in response.json["data"]),
+            ["23GT1", "23GT3"],
+        )
+
+    def test_unknown_ids_ignored(self):
+        DetainerWarrant.create(docket_id="23GT1")
+
+        response = self.fetch("/api/v1/detainer-warrants/", ["23GT1", "23GT404"])
+
+        self.assert200(response)
+        self.assertEqual(
+            [warrant["docket_id"] for warrant in response.json["data"]], ["23GT1"]
+        )
+
+    def test_combined_with_filters(self):
+        for number in range(1, 3):
+            DetainerWarrant.create(docket_id=f"23GT{number}")
+            PleadingDocument.create(
+                image_path=f"https://example.com/23GT{number}.png",
+                docket_id=f"23GT{number}",
+                text="DETAINER WARRANT",
+            )
+
+        response = self.fetch(
+            "/api/v1/pleading-documents/",
+            ["https://example.com/23GT1.png", "https://example.com/23GT2.png"],
+            docket_id="23GT2",
+        )
+
+        self.assert200(response)
+        self.assertEqual(
+            [document["image_path"] for document in response.json["data"]],
+            ["https://example.com/23GT2.png"],
+        )
+
+    def test_scoped_by_filter_query(self):
+        defendant = Defendant.create(first_name="JANE", last_name="DOE")
+        self.user = self.create_user("Partner")
+        self.sign_in(self.user)
+
+        response = self.fetch("/api/v1/defendants/", [str(defendant.id)])
+
+        self.assert403(response)
+        self.assertEqual(response.json["errors"][0]["code"], "insufficient_permissions")
+
+    def test_too_many_ids(self):
+        ids = [f"23GT{number}" for number in range(101)]
+
+        self.assert200(self.fetch("/api/v1/detainer-warrants/", ids[:100]))
+        self.assert_error(self.fetch("/api/v1/detainer-warrants/", ids), "too_many_ids")
+
+    def test_invalid_id(self):
+        plaintiff = Plaintiff.create(name="PLAINTIFF")
+
+        response = self.fetch("/api/v1/plaintiffs/", [str(plaintiff.id), "23GT1"])
+
+        self.assert_error(response, "invalid_id")
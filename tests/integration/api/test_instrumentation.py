@@ -0,0 +1,122 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import textwrap
+import pytest
+from loguru import logger
+from prometheus_client import CollectorRegistry, generate_latest
+from prometheus_client.multiprocess import MultiProcessCollector
+from unittest import mock
+
+from rdc_website import instrumentation
+from rdc_website.detainer_warrants.models import DetainerWarrant
+from tests.helpers.rdc_api_test_case import RDCApiTestCase
+
+URL = "/api/v1/detainer-warrants/"
+
+# what a gunicorn worker does with the histograms, in a process of its own
+WORKER = textwrap.dedent(
+    """
+    from rdc_website.instrumentation import REQUEST_DB_TIME, REQUEST_QUERIES
+
+    REQUEST_QUERIES.labels("warrants").observe(3)
+    REQUEST_DB_TIME.labels("warrants").observe(0.25)
+    """
+)
+
+
+@pytest.mark.integration
+class TestInstrumentation(RDCApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        DetainerWarrant.create(docket_id="23GT1", address="1 First St")
+
+    def capture_warnings(self):
+        messages = []
+        handler = logger.add(messages.append, level="WARNING", format="{message}")
+        self.addCleanup(logger.remove, handler)
+        return messages
+
+    def test_headers(self):
+        response = self.get(URL)
+
+        self.assert200(response)
+        self.assertGreater(int(response.headers["X-Query-Count"]), 0)
+        timing = response.headers["Server-Timing"]
+        self.assertRegex(
+            timing, r'^db;dur=[\d.]+;desc="\d+ queries", total;dur=[\d.]+$'
+        )
+
+    def test_not_modified_is_timed(self):
+        self.use_response_cache()
+        etag = self.get(f"{URL}23GT1").headers["ETag"]
+
+        response = self.get(f"{URL}23GT1", headers={"If-None-Match": etag})
+
+        self.assertStatus(response, 304)
+        self.assertIn("X-Query-Count", response.headers)
+        self.assertIn("total;dur=", response.headers["Server-Timing"])
+
+    def test_slow_queries_logged_without_values(self):
+        self.app.config["SLOW_QUERY_SECONDS"] = 0
+        messages = self.capture_warnings()
+
+        self.get(f"{URL}?address=First")
+
+        logged = [message for message in messages if "Slow query" in message]
+        self.assertTrue(logged)
+        self.assertTrue(all("First" not in message for message in logged))
+        self.assertTrue(any("str[" in message for message in logged))
+
+    def test_slow_queries_sampled(self):
+        self.app.config["SLOW_QUERY_SECONDS"] = 0
+        self.app.config["SLOW_QUERY_SAMPLE_RATE"] = 0
+        messages = self.capture_warnings()
+
+        self.get(URL)
+
+        self.assertFalse([message for message in messages if "Slow query" in message])
+
+    def test_slow_queries_sampled_per_request(self):
+        self.app.config["SLOW_QUERY_SECONDS"] = 0
+        self.app.config["SLOW_QUERY_SAMPLE_RATE"] = 0.5
+
+        for draw, logs in ((0.1, True), (0.9, False)):
+            with self.subTest(draw=draw):
+                messages = self.capture_warnings()
+                with mock.patch.object(
+                    instrumentation.random, "random", return_value=draw
+                ) as random:
+                    response = self.get(URL)
+
+                logged = [message for message in messages if "Slow query" in message]
+                self.assertGreater(int(response.headers["X-Query-Count"]), 1)
+                self.assertEqual(random.call_count, 1)
+                self.assertEqual(bool(logged), logs)
+
+    def test_histograms_exported_from_workers(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+
+        subprocess.run(
+            [sys.executable, "-c", WORKER],
+            env={**os.environ, "PROMETHEUS_MULTIPROC_DIR": directory},
+            check=True,
+        )
+
+        # read back as the GunicornPrometheusMetrics registry does
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry, path=directory)
+        exported = generate_latest(registry).decode()
+
+        self.assertIn(
+            'flask_http_request_db_statements_count{endpoint="warrants"} 1.0',
+            exported,
+        )
+        self.assertIn(
+            'flask_http_request_db_duration_seconds_sum{endpoint="warrants"} 0.25',
+            exported,
+        )
@@ -0,0 +1,61 @@
+import pytest
+
+from rdc_website.detainer_warrants.models import DetainerWarrant, Hearing
+from tests.helpers.rdc_api_test_case import RDCApiTestCase
+from datetime import datetime
+
+
+@pytest.mark.integration
+class TestSparseFieldsets(RDCApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        DetainerWarrant.create(
+            docket_id="23GT100", address="123 Main St", notes="Called twice"
+        )
+        Hearing.create(docket_id="23GT100", _court_date=datetime(2023, 2, 1, 9))
+
+    def test_column_declared_on_case(self):
+        response = self.get("/api/v1/detainer-warrants/?fields=docket_id")
+
+        self.assert200(response)
+        self.assertEqual(response.json["data"], [{"docket_id": "23GT100"}])
+
+    def test_column_declared_on_detainer_warrant(self):
+        response = self.get("/api/v1/detainer-warrants/?fields=address&expand=hearings")
+
+        self.assert200(response)
+        (warrant,) = response.json["data"]
+        self.assertEqual(set(warrant), {"address", "hearings"})
+        self.assertEqual(warrant["address"], "123 Main St")
+
+    def test_columns_from_both_with_expand(self):
+        response = self.get(
+            "/api/v1/detainer-warrants/?fields=docket_id,notes&expand=hearings"
+        )
+
+        self.assert200(response)
+        (warrant,) = response.json["data"]
+        self.assertEqual(set(warrant), {"docket_id", "notes", "hearings"})
+        self.assertEqual(warrant["notes"], "Called twice")
+        self.assertEqual(len(warrant["hearings"]), 1)
+
+    def test_retrieve(self):
+        response = self.get("/api/v1/detainer-warrants/23GT100?fields=address")
+
+        self.assert200(response)
+        self.assertEqual(response.json["data"], {"address": "123 Main St"})
+
+    def test_unknown_field(self):
+        response = self.get("/api/v1/detainer-warrants/?fields=nope")
+
+        self.assert400(response)
+        self.assertEqual(response.json["errors"][0]["code"], "invalid_fields")
+
+    def test_unknown_expand_without_fields(self):
+        response = self.get("/api/v1/detainer-warrants/?expand=bogus")
+
+        self.assert400(response)
+        (error,) = response.json["errors"]
+        self.assertEqual(error["code"], "invalid_fields")
+        self.assertEqual(error["source"], {"parameter": "expand"})
@@ -0,0 +1,55 @@
+import pytest
+from unittest import mock
+
+from rdc_website.detainer_warrants.models import DetainerWarrant
+from rdc_website.permissions.api import total_matches
+from tests.helpers.rdc_api_test_case import RDCApiTestCase
+
+URL = "/api/v1/detainer-warrants/?fields=docket_id"
+
+
+@pytest.mark.integration
+class TestTotalMatches(RDCApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        total_matches.clear()
+        for number in range(1, 4):
+            DetainerWarrant.create(docket_id=f"23GT{number}")
+
+    def test_counted(self):
+        response = self.get(f"{URL}&limit=2")
+
+        self.assert200(response)
+        self.assertEqual(response.json["meta"]["total_matches"], 3)
+        self.assertTrue(response.json["meta"]["total_matches_exact"])
+
+    def test_left_out(self):
+        response = self.get(f"{URL}&with_total=false")
+
+        self.assertNotIn("total_matches", response.json["meta"])
+
+    def test_kept_while_paging(self):
+        self.get(URL)
+        DetainerWarrant.create(docket_id="23GT4")
+
+        response = self.get(URL)
+
+        self.assertEqual(response.json["meta"]["total_matches"], 3)
+
+    def test_recounted_once_expired(self):
+        self.get(URL)
+        self.app.config["TOTAL_MATCHES_TTL"] = 0
+        DetainerWarrant.create(docket_id="23GT4")
+
+        response = self.get(URL)
+
+        self.assertEqual(response.json["meta"]["total_matches"], 4)
+
+    def test_estimated_when_counting_is_slow(self):
+        with mock.patch("rdc_website.permissions.api.count_rows", return_value=None):
+            response = self.get(URL)
+
+        self.assert200(response)
+        self.assertFalse(response.json["meta"]["total_matches_exact"])
+        self.assertIsInstance(response.json["meta"]["total_matches"], int)
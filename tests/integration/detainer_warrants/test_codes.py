@@ -0,0 +1,54 @@
+import pytest
+
+from rdc_website.database import db
+from rdc_website.detainer_warrants.models import DetainerWarrant
+from tests.helpers.rdc_api_test_case import RDCApiTestCase
+
+
+@pytest.mark.integration
+class TestCodes(RDCApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        DetainerWarrant.create(docket_id="23GT1", status="PENDING")
+        DetainerWarrant.create(
+            docket_id="23GT2", status="CLOSED", recurring_court_date="MONDAY"
+        )
+
+    def test_names_are_stored_as_codes(self):
+        warrant = db.session.get(DetainerWarrant, "23GT2")
+
+        self.assertEqual(warrant.status_id, DetainerWarrant.statuses["CLOSED"])
+        self.assertEqual(warrant.court_date_recurring_id, 1)
+        self.assertEqual(warrant.recurring_court_date, "MONDAY")
+        self.assertIsNone(warrant.audit_status)
+
+    def test_filter_by_name(self):
+        pending = db.session.query(DetainerWarrant).filter(
+            DetainerWarrant.status == "PENDING"
+        )
+
+        self.assertEqual([warrant.docket_id for warrant in pending], ["23GT1"])
+
+    def test_select_name(self):
+        statuses = db.session.query(
+            DetainerWarrant._docket_id, DetainerWarrant.status
+        ).order_by(DetainerWarrant._docket_id)
+
+        self.assertEqual(statuses.all(), [("23GT1", "PENDING"), ("23GT2", "CLOSED")])
+
+    def test_unknown_name_is_rejected(self):
+        response = self.patch(
+            "/api/v1/detainer-warrants/23GT1",
+            {"docket_id": "23GT1", "audit_status": "MAYBE"},
+        )
+
+        self.assertStatus(response, 422)
+        db.session.expire_all()
+        self.assertIsNone(db.session.get(DetainerWarrant, "23GT1").audit_status_id)
+
+    def test_names_are_dumped(self):
+        response = self.get("/api/v1/detainer-warrants/23GT2?fields=status")
+
+        self.assert200(response)
+        self.assertEqual(response.json["data"], {"status": "CLOSED"})
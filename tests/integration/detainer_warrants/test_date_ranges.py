@@ -0,0 +1,40 @@
+import pytest
+
+from rdc_website.database import db
+from rdc_website.detainer_warrants.models import DetainerWarrant, Hearing
+from rdc_website.rollups.queries import pending_scheduled_case_count
+from tests.helpers.rdc_test_case import RDCTestCase
+from datetime import date, datetime
+
+
+@pytest.mark.integration
+class TestDateRanges(RDCTestCase):
+
+    def setUp(self):
+        super().setUp()
+        for docket_id, file_date in (
+            ("23GT1", date(2023, 1, 31)),
+            ("23GT2", date(2023, 2, 1)),
+            ("23GT3", date(2023, 2, 28)),
+            ("23GT4", date(2023, 3, 1)),
+        ):
+            DetainerWarrant.create(
+                docket_id=docket_id, _file_date=file_date, status="PENDING"
+            )
+
+    def test_between_dates_includes_the_end(self):
+        query = DetainerWarrant.between_dates(
+            date(2023, 2, 1), date(2023, 2, 28), db.session.query(DetainerWarrant)
+        )
+
+        self.assertEqual(
+            sorted(warrant.docket_id for warrant in query), ["23GT2", "23GT3"]
+        )
+
+    def test_hearings_through_the_last_evening(self):
+        Hearing.create(docket_id="23GT1", _court_date=datetime(2023, 2, 28, 14))
+        Hearing.create(docket_id="23GT2", _court_date=datetime(2023, 3, 1, 9))
+
+        count = pending_scheduled_case_count(date(2023, 2, 1), date(2023, 3, 1))
+
+        self.assertEqual(count, {"pending_scheduled_case_count": 1})
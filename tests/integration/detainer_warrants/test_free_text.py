@@ -0,0 +1,57 @@
+import pytest
+
+from rdc_website.detainer_warrants.models import (
+    Attorney,
+    Defendant,
+    DetainerWarrant,
+    Plaintiff,
+)
+from tests.helpers.rdc_api_test_case import RDCApiTestCase
+
+
+@pytest.mark.integration
+class TestFreeText(RDCApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        avana = Plaintiff.create(name="AVANA APARTMENTS")
+        bell = Plaintiff.create(name="BELL PROPERTIES")
+        smith = Attorney.create(name="SMITH")
+        jones = Attorney.create(name="JONES LAW")
+        jane = Defendant.create(first_name="JANE", middle_name="Q", last_name="DOE")
+        john = Defendant.create(first_name="JOHN", last_name="AVERY")
+
+        DetainerWarrant.create(
+            docket_id="23GT1", plaintiff_id=avana.id, plaintiff_attorney_id=smith.id
+        )
+        DetainerWarrant.create(
+            docket_id="23GT2",
+            plaintiff_id=bell.id,
+            plaintiff_attorney_id=jones.id,
+            _defendants=[jane],
+        )
+        DetainerWarrant.create(docket_id="23GT3", _defendants=[john])
+
+    def search(self, term):
+        response = self.get(
+            "/api/v1/detainer-warrants/", query_string={"free_text": term}
+        )
+
+        self.assert200(response)
+        return sorted(warrant["docket_id"] for warrant in response.json["data"])
+
+    def test_plaintiff_name(self):
+        self.assertEqual(self.search("avana apart"), ["23GT1"])
+
+    def test_attorney_name(self):
+        self.assertEqual(self.search("Jones"), ["23GT2"])
+
+    def test_defendant_full_name(self):
+        # spans the name parts, so only the generated column can match it
+        self.assertEqual(self.search("jane q doe"), ["23GT2"])
+
+    def test_any_field(self):
+        self.assertEqual(self.search("AV"), ["23GT1", "23GT3"])
+
+    def test_no_match(self):
+        self.assertEqual(self.search("ZELDA"), [])
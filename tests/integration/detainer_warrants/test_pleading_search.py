@@ -0,0 +1,87 @@
+import pytest
+
+from rdc_website.database import db
+from rdc_website.detainer_warrants.models import PleadingDocument
+from tests.helpers.rdc_api_test_case import RDCApiTestCase
+
+URL = "/api/v1/pleading-documents/"
+NOTICE = "An eviction notice was served, and possession is sought."
+
+
+@pytest.mark.integration
+class TestPleadingSearch(RDCApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.add_documents(
+            {
+                "claim": "The landlord seeks possession of the premises and rent. "
+                "Possession is claimed as of the first. Possession is contested.",
+                "notice": NOTICE,
+                "rent": "The tenant owes unpaid rent.",
+            }
+        )
+
+    def add_documents(self, texts):
+        db.session.add_all(
+            [
+                PleadingDocument(
+                    image_path=f"https://example.com/{name}.png", text=text
+                )
+                for name, text in texts.items()
+            ]
+        )
+        db.session.commit()
+
+    def search(self, q, **args):
+        response = self.get(URL, query_string={"q": q, **args})
+
+        self.assert200(response)
+        return response.json
+
+    def names(self, results):
+        return [
+            item["image_path"].removeprefix("https://example.com/").removesuffix(".png")
+            for item in results["data"]
+        ]
+
+    def test_ordered_by_rank(self):
+        results = self.search("possession")
+
+        self.assertEqual(self.names(results), ["claim", "notice"])
+        ranks = [item["rank"] for item in results["data"]]
+        self.assertGreater(ranks[0], ranks[1])
+
+    def test_headline(self):
+        (item,) = self.search("eviction")["data"]
+
+        self.assertEqual(item["image_path"], "https://example.com/notice.png")
+        self.assertEqual(item["text"], NOTICE)
+        self.assertIn("<b>eviction</b>", item["headline"])
+
+    def test_websearch_syntax(self):
+        for q, expected in (
+            ('"eviction notice"', ["notice"]),
+            ('"notice eviction"', []),
+            ("possession -rent", ["notice"]),
+            ("eviction or tenant", ["notice", "rent"]),
+        ):
+            with self.subTest(q=q):
+                self.assertEqual(sorted(self.names(self.search(q))), expected)
+
+    def test_malformed_query_tolerated(self):
+        self.assertEqual(self.names(self.search('possession -"')), ["claim", "notice"])
+
+    def test_limits(self):
+        self.add_documents({f"bulk{n:03}": "Possession" for n in range(100)})
+
+        first = self.search("possession")
+        capped = self.search("possession", limit=500)
+        last = self.search("possession", limit=100, offset=100)
+
+        self.assertEqual(len(first["data"]), 50)
+        self.assertTrue(first["meta"]["has_next_page"])
+        self.assertEqual(len(capped["data"]), 100)
+        self.assertTrue(capped["meta"]["has_next_page"])
+        self.assertEqual(len(last["data"]), 2)
+        self.assertFalse(last["meta"]["has_next_page"])
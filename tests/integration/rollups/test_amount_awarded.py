@@ -0,0 +1,29 @@
+import pytest
+
+from rdc_website.time_util import millis
+from tests.helpers.rdc_rollup_test_case import RDCRollupTestCase
+from datetime import date
+
+
+@pytest.mark.integration
+class TestAmountAwarded(RDCRollupTestCase):
+
+    def test_history(self):
+        response = self.client.get("/api/v1/rollup/amount-awarded/history")
+
+        self.assert200(response)
+        months = response.json["data"]
+        self.assertEqual(months[0]["time"], millis(date(2021, 3, 1)))
+        self.assertEqual(
+            months[-2:],
+            [
+                {"time": millis(self.last_month), "total_amount": 300},
+                {"time": millis(self.this_month), "total_amount": 1200},
+            ],
+        )
+        self.assertTrue(all(month["total_amount"] == 0 for month in months[:-2]))
+
+    def test_this_month(self):
+        response = self.client.get("/api/v1/rollup/amount-awarded")
+
+        self.assertEqual(response.json, {"data": 1200})
@@ -0,0 +1,75 @@
+import gzip
+import pytest
+from unittest import mock
+
+from rdc_website.rollups import bundle, cache
+from rdc_website.rollups.cache import response_cache
+from tests.helpers.rdc_rollup_test_case import RDCRollupTestCase
+
+URL = "/api/v1/rollup/bundle"
+
+
+@pytest.mark.integration
+class TestBundle(RDCRollupTestCase):
+
+    def test_parts_match_the_endpoints(self):
+        response = self.client.get(URL)
+
+        self.assert200(response)
+        self.assertEqual(list(response.json), list(bundle.PARTS))
+        for name, path in bundle.PARTS.items():
+            with self.subTest(path=path):
+                self.assertEqual(response.json[name], self.client.get(path).json)
+
+    def test_gzip(self):
+        plain = self.client.get(URL)
+
+        response = self.client.get(URL, headers={"Accept-Encoding": "gzip"})
+
+        self.assertIsNone(plain.content_encoding)
+        self.assertEqual(response.content_encoding, "gzip")
+        self.assertIn("Accept-Encoding", response.vary)
+        self.assertEqual(gzip.decompress(response.get_data()), plain.get_data())
+
+    def test_cached_parts_used_only_when_all_fresh(self):
+        self.use_response_cache()
+        self.assertIsNone(bundle.cached_parts())
+
+        self.client.get(URL)
+        self.assertEqual(list(bundle.cached_parts()), list(bundle.PARTS))
+
+        response_cache.expire()
+        self.assertIsNone(bundle.cached_parts())
+
+    def test_served_from_its_own_entry(self):
+        self.use_response_cache()
+        body = self.client.get(URL).get_data()
+
+        with mock.patch.object(bundle, "response") as response:
+            cached = self.client.get(URL)
+
+        response.assert_not_called()
+        self.assertEqual(cached.get_data(), body)
+        self.assertEqual(response_cache.get(f"{URL}?", "data"), (body, True))
+
+    def test_stale_served_while_revalidating(self):
+        self.use_response_cache()
+        body = self.client.get(URL).get_data()
+        response_cache.bump_version()
+
+        with mock.patch.object(cache, "revalidate_in_background") as revalidate:
+            stale = self.client.get(URL)
+
+        self.assertEqual(stale.get_data(), body)
+        revalidate.assert_called_once_with(f"{URL}?")
+
+    def test_cached_plain_and_sent_gzipped(self):
+        self.use_response_cache()
+        compressed = self.client.get(URL, headers={"Accept-Encoding": "gzip"})
+
+        response = self.client.get(URL, headers={"Accept-Encoding": "gzip"})
+
+        body, _ = response_cache.get(f"{URL}?", "data")
+        self.assertEqual(gzip.decompress(compressed.get_data()), body)
+        self.assertEqual(response.content_encoding, "gzip")
+        self.assertEqual(gzip.decompress(response.get_data()), body)
@@ -0,0 +1,124 @@
+import pytest
+
+from rdc_website.admin.models import Role
+from rdc_website.database import db
+from rdc_website.detainer_warrants.imports import link_defendant
+from rdc_website.detainer_warrants.models import (
+    Defendant,
+    DetainerWarrant,
+    Plaintiff,
+)
+from rdc_website.rollups.cache import ResponseCache, response_cache
+from tests.helpers.rdc_test_case import RDCTestCase
+
+
+@pytest.mark.integration
+class TestResponseCache(RDCTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.use_response_cache()
+        # a cache of its own on the same file, for the tests of the class
+        self.cache = ResponseCache(self.app)
+
+    def accessed_at(self, key):
+        return (
+            self.cache._connection()
+            .execute("select accessed_at from responses where key = ?", (key,))
+            .fetchone()[0]
+        )
+
+    def test_fresh_until_expired(self):
+        self.cache.set("key", b"body", self.cache.rollups_version())
+        self.assertEqual(self.cache.get("key"), (b"body", True))
+
+        self.cache.expire()
+
+        self.assertEqual(self.cache.get("key"), (b"body", False))
+
+    def test_fresh_after_data_changes(self):
+        self.cache.set("key", b"body", self.cache.rollups_version())
+        data_version = self.cache.data_version()
+
+        self.cache.bump_version()
+
+        self.assertGreater(self.cache.data_version(), data_version)
+        self.assertEqual(self.cache.get("key"), (b"body", True))
+
+    def test_live_entries_stale_after_data_changes(self):
+        self.cache.set("key", b"body", self.cache.data_version())
+        self.assertEqual(self.cache.get("key", "data"), (b"body", True))
+
+        self.cache.bump_version()
+
+        self.assertEqual(self.cache.get("key", "data"), (b"body", False))
+
+    def test_live_routes_stale_after_a_write(self):
+        body = self.client.get("/api/v1/rollup/meta").get_data()
+
+        DetainerWarrant.create(docket_id="23GT1")
+
+        self.assertEqual(
+            response_cache.get("/api/v1/rollup/meta?", "data"), (body, False)
+        )
+
+    def test_columns_rollups_left_uncached(self):
+        self.app.config["ROLLUP_COLUMNS"] = True
+        self.addCleanup(self.app.config.pop, "ROLLUP_COLUMNS")
+
+        self.assert200(self.client.get("/api/v1/rollup/detainer-warrants"))
+
+        self.assertEqual(
+            response_cache.get("/api/v1/rollup/detainer-warrants?"), (None, False)
+        )
+
+    def test_access_recorded_occasionally(self):
+        self.cache.set("key", b"body", self.cache.rollups_version())
+        stored = self.accessed_at("key")
+
+        self.cache.get("key")
+
+        self.assertEqual(self.accessed_at("key"), stored)
+
+    def test_commits_bump_data_version(self):
+        data_version = response_cache.data_version()
+        rollups_version = response_cache.rollups_version()
+
+        DetainerWarrant.create(docket_id="23GT1")
+
+        self.assertGreater(response_cache.data_version(), data_version)
+        self.assertEqual(response_cache.rollups_version(), rollups_version)
+
+    def test_rollbacks_leave_data_version(self):
+        data_version = response_cache.data_version()
+
+        db.session.add(DetainerWarrant(docket_id="23GT1"))
+        db.session.flush()
+        db.session.rollback()
+
+        self.assertEqual(response_cache.data_version(), data_version)
+
+    def test_account_writes_leave_data_version(self):
+        data_version = response_cache.data_version()
+
+        Role.create(name="Visitor")
+
+        self.assertEqual(response_cache.data_version(), data_version)
+
+    def test_mixed_commits_bump_data_version(self):
+        data_version = response_cache.data_version()
+
+        db.session.add_all([Role(name="Visitor"), Plaintiff(name="AVANA")])
+        db.session.commit()
+
+        self.assertGreater(response_cache.data_version(), data_version)
+
+    def test_core_writes_bump_data_version(self):
+        DetainerWarrant.create(docket_id="23GT1")
+        defendant = Defendant.create(first_name="JANE", last_name="DOE")
+        data_version = response_cache.data_version()
+
+        link_defendant("23GT1", defendant)
+        db.session.commit()
+
+        self.assertGreater(response_cache.data_version(), data_version)
@@ -0,0 +1,77 @@
+import threading
+import time
+import pytest
+
+from rdc_website.rollups.coalesce import flights, single_flight, try_single_flight
+from tests.helpers.rdc_test_case import RDCTestCase
+
+
+@pytest.mark.integration
+class TestSingleFlight(RDCTestCase):
+
+    def in_thread(self, target):
+        """Start target in an app context and return a join that re-raises its
+        exceptions, so failures in the thread fail the test."""
+        app = self.app
+        errors = []
+
+        def run():
+            try:
+                with app.app_context():
+                    target()
+            except BaseException as error:
+                errors.append(error)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+
+        def join():
+            thread.join(timeout=10)
+            self.assertFalse(thread.is_alive())
+            if errors:
+                raise errors[0]
+
+        return join
+
+    def test_followers_wait_for_the_leader(self):
+        order = []
+        leading = threading.Event()
+
+        def follow():
+            leading.wait()
+            with single_flight("key"):
+                order.append("follower")
+
+        join = self.in_thread(follow)
+        with single_flight("key"):
+            leading.set()
+            time.sleep(0.2)
+            order.append("leader")
+        join()
+
+        self.assertEqual(order, ["leader", "follower"])
+
+    def test_only_one_leader(self):
+        led = []
+
+        def try_to_lead():
+            with try_single_flight("key") as leader:
+                led.append(leader)
+
+        with single_flight("key"):
+            self.in_thread(try_to_lead)()
+
+        self.assertEqual(led, [False])
+
+    def test_other_keys_are_free(self):
+        led = []
+
+        def try_to_lead():
+            with try_single_flight("other") as leader:
+                led.append(leader)
+
+        with single_flight("key"):
+            self.in_thread(try_to_lead)()
+
+        self.assertEqual(led, [True])
+        self.assertEqual(flights._flights, {})
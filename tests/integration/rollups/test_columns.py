@@ -0,0 +1,92 @@
+import pytest
+from dateutil.relativedelta import relativedelta
+
+from rdc_website.detainer_warrants.models import DetainerWarrant
+from rdc_website.rollups import columns, queries
+from rdc_website.rollups.columns import MISSING, WarrantColumns
+from tests.helpers.rdc_rollup_test_case import RDCRollupTestCase
+from tests.helpers.rdc_test_case import RDCTestCase
+from datetime import date
+
+
+@pytest.mark.integration
+class TestWarrantColumns(RDCTestCase):
+
+    def test_load_empty_database(self):
+        store = WarrantColumns()
+        store.load()
+        self.assertIsNone(store.watermark)
+
+        store.load()
+        self.assertEqual(store.rows, {})
+
+    def test_load_after_empty_database(self):
+        store = WarrantColumns()
+        store.load()
+        DetainerWarrant.create(docket_id="23GT1", _file_date=date(2023, 1, 3))
+
+        store.load()
+
+        self.assertEqual(list(store.rows), ["23GT1"])
+        self.assertIsNotNone(store.watermark)
+
+    def test_load_changes_since_watermark(self):
+        first = DetainerWarrant.create(
+            docket_id="23GT1", _file_date=date(2023, 1, 3), amount_claimed=750
+        )
+        store = WarrantColumns()
+        store.load()
+
+        first.update(amount_claimed=1250)
+        DetainerWarrant.create(docket_id="23GT2")
+        store.load()
+
+        self.assertEqual(store.amount_claimed[store.rows["23GT1"]], 1250.0)
+        self.assertEqual(store.file_day[store.rows["23GT2"]], MISSING)
+        self.assertEqual(
+            list(store.between(date(2023, 1, 1), date(2023, 2, 1))),
+            [store.rows["23GT1"]],
+        )
+
+    def test_load_status_and_latest_judgment(self):
+        DetainerWarrant.create(docket_id="23GT1", status="PENDING")
+        store = WarrantColumns()
+        store.load()
+
+        index = store.rows["23GT1"]
+        self.assertEqual(store.status_id[index], DetainerWarrant.statuses["PENDING"])
+        self.assertEqual(store.judgment_in_favor_of_id[index], MISSING)
+
+
+@pytest.mark.integration
+class TestColumnsMatchQueries(RDCRollupTestCase):
+
+    def setUp(self):
+        super().setUp()
+        columns.columns.load(full=True)
+
+    def windows(self):
+        next_month = self.this_month + relativedelta(months=1)
+        return [
+            (self.last_month, next_month),
+            (self.this_month, next_month),
+            (self.last_month - relativedelta(years=1), self.this_month),
+        ]
+
+    def assertSameRollup(self, name, **kwargs):
+        for start, end in self.windows():
+            with self.subTest(start=start, end=end):
+                self.assertEqual(
+                    getattr(columns, name)(start, end, **kwargs),
+                    getattr(queries, name)(start, end, **kwargs),
+                )
+
+    def test_warrants_by_month(self):
+        self.assertSameRollup("warrants_by_month")
+
+    def test_top_plaintiffs_by_month(self):
+        self.assertSameRollup("top_plaintiffs_by_month")
+        self.assertSameRollup("top_plaintiffs_by_month", limit=1)
+
+    def test_plaintiffs_by_amount_claimed(self):
+        self.assertSameRollup("plaintiffs_by_amount_claimed")
@@ -0,0 +1,112 @@
+import pytest
+
+from rdc_website.app import MAX_ROLLUP_MONTHS
+from rdc_website.time_util import millis
+from tests.helpers.rdc_rollup_test_case import RDCRollupTestCase
+from datetime import date, timedelta
+from dateutil.relativedelta import relativedelta
+
+ATTORNEYS = "/api/v1/rollup/plaintiff-attorney"
+JUDGES = "/api/v1/rollup/judges"
+
+
+@pytest.mark.integration
+class TestDateWindows(RDCRollupTestCase):
+
+    def attorney_share(self, start, end):
+        response = self.client.get(
+            ATTORNEYS, query_string={"start": millis(start), "end": millis(end)}
+        )
+
+        self.assert200(response)
+        return response.json
+
+    def counts(self, share, name_key="plaintiff_attorney_name"):
+        return {row[name_key]: row["warrant_count"] for row in share}
+
+    def test_end_day_included(self):
+        share = self.attorney_share(self.last_month, self.last_month)
+
+        self.assertEqual(
+            self.counts(share), {"SMITH": 2, "PLAINTIFF REPRESENTING SELF": 0}
+        )
+        for row in share:
+            self.assertEqual(row["start_date"], millis(self.last_month))
+            self.assertEqual(row["end_date"], millis(self.last_month))
+
+    def test_day_after_end_excluded(self):
+        before = self.attorney_share(
+            self.last_month, self.this_month - timedelta(days=1)
+        )
+        through = self.attorney_share(self.last_month, self.this_month)
+
+        self.assertEqual(
+            self.counts(before), {"SMITH": 2, "PLAINTIFF REPRESENTING SELF": 0}
+        )
+        self.assertEqual(
+            self.counts(through), {"SMITH": 3, "PLAINTIFF REPRESENTING SELF": 1}
+        )
+
+    def test_start_day_included(self):
+        share = self.attorney_share(self.this_month, date.today())
+
+        self.assertEqual(
+            self.counts(share), {"SMITH": 1, "PLAINTIFF REPRESENTING SELF": 1}
+        )
+
+    def test_default_window(self):
+        for url in (ATTORNEYS, JUDGES):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+
+                self.assert200(response)
+                for row in response.json:
+                    self.assertEqual(row["start_date"], millis(date(2020, 1, 1)))
+                    self.assertEqual(row["end_date"], millis(date.today()))
+
+    def test_judges(self):
+        response = self.client.get(
+            JUDGES,
+            query_string={
+                "start": millis(self.this_month),
+                "end": millis(date.today()),
+            },
+        )
+
+        self.assert200(response)
+        self.assertEqual(
+            self.counts(response.json, "presiding_judge_name"), {"JUDY": 1}
+        )
+
+    def assert_invalid_range(self, url, **args):
+        response = self.client.get(url, query_string=args)
+
+        self.assert400(response)
+        self.assertEqual(response.json["errors"][0]["code"], "invalid_range")
+
+    def test_reversed_range(self):
+        for url in (ATTORNEYS, JUDGES):
+            with self.subTest(url=url):
+                self.assert_invalid_range(
+                    url, start=millis(self.this_month), end=millis(self.last_month)
+                )
+
+    def test_malformed_range(self):
+        for args in ({"start": "last-month"}, {"end": "1.5"}, {"end": "9" * 30}):
+            with self.subTest(args=args):
+                self.assert_invalid_range(ATTORNEYS, **args)
+
+    def test_window_too_long(self):
+        end = date.today()
+        longest = end - relativedelta(months=MAX_ROLLUP_MONTHS)
+
+        self.assert200(
+            self.client.get(
+                ATTORNEYS, query_string={"start": millis(longest), "end": millis(end)}
+            )
+        )
+        self.assert_invalid_range(
+            ATTORNEYS,
+            start=millis(longest - timedelta(days=1)),
+            end=millis(end),
+        )
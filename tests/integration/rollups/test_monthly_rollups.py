@@ -0,0 +1,74 @@
+import pytest
+
+from rdc_website.time_util import millis
+from tests.helpers.rdc_rollup_test_case import RDCRollupTestCase
+
+
+@pytest.mark.integration
+class TestMonthlyRollups(RDCRollupTestCase):
+
+    def test_one_month(self):
+        month = self.this_month
+        response = self.client.get(
+            f"/api/v1/rollup/year/{month.year}/month/{month.month}"
+        )
+
+        self.assert200(response)
+        self.assertEqual(
+            response.json,
+            {
+                "detainer_warrants_filed": 2,
+                "eviction_judgments": 1,
+                "plaintiff_awards": 1200.0,
+                "evictions_entered_by_default": 1.0,
+            },
+        )
+
+    def test_range_of_months(self):
+        response = self.client.get(
+            "/api/v1/rollup/months",
+            query_string={
+                "start": millis(self.last_month),
+                "end": millis(self.this_month),
+            },
+        )
+
+        self.assert200(response)
+        self.assertEqual(
+            response.json,
+            [
+                {
+                    "month": millis(self.last_month),
+                    "detainer_warrants_filed": 2,
+                    "eviction_judgments": 0,
+                    "plaintiff_awards": 300.0,
+                    "evictions_entered_by_default": 0.0,
+                },
+                {
+                    "month": millis(self.this_month),
+                    "detainer_warrants_filed": 2,
+                    "eviction_judgments": 1,
+                    "plaintiff_awards": 1200.0,
+                    "evictions_entered_by_default": 1.0,
+                },
+            ],
+        )
+
+    def test_range_backwards(self):
+        response = self.client.get(
+            "/api/v1/rollup/months",
+            query_string={
+                "start": millis(self.this_month),
+                "end": millis(self.last_month),
+            },
+        )
+
+        self.assert400(response)
+
+    def test_malformed_range(self):
+        for args in ({"start": "last-month"}, {"end": "1.5"}, {"end": "9" * 30}):
+            with self.subTest(args=args):
+                response = self.client.get("/api/v1/rollup/months", query_string=args)
+
+                self.assert400(response)
+                self.assertEqual(response.json["errors"][0]["code"], "invalid_range")
@@ -0,0 +1,93 @@
+import threading
+import pytest
+from unittest import mock
+
+from rdc_website.rollups import cache
+from rdc_website.rollups.cache import response_cache, version_name
+from rdc_website.rollups.refresh import refresh_daily
+from tests.helpers.rdc_rollup_test_case import RDCRollupTestCase
+
+URL = "/api/v1/rollup/detainer-warrants"
+KEY = f"{URL}?"
+
+
+@pytest.mark.integration
+class TestRevalidation(RDCRollupTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.use_response_cache()
+
+    def file_another_warrant(self):
+        self.warrant("23GT5", self.this_month, self.bell, 250)
+        refresh_daily()
+
+    def test_stale_served_then_refreshed(self):
+        stale = self.client.get(URL).get_data()
+        self.file_another_warrant()
+
+        with mock.patch.object(cache, "revalidate_in_background") as revalidate:
+            response = self.client.get(URL)
+
+        self.assert200(response)
+        self.assertEqual(response.get_data(), stale)
+        self.assertNotIn("ETag", response.headers)
+        revalidate.assert_called_once_with(KEY)
+
+        cache.revalidate(self.app, KEY, URL, b"")
+
+        body, fresh = response_cache.get(KEY)
+        self.assertTrue(fresh)
+        self.assertNotEqual(body, stale)
+        self.assertEqual(self.client.get(URL).json[-1]["total_warrants"], 3)
+
+    def test_one_revalidation_for_concurrent_stale_hits(self):
+        self.client.get(URL)
+        self.file_another_warrant()
+
+        renders = []
+        release = threading.Event()
+        render = cache.render
+
+        def slow_render(*args, **kwargs):
+            renders.append(args[0])
+            release.wait(10)
+            return render(*args, **kwargs)
+
+        threads = []
+        Thread = threading.Thread
+
+        def spawn(*args, **kwargs):
+            thread = Thread(*args, **kwargs)
+            threads.append(thread)
+            return thread
+
+        with mock.patch.object(cache, "render", slow_render), mock.patch.object(
+            cache.threading, "Thread", spawn
+        ):
+            for _ in range(3):
+                self.assert200(self.client.get(URL))
+            release.set()
+            for thread in threads:
+                thread.join(10)
+
+        self.assertEqual(len(threads), 3)
+        self.assertEqual(renders, [KEY])
+        self.assertTrue(response_cache.get(KEY)[1])
+
+    def test_warm_fills_every_route(self):
+        cache.warm(self.app)
+
+        for rule in self.app.url_map.iter_rules():
+            view = self.app.view_functions[rule.endpoint]
+            if (
+                rule.rule.startswith(cache.ROLLUP_PREFIX)
+                and not rule.arguments
+                and hasattr(view, "__wrapped__")
+            ):
+                with self.subTest(rule=rule.rule):
+                    body, fresh = response_cache.get(
+                        f"{rule.rule}?", version_name(view)
+                    )
+                    self.assertIsNotNone(body)
+                    self.assertTrue(fresh)
@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy import func
+from sqlalchemy.sql import text
+
+from rdc_website.database import db
+from rdc_website.rollups.models import RollupDaily
+from rdc_website.rollups.refresh import (
+    REFRESH_OVERLAP,
+    last_refreshed_at,
+    refresh_daily,
+)
+from tests.helpers.rdc_rollup_test_case import RDCRollupTestCase
+
+
+@pytest.mark.integration
+class TestRollupDaily(RDCRollupTestCase):
+
+    def total(self, column):
+        return db.session.query(func.sum(column)).scalar()
+
+    def test_rebuild(self):
+        self.assertEqual(self.total(RollupDaily.warrants_filed), 4)
+        self.assertEqual(self.total(RollupDaily.amount_claimed_high), 1)
+        self.assertEqual(self.total(RollupDaily.amount_claimed_medium_high), 1)
+        self.assertEqual(self.total(RollupDaily.amount_claimed_medium), 0)
+        self.assertEqual(self.total(RollupDaily.amount_claimed_medium_low), 1)
+        self.assertEqual(self.total(RollupDaily.amount_claimed_low), 1)
+        self.assertEqual(self.total(RollupDaily.judgments), 2)
+        self.assertEqual(self.total(RollupDaily.possession_judgments), 1)
+        self.assertEqual(self.total(RollupDaily.default_judgments), 1)
+        self.assertEqual(self.total(RollupDaily.awards_fees), 1500)
+
+    def test_refresh_changed_days(self):
+        warrant = self.warrant("23GT5", self.this_month, self.bell, 1250)
+        self.judgment(warrant, self.last_month, awards_fees=50)
+
+        refresh_daily()
+
+        self.assertEqual(self.total(RollupDaily.warrants_filed), 5)
+        self.assertEqual(self.total(RollupDaily.amount_claimed_medium), 1)
+        self.assertEqual(self.total(RollupDaily.judgments), 3)
+        self.assertEqual(self.total(RollupDaily.awards_fees), 1550)
+
+    def test_refresh_overlaps_the_last_refresh(self):
+        # as if written by a transaction still open at the last refresh
+        self.warrant("23GT5", self.this_month, self.bell, 1250)
+        db.session.execute(
+            text("update cases set updated_at = :at where docket_id = '23GT5'"),
+            {"at": last_refreshed_at() - REFRESH_OVERLAP / 2},
+        )
+        db.session.commit()
+
+        refresh_daily()
+
+        self.assertEqual(self.total(RollupDaily.warrants_filed), 5)
+
+    def test_amount_claimed_bands(self):
+        response = self.client.get("/api/v1/rollup/plaintiffs/amount_claimed_bands")
+
+        self.assert200(response)
+        avana, bell = response.json
+        self.assertEqual(avana["plaintiff_name"], "AVANA")
+        self.assertEqual(avana["warrant_count"], 3)
+        self.assertEqual(avana["greater_than_2k"], 1)
+        self.assertEqual(avana["between_1.5k_and_2k"], 1)
+        self.assertEqual(avana["between_500_and_1k"], 1)
+        self.assertEqual(bell["plaintiff_name"], "BELL")
+        self.assertEqual(bell["less_than_500"], 1)
@@ -0,0 +1,74 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import pytest
+
+from rdc_website.detainer_warrants.models import DetainerWarrant
+from rdc_website.rollups import snapshots
+from tests.helpers.rdc_rollup_test_case import RDCRollupTestCase
+from tests.helpers.rdc_test_case import RDCTestCase
+from datetime import date
+
+
+@pytest.mark.integration
+class TestSnapshots(RDCTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.data_dir)
+        self.app.config["DATA_DIR"] = self.data_dir
+        DetainerWarrant.create(docket_id="23GT1", _file_date=date.today())
+
+    def read(self, *path):
+        with open(os.path.join(self.data_dir, "rollups", *path), "rb") as f:
+            return f.read()
+
+    def test_write(self):
+        snapshots.write(self.app)
+
+        manifest = json.loads(self.read("manifest.json"))
+        self.assertIn("bundle.json", manifest["files"])
+        self.assertEqual(
+            os.readlink(os.path.join(self.data_dir, "rollups", "current")),
+            manifest["version"],
+        )
+        for name in manifest["files"]:
+            body = self.read("current", name)
+            self.assertEqual(gzip.decompress(self.read("current", name + ".gz")), body)
+            json.loads(body)
+
+
+@pytest.mark.integration
+class TestSnapshotsMatchApi(RDCRollupTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.data_dir)
+        self.app.config["DATA_DIR"] = self.data_dir
+
+    def read(self, *path):
+        with open(os.path.join(self.data_dir, "rollups", *path), "rb") as f:
+            return f.read()
+
+    def test_same_bytes_as_the_api(self):
+        snapshots.write(self.app)
+
+        paths = [
+            rule.rule
+            for rule in self.app.url_map.iter_rules()
+            if rule.rule.startswith(snapshots.ROLLUP_PREFIX) and not rule.arguments
+        ]
+        self.assertEqual(
+            sorted(json.loads(self.read("manifest.json"))["files"]),
+            sorted(snapshots.file_name(path) for path in paths),
+        )
+        for path in paths:
+            with self.subTest(path=path):
+                self.assertEqual(
+                    self.read("current", snapshots.file_name(path)),
+                    self.client.get(path).get_data(),
+                )
@@ -0,0 +1,110 @@
+import pytest
+
+from rdc_website.app import MAX_TIMESERIES_BUCKETS
+from rdc_website.rollups.queries import TIMESERIES_METRICS
+from rdc_website.time_util import millis
+from tests.helpers.rdc_rollup_test_case import RDCRollupTestCase
+from datetime import date, timedelta
+from dateutil.relativedelta import relativedelta
+
+URL = "/api/v1/rollup/timeseries"
+
+
+@pytest.mark.integration
+class TestTimeseries(RDCRollupTestCase):
+
+    def timeseries(self, **args):
+        response = self.client.get(URL, query_string=args)
+
+        self.assert200(response)
+        return response.json
+
+    def test_each_metric(self):
+        before = self.last_month - relativedelta(months=1)
+        expected = {
+            "filings": [0, 2, 2],
+            "judgments": [0, 1, 1],
+            "awards": [0.0, 300.0, 1200.0],
+        }
+        self.assertEqual(set(expected), set(TIMESERIES_METRICS))
+
+        for metric, values in expected.items():
+            with self.subTest(metric=metric):
+                series = self.timeseries(
+                    metric=metric,
+                    start=millis(before),
+                    end=millis(date.today()),
+                )
+
+                self.assertEqual(series["metric"], metric)
+                self.assertEqual(series["granularity"], "month")
+                self.assertEqual(
+                    series["data"],
+                    [
+                        {"time": millis(month), "value": value}
+                        for month, value in zip(
+                            (before, self.last_month, self.this_month), values
+                        )
+                    ],
+                )
+
+    def test_empty_buckets_filled_with_zero(self):
+        series = self.timeseries(
+            granularity="week",
+            start=millis(self.last_month),
+            end=millis(date.today()),
+        )
+
+        weeks = [point["time"] for point in series["data"]]
+        first_week = self.last_month - timedelta(days=self.last_month.weekday())
+        self.assertEqual(weeks[0], millis(first_week))
+        self.assertEqual(
+            weeks,
+            [millis(first_week + timedelta(weeks=week)) for week in range(len(weeks))],
+        )
+        self.assertEqual(sum(point["value"] for point in series["data"]), 4)
+        self.assertIn(0, [point["value"] for point in series["data"]])
+
+    def test_default_window(self):
+        series = self.timeseries()
+
+        self.assertEqual(len(series["data"]), 13)
+        self.assertEqual(series["data"][-1]["time"], millis(self.this_month))
+
+    def test_buckets_capped(self):
+        today = date.today()
+        series = self.timeseries(
+            granularity="day",
+            start=millis(today - timedelta(days=MAX_TIMESERIES_BUCKETS * 2)),
+            end=millis(today),
+        )
+
+        self.assertEqual(len(series["data"]), MAX_TIMESERIES_BUCKETS)
+        self.assertEqual(series["data"][-1]["time"], millis(today))
+
+    def test_plaintiff(self):
+        series = self.timeseries(
+            start=millis(self.last_month),
+            end=millis(date.today()),
+            plaintiff_id=self.bell.id,
+        )
+
+        self.assertEqual([point["value"] for point in series["data"]], [0, 1])
+
+    def test_unknown_metric(self):
+        response = self.client.get(URL, query_string={"metric": "hearings"})
+
+        self.assert400(response)
+        self.assertEqual(response.json["errors"][0]["code"], "invalid_metric")
+
+    def test_unknown_granularity(self):
+        response = self.client.get(URL, query_string={"granularity": "year"})
+
+        self.assert400(response)
+        self.assertEqual(response.json["errors"][0]["code"], "invalid_granularity")
+
+    def test_malformed_plaintiff(self):
+        response = self.client.get(URL, query_string={"plaintiff_id": "abc"})
+
+        self.assert400(response)
+        self.assertEqual(response.json["errors"][0]["code"], "invalid_id")
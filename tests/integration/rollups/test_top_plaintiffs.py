@@ -0,0 +1,31 @@
+import pytest
+
+from rdc_website.time_util import millis
+from tests.helpers.rdc_rollup_test_case import RDCRollupTestCase
+
+
+@pytest.mark.integration
+class TestTopPlaintiffs(RDCRollupTestCase):
+
+    def history(self, *counts):
+        return [
+            {"date": millis(self.last_month), "eviction_count": counts[0]},
+            {"date": millis(self.this_month), "eviction_count": counts[1]},
+        ]
+
+    def test_monthly_history(self):
+        response = self.client.get("/api/v1/rollup/plaintiffs?months=2")
+
+        self.assert200(response)
+        self.assertEqual(
+            response.json,
+            [
+                {"name": "AVANA", "history": self.history(2, 1)},
+                {"name": "BELL", "history": self.history(0, 1)},
+            ],
+        )
+
+    def test_limit(self):
+        response = self.client.get("/api/v1/rollup/plaintiffs?months=2&limit=1")
+
+        self.assertEqual([plaintiff["name"] for plaintiff in response.json], ["AVANA"])
@@ -0,0 +1,23 @@
+import pytest
+
+from rdc_website.time_util import millis
+from tests.helpers.rdc_rollup_test_case import RDCRollupTestCase
+
+
+@pytest.mark.integration
+class TestWarrantsByMonth(RDCRollupTestCase):
+
+    def test_every_month_of_the_last_year(self):
+        response = self.client.get("/api/v1/rollup/detainer-warrants")
+
+        self.assert200(response)
+        months = response.json
+        self.assertEqual(len(months), 13)
+        self.assertEqual(
+            months[-2:],
+            [
+                {"time": millis(self.last_month), "total_warrants": 2},
+                {"time": millis(self.this_month), "total_warrants": 2},
+            ],
+        )
+        self.assertTrue(all(month["total_warrants"] == 0 for month in months[:-2]))